@@ -0,0 +1,56 @@
+"""Benchmark saving and loading calculation history in each supported format.
+
+Usage: python benchmarks/bench_history_formats.py [rows]
+"""
+
+import os
+import sys
+import time
+import tempfile
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calculator.history.storage import has_pyarrow, read_history, write_history  # pylint: disable=wrong-import-position
+
+
+def make_history(rows: int) -> pd.DataFrame:
+    """Build a synthetic history DataFrame with the given number of rows."""
+    rng = np.random.default_rng(0)
+    a = rng.uniform(-1000, 1000, rows)
+    b = rng.uniform(1, 1000, rows)
+    return pd.DataFrame({
+        'timestamp': pd.date_range('2025-01-01', periods=rows, freq='s'),
+        'a': a,
+        'b': b,
+        'operation': rng.choice(['add', 'subtract', 'multiply', 'divide'], rows),
+        'result': a + b
+    })
+
+
+def time_call(func, *args) -> float:
+    """Return the wall-clock seconds taken by a single call."""
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    df = make_history(rows)
+    formats = ['csv', 'npz'] + (['parquet'] if has_pyarrow() else [])
+
+    print(f"History rows: {rows}")
+    print(f"{'format':<10}{'save (s)':>12}{'load (s)':>12}{'size (MB)':>12}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for fmt in formats:
+            path = os.path.join(tmp_dir, f"history.{fmt}")
+            save_time = time_call(write_history, df, path, fmt)
+            load_time = time_call(read_history, path, fmt)
+            size = os.path.getsize(path) / (1024 * 1024)
+            print(f"{fmt:<10}{save_time:>12.3f}{load_time:>12.3f}{size:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,18 +1,24 @@
-from decimal import Decimal
+from decimal import Context, Decimal
+from typing import TYPE_CHECKING, List, Optional, Sequence
 from calculator.calculation import Calculation
 from calculator.calculations import Calculations
 from calculator.operations import add, subtract, multiply, divide
-from calculator.history import HistoryManager
+
+# NumPy, pandas and the history package are imported on first use, so importing
+# the calculator for a single calculation stays cheap
+if TYPE_CHECKING:
+    import numpy as np
+    from calculator.batch import ArrayLike, OperationsLike
 
 class Calculator:
     @staticmethod
     def _perform_operation(a: Decimal, b: Decimal, operation) -> Decimal:
         """Perform a calculation and add it to history."""
         calculation = Calculation.create(a, b, operation)
-        Calculations.add_calculation(calculation)
-        # Also add to pandas-based history manager
-        HistoryManager.add_calculation(calculation)
-        return calculation.perform()
+        result = calculation.perform()
+        # One history row; Calculations reads the same row back as this calculation
+        Calculations.add_calculation(calculation, result=result)
+        return result
 
     @staticmethod
     def add(a: Decimal, b: Decimal) -> Decimal:
@@ -32,4 +38,82 @@ class Calculator:
     @staticmethod
     def divide(a: Decimal, b: Decimal) -> Decimal:
         """Divide two numbers and store the result in history."""
-        return Calculator._perform_operation(a, b, divide)
\ No newline at end of file
+        return Calculator._perform_operation(a, b, divide)
+
+    @staticmethod
+    def evaluate_batch(a: 'ArrayLike', b: 'ArrayLike', ops: 'OperationsLike', record: bool = True) -> 'np.ndarray':
+        """Evaluate many calculations in one vectorized pass.
+
+        Operands are evaluated as float64 rather than Decimal. The evaluated
+        calculations are added to the history with one bulk append, and
+        ``Calculations`` sees them with operands rebuilt from the floats.
+
+        Args:
+            a: First operands, as a NumPy array, pandas Series or sequence.
+            b: Second operands, the same length as ``a``.
+            ops: One operation for every pair (a function such as ``add`` or
+                its name), or an array with an operation name or code (index
+                into ``calculator.operations.OPERATIONS``) for each pair.
+            record: Whether to add the calculations to the history.
+
+        Returns:
+            Array of results. Divisions by zero give NaN and are not recorded.
+        """
+        import numpy as np
+        import pandas as pd
+        from calculator.batch import OPERATION_NAMES, evaluate, operation_codes
+        from calculator.history import HistoryManager
+        a = np.asarray(a, dtype=np.float64)
+        b = np.asarray(b, dtype=np.float64)
+        if a.shape != b.shape or a.ndim != 1:
+            raise ValueError("Operands must be one-dimensional arrays of the same length")
+        codes = operation_codes(ops, len(a))
+        results, valid = evaluate(a, b, codes)
+        if record:
+            if not valid.all():
+                a, b, codes = a[valid], b[valid], codes[valid]
+            HistoryManager.add_batch(
+                a, b, pd.Categorical.from_codes(codes, categories=OPERATION_NAMES), results[valid]
+            )
+        return results
+
+    @staticmethod
+    def evaluate_decimal_batch(a: Sequence, b: Sequence, ops: 'OperationsLike',
+                               context: Optional[Context] = None,
+                               workers: Optional[int] = None,
+                               record: bool = True) -> List[Decimal]:
+        """Evaluate many calculations exactly, spread across worker processes.
+
+        Unlike ``evaluate_batch`` every result is computed with ``Decimal``
+        arithmetic in ``context``, so it matches ``Calculator.add`` and
+        friends. The history still stores results as floats.
+
+        Args:
+            a: First operands (Decimal, int, str or float).
+            b: Second operands, the same length as ``a``.
+            ops: One operation for every pair, or an operation name or code
+                for each pair, as for ``evaluate_batch``.
+            context: Decimal context setting precision and rounding. If None,
+                uses the current context.
+            workers: Number of worker processes. If None, uses one per CPU.
+            record: Whether to add the calculations to the history.
+
+        Returns:
+            List of results in input order. Divisions by zero give
+            ``Decimal('NaN')`` and are not recorded.
+        """
+        import numpy as np
+        import pandas as pd
+        from calculator.batch import OPERATION_NAMES, evaluate_decimal, operation_codes
+        from calculator.history import HistoryManager
+        results = evaluate_decimal(a, b, ops, context=context, workers=workers)
+        if record:
+            codes = operation_codes(ops, len(results))
+            valid = np.array([not result.is_nan() for result in results], dtype=bool)
+            HistoryManager.add_batch(
+                np.array([float(x) for x in a], dtype=np.float64)[valid],
+                np.array([float(y) for y in b], dtype=np.float64)[valid],
+                pd.Categorical.from_codes(codes[valid], categories=OPERATION_NAMES),
+                np.array([float(result) for result in results], dtype=np.float64)[valid]
+            )
+        return results
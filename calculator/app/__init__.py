@@ -1,35 +1,36 @@
-import pkgutil
-import importlib
 from calculator.app.commands import CommandHandler, Command
 from calculator.app.commands.command_handler import CalculatorCommand
+from calculator.app.plugin_manifest import load_manifest
 
 class App:
     def __init__(self):
         self.command_handler = CommandHandler()
 
     def load_plugins(self):
-        # Dynamically load all plugins in the plugins directory
-        plugins_package = 'calculator.app.plugins'
-        for _, plugin_name, is_pkg in pkgutil.iter_modules([plugins_package.replace('.', '/')]):
-            if is_pkg:  # Ensure it's a package
-                plugin_module = importlib.import_module(f'{plugins_package}.{plugin_name}')
-                for item_name in dir(plugin_module):
-                    item = getattr(plugin_module, item_name)
-                    try:
-                        if issubclass(item, (Command)) and item is not Command:  # Changed this line
-                            self.command_handler.register_command(plugin_name, item())
-                    except TypeError:
-                        continue  # If item is not a class or unrelated class, just ignore
+        """Register every plugin in the plugins directory.
+
+        Commands come from the cached plugin manifest, so no plugin module is
+        imported until its command is first executed.
+        """
+        for plugin_name, target in load_manifest().items():
+            self.command_handler.register_lazy_command(plugin_name, target)
 
     def start(self):
         """Start the application loop."""
+        from calculator.history import HistoryManager
         self.load_plugins()
+        # Save new history rows in the background and keep a commit log if CALCULATOR_AUTOSAVE_* and
+        # CALCULATOR_HISTORY_COMMIT_LOG ask for it
+        HistoryManager.configure_autosave()
+        HistoryManager.configure_commit_log()
         print("Welcome to the calculator! Type 'exit' to quit.")
         self.command_handler.execute_command("menu")
         
         while True:
             command = input(">>> ").strip()
             if command.lower() in ["exit", "quit"]:
+                HistoryManager.stop_autosave()
+                HistoryManager.close_commit_log()
                 print("Goodbye!")
                 break
-            self.command_handler.execute_command(command)
\ No newline at end of file
+            self.command_handler.execute_command(command)
@@ -1,3 +1,4 @@
+import importlib
 from abc import ABC, abstractmethod
 
 class Command(ABC):
@@ -8,10 +9,25 @@ class Command(ABC):
 class CommandHandler:
     def __init__(self):
         self.commands = {}
+        # Commands registered by "module:Class", imported the first time they are executed
+        self.lazy_commands = {}
 
     def register_command(self, command_name: str, command: Command):
         self.commands[command_name] = command
 
+    def register_lazy_command(self, command_name: str, target: str):
+        """Register a command by its "module:Class" path without importing it."""
+        self.lazy_commands[command_name] = target
+
+    def get_command(self, command_name: str) -> Command:
+        """Return a command, importing a lazily registered one on first use. Raises KeyError if unknown."""
+        if command_name not in self.commands:
+            module_name, class_name = self.lazy_commands[command_name].split(':')
+            command_class = getattr(importlib.import_module(module_name), class_name)
+            self.commands[command_name] = command_class()
+            del self.lazy_commands[command_name]
+        return self.commands[command_name]
+
     def execute_command(self, command_name: str):
         """ Look before you leap (LBYL) - Use when its less likely to work
         if command_name in self.commands:
@@ -19,8 +35,8 @@ class CommandHandler:
         else:
             print(f"No such command: {command_name}")
         """
-        """Easier to ask for forgiveness than permission (EAFP) - Use when its going to most likely work"""
+        # Easier to ask for forgiveness than permission (EAFP) - Use when its going to most likely work
         try:
-            self.commands[command_name].execute()
+            self.get_command(command_name).execute()
         except KeyError:
             print(f"No such command: {command_name}")
@@ -15,4 +15,3 @@ class CalculatorCommand(Command):
             print("Invalid input. Please enter valid numbers.")
         except ZeroDivisionError:
             print("Error: Division by zero.")
-
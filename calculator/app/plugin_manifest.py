@@ -0,0 +1,138 @@
+"""Module providing the cached manifest of plugin commands.
+
+The manifest maps each command name to the ``module:Class`` implementing it,
+so the application can list its commands without importing any plugin.
+It is found by parsing the plugin sources and cached as JSON in the data
+directory, keyed by the modification time of each plugin's ``__init__.py``;
+only plugins that were added or changed since the last run are parsed again.
+"""
+
+import ast
+import importlib
+import json
+import os
+import pathlib
+from typing import Dict, Optional, Union
+from calculator.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+PLUGINS_PACKAGE = 'calculator.app.plugins'
+PLUGINS_DIR = pathlib.Path(os.path.dirname(os.path.abspath(__file__))).joinpath('plugins')
+MANIFEST_FILE = 'plugin_manifest.json'
+
+
+def default_manifest_path() -> pathlib.Path:
+    """Return the manifest cache in the data directory (``CALCULATOR_DATA_DIR``)."""
+    root = pathlib.Path(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    return root.joinpath(os.environ.get('CALCULATOR_DATA_DIR', 'data'), MANIFEST_FILE)
+
+
+def _plugin_sources(plugins_dir: pathlib.Path) -> Dict[str, pathlib.Path]:
+    """Return the ``__init__.py`` of every plugin package, by command name.
+
+    Like ``pkgutil.iter_modules``, directories whose name is not a module name
+    are skipped.
+    """
+    sources = {}
+    for entry in sorted(plugins_dir.iterdir()):
+        source = entry.joinpath('__init__.py')
+        if entry.is_dir() and entry.name.isidentifier() and source.is_file():
+            sources[entry.name] = source
+    return sources
+
+
+def _find_command_class(source: pathlib.Path) -> Optional[str]:
+    """Return the name of the first class in ``source`` deriving from ``Command``, if any."""
+    tree = ast.parse(source.read_bytes(), filename=str(source))
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef):
+            for base in node.bases:
+                name = base.attr if isinstance(base, ast.Attribute) else getattr(base, 'id', None)
+                if name == 'Command':
+                    return node.name
+    return None
+
+
+def _import_command_class(module_name: str) -> Optional[str]:
+    """Import a plugin and return the name of its command class, for plugins the parser cannot read."""
+    from calculator.app.commands import Command
+    plugin_module = importlib.import_module(module_name)
+    for item_name in dir(plugin_module):
+        item = getattr(plugin_module, item_name)
+        if isinstance(item, type) and issubclass(item, Command) and item is not Command:
+            return item.__name__
+    return None
+
+
+def scan_plugin(command_name: str, source: pathlib.Path, package: str = PLUGINS_PACKAGE) -> Optional[str]:
+    """Return the ``module:Class`` entry of one plugin, or None if it defines no command.
+
+    The source is parsed without importing it. Only when no class deriving
+    from ``Command`` is defined there (e.g. it is re-exported from a
+    submodule) is the plugin imported to find it.
+    """
+    module_name = f'{package}.{command_name}'
+    try:
+        class_name = _find_command_class(source)
+    except SyntaxError as e:
+        logger.error(f"Could not parse plugin {command_name}: {e}")
+        class_name = None
+    if class_name is None:
+        class_name = _import_command_class(module_name)
+    return f'{module_name}:{class_name}' if class_name else None
+
+
+def _read_cache(cache_path: pathlib.Path) -> Dict[str, dict]:
+    """Return the cached plugin entries, or an empty dict if the cache is missing or unreadable."""
+    try:
+        with open(cache_path, encoding='utf-8') as f:
+            plugins = json.load(f)['plugins']
+        return plugins if isinstance(plugins, dict) else {}
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        logger.warning(f"Ignoring unreadable plugin manifest {cache_path}: {e}")
+        return {}
+
+
+def _write_cache(cache_path: pathlib.Path, plugins: Dict[str, dict]) -> None:
+    """Replace the manifest cache, keeping the old one if it cannot be written."""
+    temp_path = cache_path.with_name(cache_path.name + '.tmp')
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'plugins': plugins}, f, indent=2, sort_keys=True)
+        os.replace(temp_path, cache_path)
+        logger.info(f"Plugin manifest written to {cache_path}")
+    except OSError as e:
+        logger.warning(f"Could not write plugin manifest {cache_path}: {e}")
+
+
+def load_manifest(plugins_dir: Union[str, pathlib.Path] = PLUGINS_DIR,
+                  cache_path: Union[str, pathlib.Path, None] = None,
+                  package: str = PLUGINS_PACKAGE) -> Dict[str, str]:
+    """Return the plugin commands, refreshing the cached manifest where plugins changed.
+
+    Args:
+        plugins_dir: Directory holding one package per plugin.
+        cache_path: JSON file caching the manifest (default: ``plugin_manifest.json`` in the data directory).
+        package: Package name of ``plugins_dir``.
+
+    Returns:
+        Dictionary mapping each command name to the ``module:Class`` implementing it.
+    """
+    plugins_dir = pathlib.Path(plugins_dir)
+    cache_path = pathlib.Path(cache_path) if cache_path is not None else default_manifest_path()
+    cached = _read_cache(cache_path)
+    plugins = {}
+    for command_name, source in _plugin_sources(plugins_dir).items():
+        mtime = source.stat().st_mtime_ns
+        entry = cached.get(command_name)
+        if not isinstance(entry, dict) or entry.get('mtime') != mtime or 'target' not in entry:
+            logger.debug(f"Scanning plugin {command_name}")
+            entry = {'mtime': mtime, 'target': scan_plugin(command_name, source, package)}
+        plugins[command_name] = entry
+    if plugins != cached:
+        _write_cache(cache_path, plugins)
+    return {name: entry['target'] for name, entry in plugins.items() if entry['target']}
@@ -12,4 +12,4 @@ class AddCommand(Command):
         except InvalidOperation:
             print("Invalid input. Please enter valid numbers.")
         except ZeroDivisionError:
-            print("Error: Division by zero.")
\ No newline at end of file
+            print("Error: Division by zero.")
@@ -13,7 +13,7 @@ class DeleteHistoryFileCommand(Command):
         if not file_path:
             file_path = None  # Use default path
             
-        confirmation = input(f"Are you sure you want to delete the history file? This cannot be undone. (y/n): ").strip().lower()
+        confirmation = input("Are you sure you want to delete the history file? This cannot be undone. (y/n): ").strip().lower()
         
         if confirmation == 'y':
             success = HistoryManager.delete_history_file(file_path)
@@ -0,0 +1,27 @@
+from calculator.app.commands import Command
+from calculator.expression import ExpressionError, compile_expression
+from calculator.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+class EvaluateCommand(Command):
+    def execute(self):
+        try:
+            expression = compile_expression(input("Enter an expression: ").strip())
+            bindings = {
+                name: input(f"Enter a value for {name}: ").strip()
+                for name in sorted(expression.variables)
+            }
+            result = expression.evaluate(bindings)
+            print(f"Result: {result}")
+            logger.info(f"Evaluated expression {expression.source} with {bindings} = {result}")
+        except ExpressionError as e:
+            print(f"Invalid expression: {e}")
+            logger.error(f"Invalid expression: {e}")
+        except ValueError as e:
+            print(f"Error: {e}")
+            logger.error(f"Error evaluating expression: {e}")
+        except ArithmeticError as e:
+            # e.g. decimal.Overflow, whose message is just the signal list
+            print(f"Error: arithmetic error: {type(e).__name__}")
+            logger.error(f"Arithmetic error evaluating expression: {type(e).__name__}")
@@ -4,4 +4,4 @@ from calculator.app.commands import Command
 
 class ExitCommand(Command):
     def execute(self):
-        sys.exit("Exiting...")
\ No newline at end of file
+        sys.exit("Exiting...")
@@ -3,4 +3,4 @@ from calculator.app.commands import Command
 
 class GoodbyeCommand(Command):
     def execute(self):
-        print("Goodbye")
\ No newline at end of file
+        print("Goodbye")
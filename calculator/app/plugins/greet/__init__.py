@@ -3,4 +3,4 @@ from calculator.app.commands import Command
 
 class GreetCommand(Command):
     def execute(self):
-        print("Hello, World!")
\ No newline at end of file
+        print("Hello, World!")
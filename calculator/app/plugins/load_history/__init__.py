@@ -18,4 +18,4 @@ class LoadHistoryCommand(Command):
         if success:
             print("History loaded successfully.")
         else:
-            print(f"Error loading history. File may not exist or is invalid.")
+            print("Error loading history. File may not exist or is invalid.")
@@ -26,6 +26,7 @@ class MenuCommand(Command):
         print("statistics - View statistical analysis of calculations")
         print("export_excel - Export calculation history to Excel")
         print("filter_history - Filter calculation history")
+        print("evaluate - Evaluate an expression such as (2 + 3) * 4 / x")
         
         print("\nApplication Control:")
         print("menu - Show this menu")
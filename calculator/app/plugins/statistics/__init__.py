@@ -1,6 +1,6 @@
+import pandas as pd
 from calculator.app.commands import Command
 from calculator.history.manager import HistoryManager
-import pandas as pd
 from calculator.logging_config import get_logger
 
 logger = get_logger(__name__)
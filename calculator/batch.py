@@ -0,0 +1,150 @@
+"""Module for evaluating many calculations at once.
+
+``evaluate`` works on float64 NumPy arrays. ``evaluate_decimal`` keeps the
+exact ``Decimal`` semantics of ``calculator.operations`` and spreads large
+batches over a process pool.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Context, Decimal, getcontext, localcontext
+from typing import Any, Callable, List, Optional, Sequence, Tuple, Union
+import numpy as np
+import pandas as pd
+from calculator.operations import OPERATIONS, divide
+
+# Operation names indexed by operation code
+OPERATION_NAMES = [operation.__name__ for operation in OPERATIONS]
+
+# Vectorized equivalent of every operation except divide, indexed by operation code
+_UFUNCS = (np.add, np.subtract, np.multiply)
+
+_DIVIDE = OPERATIONS.index(divide)
+
+# Calculations handed to each worker process by evaluate_decimal
+DECIMAL_CHUNK_ROWS = int(os.environ.get('CALCULATOR_DECIMAL_CHUNK_ROWS', 50_000))
+
+ArrayLike = Union[np.ndarray, pd.Series, Sequence[float]]
+OperationsLike = Union[str, Callable, np.ndarray, pd.Series, Sequence]
+
+
+def operation_codes(ops: OperationsLike, size: int) -> np.ndarray:
+    """Turn an operation, or an array of operation names or codes, into an array of codes.
+
+    Args:
+        ops: A single operation (function or name) used for every row, or one
+            operation name or code per row.
+        size: Number of rows.
+
+    Returns:
+        Array of int8 codes indexing ``OPERATIONS``.
+
+    Raises:
+        ValueError: If an operation name or code is unknown.
+    """
+    if callable(ops) or isinstance(ops, str):
+        name = ops if isinstance(ops, str) else ops.__name__
+        if name not in OPERATION_NAMES:
+            raise ValueError(f"Unknown operation: {name}")
+        return np.full(size, OPERATION_NAMES.index(name), dtype=np.int8)
+
+    values = ops.to_numpy() if isinstance(ops, pd.Series) else np.asarray(ops)
+    if len(values) != size:
+        raise ValueError(f"Expected {size} operations, got {len(values)}")
+    if values.dtype.kind in 'iu':
+        if len(values) and (values.min() < 0 or values.max() >= len(OPERATIONS)):
+            raise ValueError("Operation codes must index calculator.operations.OPERATIONS")
+        return values.astype(np.int8)
+    # Names: look up each distinct name once
+    positions, names = pd.factorize(values)
+    lookup = np.empty(len(names), dtype=np.int8)
+    for index, name in enumerate(names):
+        if name not in OPERATION_NAMES:
+            raise ValueError(f"Unknown operation: {name}")
+        lookup[index] = OPERATION_NAMES.index(name)
+    return lookup[positions]
+
+
+def evaluate(a: np.ndarray, b: np.ndarray, codes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Compute every calculation in one vectorized pass per operation.
+
+    Args:
+        a: First operands as float64.
+        b: Second operands as float64.
+        codes: Operation codes indexing ``OPERATIONS``.
+
+    Returns:
+        Tuple of (results, valid). Divisions by zero are masked out: their
+        result is NaN and their ``valid`` flag is False.
+    """
+    results = np.full(len(a), np.nan)
+    for code, ufunc in enumerate(_UFUNCS):
+        mask = codes == code
+        if mask.all():
+            ufunc(a, b, out=results)
+        elif mask.any():
+            ufunc(a, b, out=results, where=mask)
+    divisions = codes == _DIVIDE
+    valid = ~(divisions & (b == 0))
+    if divisions.any():
+        np.divide(a, b, out=results, where=divisions & valid)
+    return results, valid
+
+
+def _to_decimal(value: Any) -> Decimal:
+    """Convert an operand to Decimal, going through str so floats keep their shortest repr."""
+    return value if isinstance(value, Decimal) else Decimal(str(value))
+
+
+def _evaluate_decimal_chunk(task: Tuple[Sequence, Sequence, np.ndarray, Context]) -> List[Decimal]:
+    """Evaluate one chunk of calculations with Decimal operations in the given context."""
+    a, b, codes, context = task
+    results = []
+    with localcontext(context):
+        for x, y, code in zip(a, b, codes.tolist()):
+            y = _to_decimal(y)
+            # Masked like evaluate: a zero divisor gives NaN instead of raising
+            if code == _DIVIDE and y == 0:
+                results.append(Decimal('NaN'))
+            else:
+                results.append(OPERATIONS[code](_to_decimal(x), y))
+    return results
+
+
+def evaluate_decimal(a: Sequence, b: Sequence, ops: OperationsLike,
+                     context: Optional[Context] = None,
+                     workers: Optional[int] = None,
+                     chunk_rows: int = DECIMAL_CHUNK_ROWS) -> List[Decimal]:
+    """Compute every calculation with exact Decimal semantics.
+
+    The calculations are split into chunks of ``chunk_rows`` and evaluated in
+    a ``ProcessPoolExecutor``; a batch that fits in one chunk, or a single
+    worker, is evaluated in this process.
+
+    Args:
+        a: First operands (Decimal, int, str or float).
+        b: Second operands, the same length as ``a``.
+        ops: Operations, as accepted by ``operation_codes``.
+        context: Decimal context (precision, rounding, ...) for the
+            arithmetic. If None, uses the current context.
+        workers: Number of worker processes. If None, uses one per CPU.
+        chunk_rows: Calculations handed to a worker at a time.
+
+    Returns:
+        Results in input order. Divisions by zero give ``Decimal('NaN')``.
+    """
+    if len(a) != len(b):
+        raise ValueError("Operands must have the same length")
+    codes = operation_codes(ops, len(a))
+    context = (context or getcontext()).copy()
+    chunk_rows = max(int(chunk_rows), 1)
+    tasks = [
+        (a[start:start + chunk_rows], b[start:start + chunk_rows], codes[start:start + chunk_rows], context)
+        for start in range(0, len(a), chunk_rows)
+    ]
+    if len(tasks) <= 1 or workers == 1:
+        chunks = map(_evaluate_decimal_chunk, tasks)
+        return [result for chunk in chunks for result in chunk]
+    with ProcessPoolExecutor(max_workers=min(workers or os.cpu_count() or 1, len(tasks))) as executor:
+        # map yields chunks in submission order, so results stay in input order
+        return [result for chunk in executor.map(_evaluate_decimal_chunk, tasks) for result in chunk]
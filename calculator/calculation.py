@@ -1,12 +1,23 @@
 """Module for performing calculations using arithmetic operations."""
 
+import os
 from decimal import Decimal
-from typing import Callable
-from calculator.operations import add, subtract, multiply, divide
+from typing import Callable, Dict, Optional
+from calculator.operations import OPERATIONS, add, subtract, multiply, divide
+from calculator.result_cache import ResultCache, context_key
+
+# Operation function -> small integer code (its position in OPERATIONS)
+OPERATION_CODES = {operation: code for code, operation in enumerate(OPERATIONS)}
 
 class Calculation:
     """Represents a mathematical calculation with two operands and an operation."""
 
+    # No per-instance __dict__: long-lived histories hold millions of these
+    __slots__ = ('a', 'b', 'operation')
+
+    # Opt-in LRU cache of results shared by all calculations (None when disabled)
+    _result_cache: Optional[ResultCache] = None
+
     def __init__(self, a: Decimal, b: Decimal, operation: Callable[[Decimal, Decimal], Decimal]):
         """Initialize a Calculation with two operands and an operation."""
         self.a = a
@@ -14,14 +25,56 @@ class Calculation:
         self.operation = operation
 
     def perform(self) -> Decimal:
-        """Perform the calculation and return the result."""
-        return self.operation(self.a, self.b)
+        """Perform the calculation and return the result.
+
+        When the result cache is enabled, repeated operand/operation pairs in
+        the same decimal context are answered from the cache.
+        """
+        cache = Calculation._result_cache
+        if cache is None:
+            return self.operation(self.a, self.b)
+        # repr keeps Decimal('1') and Decimal('1.0') apart, which compare equal but give different results
+        key = (repr(self.a), repr(self.b), self.operation, context_key())
+        return cache.get_or_compute(key, lambda: self.operation(self.a, self.b))
+
+    @property
+    def operation_code(self) -> Optional[int]:
+        """Small integer code of the operation, or None for an operation outside OPERATIONS."""
+        return OPERATION_CODES.get(self.operation)
+
+    @classmethod
+    def configure_cache(cls, size: int) -> None:
+        """Enable the result cache with room for ``size`` results, or disable it with 0."""
+        cls._result_cache = ResultCache(size) if size > 0 else None
+
+    @classmethod
+    def cache_stats(cls) -> Optional[Dict[str, float]]:
+        """Return the result cache hits, misses, evictions, size, capacity and hit rate.
+
+        Returns:
+            Dictionary of counters, or None if the cache is disabled.
+        """
+        return cls._result_cache.stats() if cls._result_cache is not None else None
 
     @staticmethod
     def create(a: Decimal, b: Decimal, operation: Callable[[Decimal, Decimal], Decimal]) -> 'Calculation':
         """Static method to create a new Calculation instance."""
         return Calculation(a, b, operation)
     
+    def __eq__(self, other) -> bool:
+        """Calculations are equal when they have equal operands and the same operation."""
+        if not isinstance(other, Calculation):
+            return NotImplemented
+        return self.a == other.a and self.b == other.b and self.operation is other.operation
+
+    def __hash__(self) -> int:
+        """Hash consistently with ``__eq__``."""
+        return hash((self.a, self.b, self.operation))
+
     def __repr__(self):
         """Return the string representation of the Calculation object."""
         return f"Calculation({self.a}, {self.b}, {self.operation.__name__})"
+
+
+# Enable the result cache when CALCULATOR_RESULT_CACHE_SIZE is set
+Calculation.configure_cache(int(os.environ.get('CALCULATOR_RESULT_CACHE_SIZE', 0)))
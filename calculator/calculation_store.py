@@ -0,0 +1,144 @@
+"""Module providing a list-like view of calculations over the shared history store."""
+
+from collections.abc import MutableSequence
+from decimal import Decimal
+from typing import Any, Iterable, Iterator, List, Union
+from calculator.calculation import Calculation
+
+
+def _manager():
+    """Import HistoryManager on first use, so the view does not load pandas until it is read."""
+    from calculator.history import HistoryManager
+    return HistoryManager
+
+
+def recorded_result(calculation: Calculation) -> Decimal:
+    """Return the result a calculation is recorded with.
+
+    A calculation that cannot be performed (e.g. a division by zero) is still
+    recorded, as the list-based history did, with a NaN result that the
+    statistics skip; performing it again raises the same error.
+    """
+    try:
+        return calculation.perform()
+    except (ValueError, ArithmeticError):
+        return Decimal('NaN')
+
+
+class CalculationHistory(MutableSequence):
+    """List of the calculations recorded by ``HistoryManager``.
+
+    Nothing is stored here: every calculation is one row of the history
+    store, and indexing or iterating builds ``Calculation`` objects from the
+    rows. Edits write through to ``HistoryManager``, so both APIs always see
+    the same history. Appending and clearing are cheap; other edits (``del``,
+    ``pop``, ``remove``, ``insert`` and item assignment) rewrite the rows
+    after the edited position. The view compares equal to a list of the same
+    calculations.
+    """
+
+    def append(self, value: Calculation) -> None:
+        """Record a calculation in the history."""
+        _manager().add_calculation(value, result=recorded_result(value))
+
+    def clear(self) -> None:
+        """Clear the history."""
+        _manager().clear_history()
+
+    def __len__(self) -> int:
+        """Return the number of recorded calculations."""
+        return _manager().calculation_count()
+
+    def __bool__(self) -> bool:
+        """Return whether any calculation is recorded."""
+        return len(self) > 0
+
+    def _position(self, index: int) -> int:
+        """Return the position of a list index, raising IndexError if it is out of range."""
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("calculation index out of range")
+        return index
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Calculation, List[Calculation]]:
+        """Return one calculation, or a list of them for a slice."""
+        if isinstance(index, slice):
+            return _manager().calculations_at(range(*index.indices(len(self))))
+        position = self._position(index)
+        if position == len(self) - 1:
+            return _manager().latest_calculation()
+        return _manager().calculations_at([position])[0]
+
+    def _splice(self, start: int, stop: int, calculations: List[Calculation]) -> None:
+        """Replace the calculations at ``start:stop``."""
+        _manager().splice_calculations(start, stop, calculations,
+                                       [recorded_result(calculation) for calculation in calculations])
+
+    def __setitem__(self, index: Union[int, slice], value: Any) -> None:
+        """Replace one calculation, or a slice of them."""
+        if not isinstance(index, slice):
+            position = self._position(index)
+            self._splice(position, position + 1, [value])
+            return
+        calculations = list(value)
+        start, stop, step = index.indices(len(self))
+        if step == 1:
+            self._splice(start, max(start, stop), calculations)
+            return
+        positions = range(start, stop, step)
+        if len(calculations) != len(positions):
+            raise ValueError(f"attempt to assign sequence of size {len(calculations)} "
+                             f"to extended slice of size {len(positions)}")
+        for position, calculation in zip(positions, calculations):
+            self._splice(position, position + 1, [calculation])
+
+    def __delitem__(self, index: Union[int, slice]) -> None:
+        """Remove one calculation, or a slice of them."""
+        if not isinstance(index, slice):
+            position = self._position(index)
+            self._splice(position, position + 1, [])
+            return
+        start, stop, step = index.indices(len(self))
+        if step == 1:
+            self._splice(start, max(start, stop), [])
+            return
+        # Remove from the end, so earlier positions stay valid
+        for position in sorted(range(start, stop, step), reverse=True):
+            self._splice(position, position + 1, [])
+
+    def insert(self, index: int, value: Calculation) -> None:
+        """Insert a calculation before ``index``, clamped to the list like ``list.insert``."""
+        size = len(self)
+        if index < 0:
+            index = max(index + size, 0)
+        if index >= size:
+            self.append(value)
+            return
+        self._splice(index, index, [value])
+
+    def extend(self, values: Iterable[Calculation]) -> None:
+        """Record several calculations in the history."""
+        for calculation in list(values):
+            self.append(calculation)
+
+    def __iter__(self) -> Iterator[Calculation]:
+        """Iterate over the calculations, oldest first."""
+        return _manager().iter_calculations()
+
+    def __eq__(self, other: Any) -> bool:
+        """Compare equal to a list (or another view) of equal calculations, like the list it replaces."""
+        if isinstance(other, (list, CalculationHistory)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def copy(self) -> List[Calculation]:
+        """Return the calculations as a new list."""
+        return list(self)
+
+    def __repr__(self) -> str:
+        """Return the calculations as a list would show them."""
+        return repr(list(self))
@@ -1,33 +1,39 @@
-from typing import List
+from decimal import Decimal
+from typing import List, Optional
 from calculator.calculation import Calculation
+from calculator.calculation_store import CalculationHistory, _manager, recorded_result
 
 class Calculations:
-    history: List[Calculation] = []
+    # View over the HistoryManager rows; calculations are recorded only once.
+    # HistoryManager is imported on first use (see _manager), so importing this module does not load pandas.
+    history = CalculationHistory()
 
     @classmethod
-    def add_calculation(cls, calculation: Calculation):
-        """Add a new calculation to the history."""
-        cls.history.append(calculation)
+    def add_calculation(cls, calculation: Calculation, result: Optional[Decimal] = None):
+        """Add a new calculation to the history, performing it unless ``result`` is given.
+
+        A calculation that cannot be performed (e.g. a division by zero) is
+        still added, with a NaN result; see ``recorded_result``.
+        """
+        _manager().add_calculation(calculation, result=recorded_result(calculation) if result is None else result)
 
     @classmethod
-    def get_history(cls) -> List[Calculation]:
-        """Retrieve the entire history of calculations."""
+    def get_history(cls) -> CalculationHistory:
+        """Retrieve the entire history of calculations, as a list-compatible view."""
         return cls.history
 
     @classmethod
     def clear_history(cls):
         """Clear the history of calculations."""
-        cls.history.clear()
+        _manager().clear_history()
 
     @classmethod
     def get_latest(cls) -> Calculation:
         """Get the latest calculation. Returns None if there's no history."""
-        if cls.history:
-            return cls.history[-1]
-        return None
+        return _manager().latest_calculation()
     
     
     @classmethod
     def find_by_operation(cls, operation_name: str) -> List[Calculation]:
         """Find and return a list of calculations by operation name."""
-        return [calc for calc in cls.history if calc.operation.__name__ == operation_name]
\ No newline at end of file
+        return _manager().calculations_by_operation(operation_name)
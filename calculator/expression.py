@@ -0,0 +1,255 @@
+"""Module for compiling and evaluating arithmetic expressions.
+
+Expressions such as ``(2 + 3) * 4 / x`` are parsed once into a tree whose
+inner nodes are the functions from ``calculator.operations``. The tree is
+compiled into nested closures, and compiled expressions are kept in an LRU
+cache, so evaluating the same formula again skips parsing entirely.
+"""
+
+import os
+import re
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+from typing import Any, Callable, Dict, FrozenSet, List, Mapping, NamedTuple, Optional, Tuple, Union
+import numpy as np
+from calculator.operations import add, subtract, multiply, divide
+
+# Number of compiled expressions kept by compile_expression
+EXPRESSION_CACHE_SIZE = int(os.environ.get('CALCULATOR_EXPRESSION_CACHE_SIZE', 256))
+
+_TOKEN = re.compile(r'\s*(?:(\d+\.?\d*(?:[eE][+-]?\d+)?|\.\d+(?:[eE][+-]?\d+)?)|([A-Za-z_]\w*)|(\S))')
+
+_BINARY_OPERATIONS = {'+': add, '-': subtract, '*': multiply, '/': divide}
+
+
+class ExpressionError(ValueError):
+    """Raised when an expression cannot be parsed or evaluated."""
+
+
+class Constant(NamedTuple):
+    """Numeric literal in an expression tree."""
+
+    value: Decimal
+
+
+class Variable(NamedTuple):
+    """Named value supplied when the expression is evaluated."""
+
+    name: str
+
+
+class Apply(NamedTuple):
+    """Operation from ``calculator.operations`` applied to two sub-expressions."""
+
+    operation: Callable
+    left: 'Node'
+    right: 'Node'
+
+
+Node = Union[Constant, Variable, Apply]
+
+
+def _tokenize(source: str) -> List[Tuple[str, str]]:
+    """Split an expression into ('number' | 'name' | 'symbol', text) tokens."""
+    tokens = []
+    position = 0
+    source = source.rstrip()
+    while position < len(source):
+        match = _TOKEN.match(source, position)
+        number, name, symbol = match.groups()
+        if number is not None:
+            tokens.append(('number', number))
+        elif name is not None:
+            tokens.append(('name', name))
+        elif symbol in '+-*/()':
+            tokens.append(('symbol', symbol))
+        else:
+            raise ExpressionError(f"Unexpected character {symbol!r} at position {match.start(3)}")
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    """Recursive-descent parser for ``+ - * /``, unary minus and parentheses."""
+
+    def __init__(self, source: str):
+        """Tokenize the source expression."""
+        self._tokens = _tokenize(source)
+        self._position = 0
+
+    def _peek(self) -> Optional[Tuple[str, str]]:
+        """Return the next token without consuming it."""
+        return self._tokens[self._position] if self._position < len(self._tokens) else None
+
+    def _next(self) -> Tuple[str, str]:
+        """Consume and return the next token."""
+        token = self._peek()
+        if token is None:
+            raise ExpressionError("Unexpected end of expression")
+        self._position += 1
+        return token
+
+    def parse(self) -> Node:
+        """Parse the whole expression."""
+        if not self._tokens:
+            raise ExpressionError("Empty expression")
+        tree = self._sum()
+        if self._peek() is not None:
+            raise ExpressionError(f"Unexpected {self._peek()[1]!r}")
+        return tree
+
+    def _sum(self) -> Node:
+        """Parse terms joined by ``+`` and ``-``."""
+        tree = self._product()
+        while self._peek() in (('symbol', '+'), ('symbol', '-')):
+            operation = _BINARY_OPERATIONS[self._next()[1]]
+            tree = Apply(operation, tree, self._product())
+        return tree
+
+    def _product(self) -> Node:
+        """Parse factors joined by ``*`` and ``/``."""
+        tree = self._unary()
+        while self._peek() in (('symbol', '*'), ('symbol', '/')):
+            operation = _BINARY_OPERATIONS[self._next()[1]]
+            tree = Apply(operation, tree, self._unary())
+        return tree
+
+    def _unary(self) -> Node:
+        """Parse a factor with any leading signs."""
+        if self._peek() == ('symbol', '-'):
+            self._next()
+            # Negation is subtraction from zero, so it reuses the subtract operation
+            return Apply(subtract, Constant(Decimal(0)), self._unary())
+        if self._peek() == ('symbol', '+'):
+            self._next()
+            return self._unary()
+        return self._primary()
+
+    def _primary(self) -> Node:
+        """Parse a number, a variable or a parenthesized expression."""
+        kind, text = self._next()
+        if kind == 'number':
+            return Constant(Decimal(text))
+        if kind == 'name':
+            return Variable(text)
+        if text == '(':
+            tree = self._sum()
+            if self._next() != ('symbol', ')'):
+                raise ExpressionError("Expected ')'")
+            return tree
+        raise ExpressionError(f"Unexpected {text!r}")
+
+
+def _divide_masked(a: Any, b: Any) -> np.ndarray:
+    """Divide element-wise, giving NaN for zero divisors as ``Calculator.evaluate_batch`` does."""
+    a, b = np.broadcast_arrays(np.asarray(a, dtype=np.float64), np.asarray(b, dtype=np.float64))
+    results = np.full(a.shape, np.nan)
+    np.divide(a, b, out=results, where=b != 0)
+    return results
+
+
+def _compile(node: Node, exact: bool) -> Callable[[Mapping[str, Any]], Any]:
+    """Turn an expression tree into nested closures over the operations.
+
+    Exact closures keep literals as Decimal; vectorized closures use float
+    literals so they combine with NumPy arrays, and mask zero divisors
+    instead of letting one of them fail the whole array.
+    """
+    if isinstance(node, Constant):
+        value = node.value if exact else float(node.value)
+        return lambda bindings: value
+    if isinstance(node, Variable):
+        name = node.name
+        return lambda bindings: bindings[name]
+    operation = node.operation if exact or node.operation is not divide else _divide_masked
+    left, right = _compile(node.left, exact), _compile(node.right, exact)
+    return lambda bindings: operation(left(bindings), right(bindings))
+
+
+def _variables(node: Node) -> FrozenSet[str]:
+    """Collect the variable names used by an expression tree."""
+    if isinstance(node, Variable):
+        return frozenset([node.name])
+    if isinstance(node, Apply):
+        return _variables(node.left) | _variables(node.right)
+    return frozenset()
+
+
+class CompiledExpression:
+    """Parsed expression that can be evaluated many times.
+
+    With scalar bindings the expression is evaluated exactly with Decimal
+    arithmetic. If any binding is an array (a NumPy array, pandas Series or
+    list), every binding is converted to a float64 array and the expression
+    is evaluated element-wise in one pass; elements that divide by zero are
+    NaN, as in ``Calculator.evaluate_batch``.
+    """
+
+    def __init__(self, source: str, tree: Node):
+        """Initialize the expression from its source text and parsed tree."""
+        self.source = source
+        self.tree = tree
+        self.variables = _variables(tree)
+        self._exact: Optional[Callable] = None
+        self._vectorized: Optional[Callable] = None
+
+    def evaluate(self, bindings: Optional[Mapping[str, Any]] = None, **kwargs) -> Union[Decimal, np.ndarray]:
+        """Evaluate the expression for one set of variable values.
+
+        Args:
+            bindings: Mapping from variable name to value.
+            **kwargs: More variable values, taking precedence over ``bindings``.
+
+        Returns:
+            A Decimal for scalar bindings, or a NumPy array for array bindings.
+
+        Raises:
+            ExpressionError: If a variable is missing or a value is not a number.
+            ValueError: If the expression divides by zero with scalar bindings.
+            ArithmeticError: If exact evaluation fails otherwise, e.g. ``decimal.Overflow``.
+        """
+        values: Dict[str, Any] = dict(bindings or {}, **kwargs)
+        missing = self.variables - values.keys()
+        if missing:
+            raise ExpressionError(f"Missing value for {', '.join(sorted(missing))}")
+        if any(not isinstance(values[name], (Decimal, int, float, str)) for name in self.variables):
+            if self._vectorized is None:
+                self._vectorized = _compile(self.tree, exact=False)
+            arrays = {name: np.asarray(values[name], dtype=np.float64) for name in self.variables}
+            return self._vectorized(arrays)
+        if self._exact is None:
+            self._exact = _compile(self.tree, exact=True)
+        try:
+            exact = {name: values[name] if isinstance(values[name], Decimal) else Decimal(str(values[name]))
+                     for name in self.variables}
+        except InvalidOperation:
+            raise ExpressionError(f"Invalid number in {values}") from None
+        return self._exact(exact)
+
+    __call__ = evaluate
+
+    def __repr__(self):
+        """Return the string representation of the compiled expression."""
+        return f"CompiledExpression({self.source!r})"
+
+
+@lru_cache(maxsize=EXPRESSION_CACHE_SIZE)
+def compile_expression(source: str) -> CompiledExpression:
+    """Parse and compile an expression, reusing the cached result for repeated sources.
+
+    Args:
+        source: Expression text, e.g. ``(2 + 3) * 4 / x``.
+
+    Returns:
+        The compiled expression.
+
+    Raises:
+        ExpressionError: If the expression is malformed.
+    """
+    return CompiledExpression(source, _Parser(source).parse())
+
+
+def evaluate_expression(source: str, bindings: Optional[Mapping[str, Any]] = None,
+                        **kwargs) -> Union[Decimal, np.ndarray]:
+    """Compile (or fetch from the cache) and evaluate an expression."""
+    return compile_expression(source).evaluate(bindings, **kwargs)
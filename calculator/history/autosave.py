@@ -0,0 +1,91 @@
+"""Module providing a background worker that periodically saves new history rows."""
+
+import threading
+from typing import Callable, Optional
+from calculator.logging_config import get_logger
+
+# Get module logger
+logger = get_logger(__name__)
+
+
+class AutosaveWorker:
+    """Daemon thread calling ``save`` on a timer or once enough rows were added.
+
+    ``notify`` is all the adding side does: it bumps a counter and, when the
+    row threshold is reached, sets an event. It never waits for the worker or
+    for a save in progress. ``stop`` wakes the worker, waits for it to finish
+    and runs a final save so nothing added before it is lost.
+    """
+
+    def __init__(self, save: Callable[[], int], interval: float = 0.0, rows: int = 0):
+        """Configure the worker.
+
+        Args:
+            save: Function writing the rows added since its last call and
+                returning how many rows it wrote.
+            interval: Seconds between saves, or 0 to save only on the row threshold.
+            rows: Rows added before a save is triggered early, or 0 for no threshold.
+        """
+        if interval <= 0 and rows <= 0:
+            raise ValueError("Autosave needs a positive interval or row threshold")
+        self.interval = interval
+        self.rows = rows
+        self._save = save
+        self._pending = 0
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+        self.saves = 0
+
+    @property
+    def running(self) -> bool:
+        """Whether the worker thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start the worker thread."""
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name='history-autosave', daemon=True)
+        self._thread.start()
+        logger.info(f"History autosave started (interval {self.interval}s, every {self.rows} rows)")
+
+    def notify(self, count: int = 1) -> None:
+        """Record that ``count`` rows were added, waking the worker at the row threshold."""
+        # Unsynchronized on purpose: a lost increment only delays the threshold save slightly
+        self._pending += count
+        if self.rows and self._pending >= self.rows:
+            self._wake.set()
+
+    def flush(self) -> int:
+        """Save the new rows now, from the calling thread, and return how many were written."""
+        self._pending = 0
+        written = self._save()
+        self.saves += 1
+        return written
+
+    def stop(self, flush: bool = True) -> None:
+        """Stop the worker thread, then save any rows it has not written yet."""
+        self._stopping = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if flush:
+            self._flush_logged()
+        logger.info("History autosave stopped")
+
+    def _flush_logged(self) -> None:
+        """Save, logging instead of raising so a failed save does not end the worker."""
+        try:
+            self.flush()
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.error(f"History autosave failed: {e}")
+
+    def _run(self) -> None:
+        """Save on every timeout or wake-up until stopped."""
+        while True:
+            self._wake.wait(self.interval if self.interval > 0 else None)
+            self._wake.clear()
+            if self._stopping:
+                return
+            self._flush_logged()
@@ -0,0 +1,275 @@
+"""Module providing a growable columnar buffer for calculation history."""
+
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+# Column layout shared by every history DataFrame
+HISTORY_COLUMNS = ['timestamp', 'a', 'b', 'operation', 'result']
+
+# Explicit dtype for every history column
+HISTORY_DTYPES = {
+    'timestamp': 'datetime64[ns]',
+    'a': 'float64',
+    'b': 'float64',
+    'operation': 'category',
+    'result': 'float64'
+}
+
+
+def apply_history_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """Return ``df`` restricted to the history columns and cast to the history dtypes."""
+    return df[HISTORY_COLUMNS].astype(HISTORY_DTYPES)
+
+
+def empty_history_frame() -> pd.DataFrame:
+    """Return an empty history DataFrame with the history dtypes."""
+    return pd.DataFrame(columns=HISTORY_COLUMNS).astype(HISTORY_DTYPES)
+
+
+def is_ascending(timestamps: np.ndarray, previous: Optional[np.datetime64] = None) -> bool:
+    """Check that ``timestamps`` are in ascending order and none precedes ``previous``."""
+    if len(timestamps) == 0:
+        return True
+    if previous is not None and timestamps[0] < previous:
+        return False
+    return bool((timestamps[1:] >= timestamps[:-1]).all())
+
+
+class OperationCodes:
+    """Registry assigning small integer codes to operation names.
+
+    Codes are handed out in order of first use, so the categories of the
+    history DataFrame list operations in the order they first appeared.
+    """
+
+    def __init__(self, names: Optional[List[str]] = None, limit: int = 32767,
+                 on_change: Optional[Callable[[List[str]], None]] = None):
+        """Initialize the registry with any previously assigned names."""
+        self._names: List[str] = list(names or [])
+        self._codes: Dict[str, int] = {name: code for code, name in enumerate(self._names)}
+        self._limit = limit
+        self._on_change = on_change
+
+    @property
+    def names(self) -> List[str]:
+        """Operation names indexed by code."""
+        return self._names
+
+    def get(self, name: str) -> Optional[int]:
+        """Return the code of an operation name, or None if it was never recorded."""
+        return self._codes.get(name)
+
+    def code(self, name: str) -> int:
+        """Return the code of an operation name, registering it if it is new."""
+        code = self._codes.get(name)
+        if code is None:
+            if len(self._names) >= self._limit:
+                raise ValueError(f"Too many distinct operations in history: {name}")
+            code = len(self._names)
+            self._names.append(name)
+            self._codes[name] = code
+            if self._on_change:
+                self._on_change(self._names)
+        return code
+
+    def encode(self, operations: pd.Series, dtype) -> np.ndarray:
+        """Turn a column of operation names into an array of codes."""
+        positions, names = pd.factorize(operations)
+        lookup = np.array([self.code(name) for name in names], dtype=dtype)
+        return lookup[positions]
+
+    def decode(self, codes: np.ndarray) -> pd.Categorical:
+        """Turn an array of codes into a categorical of operation names."""
+        return pd.Categorical.from_codes(codes, categories=list(self._names))
+
+    def clear(self) -> None:
+        """Forget every registered name."""
+        self._names = []
+        self._codes = {}
+        if self._on_change:
+            self._on_change(self._names)
+
+
+class HistoryBuffer:
+    """Append-only columnar buffer backed by preallocated NumPy arrays.
+
+    Each column lives in its own array with spare capacity. When the arrays are
+    full their capacity is doubled, so appending a row is amortized O(1). The
+    operation column holds int16 codes and surfaces as a categorical. The
+    DataFrame view is only built when it is requested and is cached until the
+    next write. The buffer tracks whether its timestamps are still in
+    ascending order, so time-range lookups can binary search them.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        """Initialize an empty buffer with the given starting capacity."""
+        self._initial_capacity = max(int(capacity), 1)
+        self._allocate(self._initial_capacity)
+        self._size = 0
+        self._time_sorted = True
+        self._operations = OperationCodes()
+        self._frame: Optional[pd.DataFrame] = None
+
+    def _allocate(self, capacity: int) -> None:
+        """Allocate empty column arrays of the given capacity."""
+        self._timestamp = np.empty(capacity, dtype='datetime64[ns]')
+        self._a = np.empty(capacity, dtype=np.float64)
+        self._b = np.empty(capacity, dtype=np.float64)
+        self._operation = np.empty(capacity, dtype=np.int16)
+        self._result = np.empty(capacity, dtype=np.float64)
+
+    def _reserve(self, required: int) -> None:
+        """Grow the column arrays so they can hold at least ``required`` rows."""
+        capacity = len(self._a)
+        if required <= capacity:
+            return
+        while capacity < required:
+            capacity *= 2
+        for name in ('_timestamp', '_a', '_b', '_operation', '_result'):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:self._size] = old[:self._size]
+            setattr(self, name, new)
+
+    def __len__(self) -> int:
+        """Return the number of rows stored in the buffer."""
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        """Number of rows the buffer can hold before growing again."""
+        return len(self._a)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes reserved by the column arrays."""
+        return sum(column.nbytes for column in (self._timestamp, self._a, self._b, self._operation, self._result))
+
+    @property
+    def operations(self) -> OperationCodes:
+        """Registry mapping operation names to the codes in the operation column."""
+        return self._operations
+
+    @property
+    def time_sorted(self) -> bool:
+        """Whether the timestamps are in ascending order."""
+        return self._time_sorted
+
+    def column(self, name: str, start: int = 0) -> np.ndarray:
+        """Return a read-only view of the stored values of one column from row ``start`` on."""
+        view = getattr(self, f'_{name}')[start:self._size].view()
+        view.flags.writeable = False
+        return view
+
+    def append(self, timestamp: datetime, a: float, b: float, operation: str, result: float) -> None:
+        """Append a single row to the buffer."""
+        index = self._size
+        if index == len(self._a):
+            self._reserve(index + 1)
+        timestamp = np.datetime64(timestamp, 'ns')
+        if index and timestamp < self._timestamp[index - 1]:
+            self._time_sorted = False
+        self._timestamp[index] = timestamp
+        self._a[index] = a
+        self._b[index] = b
+        self._operation[index] = self._operations.code(operation)
+        self._result[index] = result
+        self._size = index + 1
+        self._frame = None
+
+    def extend(self, df: pd.DataFrame) -> None:
+        """Append every row of a history DataFrame to the buffer."""
+        count = len(df)
+        if count == 0:
+            return
+        start, end = self._size, self._size + count
+        self._reserve(end)
+        timestamps = pd.to_datetime(df['timestamp']).to_numpy(dtype='datetime64[ns]')
+        if self._time_sorted:
+            self._time_sorted = is_ascending(timestamps, self._timestamp[start - 1] if start else None)
+        self._timestamp[start:end] = timestamps
+        self._a[start:end] = df['a'].to_numpy(dtype=np.float64)
+        self._b[start:end] = df['b'].to_numpy(dtype=np.float64)
+        self._operation[start:end] = self._operations.encode(df['operation'], np.int16)
+        self._result[start:end] = df['result'].to_numpy(dtype=np.float64)
+        self._size = end
+        self._frame = None
+
+    def discard(self, count: int) -> None:
+        """Drop the oldest ``count`` rows, keeping the operation codes of the rest."""
+        count = min(max(count, 0), self._size)
+        remaining = self._size - count
+        for name in ('_timestamp', '_a', '_b', '_operation', '_result'):
+            column = getattr(self, name)
+            column[:remaining] = column[count:self._size]
+        self._size = remaining
+        self._frame = None
+
+    def clear(self) -> None:
+        """Remove every row and release the grown arrays."""
+        self._allocate(self._initial_capacity)
+        self._size = 0
+        self._time_sorted = True
+        self._operations.clear()
+        self._frame = None
+
+    def latest(self) -> Optional[dict]:
+        """Return the last row as a dictionary, or None if the buffer is empty."""
+        if self._size == 0:
+            return None
+        index = self._size - 1
+        return {
+            'timestamp': pd.Timestamp(self._timestamp[index]),
+            'a': float(self._a[index]),
+            'b': float(self._b[index]),
+            'operation': self._operations.names[self._operation[index]],
+            'result': float(self._result[index])
+        }
+
+    def slice(self, start: int, stop: Optional[int] = None) -> pd.DataFrame:
+        """Return rows ``start:stop`` as a new DataFrame indexed by position, without touching the cache."""
+        stop = self._size if stop is None else min(stop, self._size)
+        start = min(max(start, 0), stop)
+        return pd.DataFrame({
+            'timestamp': self._timestamp[start:stop].copy(),
+            'a': self._a[start:stop].copy(),
+            'b': self._b[start:stop].copy(),
+            'operation': self._operations.decode(self._operation[start:stop].copy()),
+            'result': self._result[start:stop].copy()
+        }, columns=HISTORY_COLUMNS, index=pd.RangeIndex(start, stop))
+
+    def take(self, positions: np.ndarray) -> pd.DataFrame:
+        """Return the rows at the given positions, indexed by position."""
+        positions = np.asarray(positions, dtype=np.int64)
+        return pd.DataFrame({
+            'timestamp': self._timestamp[positions],
+            'a': self._a[positions],
+            'b': self._b[positions],
+            'operation': self._operations.decode(self._operation[positions]),
+            'result': self._result[positions]
+        }, columns=HISTORY_COLUMNS, index=positions)
+
+    def iter_chunks(self, chunk_rows: int = 1 << 20) -> Iterator[Tuple[int, Dict[str, np.ndarray]]]:
+        """Yield ``(offset, columns)`` pairs covering the buffer in row order.
+
+        The column arrays are views into the buffer, so scanning the history
+        does not copy it. Callers must not modify them. The operation column
+        holds codes from ``operations``.
+        """
+        for start in range(0, self._size, chunk_rows):
+            stop = min(start + chunk_rows, self._size)
+            yield start, {
+                'timestamp': self._timestamp[start:stop],
+                'a': self._a[start:stop],
+                'b': self._b[start:stop],
+                'operation': self._operation[start:stop],
+                'result': self._result[start:stop]
+            }
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Return the buffered rows as a DataFrame, building it only when stale."""
+        if self._frame is None:
+            self._frame = self.slice(0)
+        return self._frame
@@ -0,0 +1,124 @@
+"""Module for the thread-safe mode of HistoryManager: per-thread buffers merged under a lock."""
+
+import functools
+import os
+import threading
+from datetime import datetime
+from typing import Any, Callable, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from calculator.calculation import Calculation
+from calculator.logging_config import get_logger
+
+# Get module logger
+logger = get_logger(__name__)
+
+
+def synchronized(method: Callable) -> Callable:
+    """Run a HistoryManager method under the history lock in thread-safe mode.
+    
+    Rows still waiting in per-thread buffers are merged first, so the method
+    sees one consistent snapshot that includes every calculation added before
+    it was called.
+    """
+    @functools.wraps(method)
+    def wrapper(cls, *args, **kwargs):
+        if not cls._thread_safe:
+            return method(cls, *args, **kwargs)
+        with cls._lock:
+            cls._merge_thread_buffers()
+            return method(cls, *args, **kwargs)
+    return wrapper
+
+
+class ConcurrencyMixin:
+    """Thread-safe mode of ``HistoryManager``: calculations queued per thread and merged in batches."""
+    
+    # Thread-safe mode: each thread queues its calculations in its own buffer, and the
+    # buffers are merged into the store in batches under _lock
+    _thread_safe = os.environ.get('CALCULATOR_HISTORY_THREAD_SAFE', 'false').lower() in ('1', 'true', 'yes')
+    _thread_buffer_rows = int(os.environ.get('CALCULATOR_HISTORY_THREAD_BUFFER_ROWS', 256))
+    _lock = threading.RLock()
+    _local = threading.local()
+    # (owning thread, pending rows) for every thread that has buffered calculations
+    _thread_buffers: List[Tuple[threading.Thread, List[Tuple[datetime, Calculation, Any]]]] = []
+    # Held while a history file is written; always taken before _lock
+    _file_lock = threading.Lock()
+    
+    @classmethod
+    def configure_concurrency(cls, thread_safe: bool, buffer_rows: Optional[int] = None) -> None:
+        """Turn thread-safe mode on or off.
+        
+        In thread-safe mode ``add_calculation`` only queues the calculation in
+        a buffer owned by the calling thread. A buffer is merged into the
+        store with one bulk append, under a short lock, once it holds
+        ``buffer_rows`` calculations, and every buffer is merged before any
+        read, so reads always see every calculation added before them.
+        
+        Args:
+            thread_safe: Whether calculations may be added from several threads.
+            buffer_rows: Calculations a thread buffers before merging them. If
+                None, keeps the current setting (``CALCULATOR_HISTORY_THREAD_BUFFER_ROWS``).
+        """
+        with cls._lock:
+            cls._merge_thread_buffers()
+            cls._thread_safe = thread_safe
+            if buffer_rows is not None:
+                cls._thread_buffer_rows = max(int(buffer_rows), 1)
+        logger.info(f"History thread-safe mode {'enabled' if thread_safe else 'disabled'}")
+    
+    @classmethod
+    def _buffer_calculation(cls, calculation: Calculation, timestamp: datetime, result: Any) -> None:
+        """Queue a calculation in the calling thread's buffer, merging the buffer once it is full."""
+        rows = getattr(cls._local, 'rows', None)
+        if rows is None:
+            rows = cls._local.rows = []
+            with cls._lock:
+                cls._thread_buffers.append((threading.current_thread(), rows))
+        # Only this thread appends to its buffer; mergers take rows from the front under the lock
+        rows.append((timestamp, calculation, result))
+        if len(rows) >= cls._thread_buffer_rows:
+            with cls._lock:
+                cls._merge_rows(rows)
+    
+    @classmethod
+    def _merge_thread_buffers(cls) -> None:
+        """Merge every thread's pending calculations into the store; the caller holds the lock."""
+        if not cls._thread_buffers:
+            return
+        pending = []
+        for thread, rows in cls._thread_buffers:
+            count = len(rows)
+            pending.extend(rows[:count])
+            del rows[:count]
+        cls._append_rows_from(pending)
+        # Forget buffers of threads that have finished and left nothing behind
+        cls._thread_buffers = [(thread, rows) for thread, rows in cls._thread_buffers
+                               if rows or thread.is_alive()]
+    
+    @classmethod
+    def _merge_rows(cls, rows: List[Tuple[datetime, Calculation, Any]]) -> None:
+        """Merge the calculations currently in one buffer into the store; the caller holds the lock."""
+        # Rows appended by the owning thread after len() stay queued for the next merge
+        count = len(rows)
+        pending = rows[:count]
+        del rows[:count]
+        cls._append_rows_from(pending)
+    
+    @classmethod
+    def _append_rows_from(cls, pending: List[Tuple[datetime, Calculation, Any]]) -> None:
+        """Append buffered ``(timestamp, calculation, result)`` rows with one bulk append."""
+        if not pending:
+            return
+        start = len(cls._history)
+        cls._history.extend(pd.DataFrame({
+            'timestamp': np.array([timestamp for timestamp, _, _ in pending], dtype='datetime64[ns]'),
+            'a': np.array([float(calculation.a) for _, calculation, _ in pending], dtype=np.float64),
+            'b': np.array([float(calculation.b) for _, calculation, _ in pending], dtype=np.float64),
+            'operation': [calculation.operation.__name__ for _, calculation, _ in pending],
+            'result': np.array([float(result) for _, _, result in pending], dtype=np.float64)
+        }))
+        cls._index_appended(start)
+        for position, (_, calculation, _) in enumerate(pending, start):
+            cls._remember_calculation(position, calculation)
+        logger.info(f"Merged {len(pending)} buffered calculations into history")
@@ -4,7 +4,6 @@ import os
 import pandas as pd
 from typing import Dict, List, Optional, Union, Any, Tuple
 from datetime import datetime
-import matplotlib.pyplot as plt
 from io import BytesIO
 import base64
 from calculator.logging_config import get_logger
@@ -132,7 +131,8 @@ class PandasFacade:
     @staticmethod
     def filter_by_date_range(df: pd.DataFrame, date_column: str, 
                             start_date: Union[str, datetime], 
-                            end_date: Union[str, datetime]) -> pd.DataFrame:
+                            end_date: Union[str, datetime],
+                            time_sorted: bool = False) -> pd.DataFrame:
         """Filter DataFrame by date range.
         
         Args:
@@ -140,6 +140,10 @@ class PandasFacade:
             date_column: Date column name.
             start_date: Start date (inclusive).
             end_date: End date (inclusive).
+            time_sorted: Whether the rows are known to be in date order (e.g.
+                ``HistoryManager.is_time_sorted()`` for a frame returned by
+                ``get_history``). The bounds are then binary searched instead
+                of comparing every row; the order is not checked.
             
         Returns:
             Filtered DataFrame.
@@ -159,7 +163,14 @@ class PandasFacade:
             if isinstance(end_date, str):
                 end_date = pd.to_datetime(end_date)
             
-            filtered = df[(df[date_column] >= start_date) & (df[date_column] <= end_date)]
+            dates = df[date_column]
+            if time_sorted:
+                # Sorted dates: binary search the bounds instead of building two masks
+                start = dates.searchsorted(pd.Timestamp(start_date), side='left')
+                end = dates.searchsorted(pd.Timestamp(end_date), side='right')
+                filtered = df.iloc[start:end]
+            else:
+                filtered = df[(dates >= start_date) & (dates <= end_date)]
             logger.debug(f"Filtered DataFrame by date range {start_date} to {end_date}, got {len(filtered)} rows")
             return filtered
         except Exception as e:
@@ -232,7 +243,7 @@ class PandasFacade:
                 logger.warning(f"Columns not found in DataFrame: {', '.join(missing)}")
                 return pd.DataFrame()
             
-            pivot = pd.pivot_table(df, index=index, values=values, aggfunc=aggfunc)
+            pivot = pd.pivot_table(df, index=index, values=values, aggfunc=aggfunc, observed=True)
             logger.debug(f"Created pivot table with shape {pivot.shape}")
             return pivot
         except Exception as e:
@@ -255,6 +266,8 @@ class PandasFacade:
         Returns:
             Base64 encoded PNG image.
         """
+        # Imported on first use: the plotting stack costs more than everything else at startup
+        import matplotlib.pyplot as plt
         try:
             if df.empty:
                 logger.debug("Attempted to generate chart but DataFrame is empty")
@@ -277,7 +290,7 @@ class PandasFacade:
             elif chart_type == 'hist' and x in df.columns:
                 df[x].plot(kind='hist', title=title, bins=10)
             else:
-                logger.warning(f"Invalid chart type or missing required columns")
+                logger.warning("Invalid chart type or missing required columns")
                 return ""
             
             plt.tight_layout()
@@ -374,7 +387,7 @@ class PandasFacade:
                 logger.debug("Attempted to group empty DataFrame")
                 return pd.DataFrame()
                 
-            grouped = df.groupby(by).agg(agg_dict).reset_index()
+            grouped = df.groupby(by, observed=True).agg(agg_dict).reset_index()
             logger.debug(f"Grouped DataFrame by {by}, result shape {grouped.shape}")
             return grouped
         except Exception as e:
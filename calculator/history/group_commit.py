@@ -0,0 +1,125 @@
+"""Module providing a group-commit writer for durable history records."""
+
+import os
+import threading
+import time
+from concurrent.futures import Future
+from typing import List, Optional, Tuple
+from calculator.logging_config import get_logger
+
+# Get module logger
+logger = get_logger(__name__)
+
+
+class GroupCommitWriter:
+    """Append-only file where many writers share each append and fsync.
+
+    ``submit`` queues a record and returns a ``Future`` that completes once
+    the record is on disk. A single committer thread takes every record that
+    arrived while the previous commit was running, writes them with one
+    append and makes them durable with one ``os.fsync``. It waits at most
+    ``max_latency`` seconds after the first record of a batch for more to
+    arrive, which bounds how long a writer waits beyond the fsync itself.
+    """
+
+    def __init__(self, path: str, max_latency: float = 0.005, max_batch: int = 10_000,
+                 header: Optional[bytes] = None):
+        """Open ``path`` for appending and start the committer thread.
+
+        Args:
+            path: File the records are appended to.
+            max_latency: Seconds the committer waits for more records after
+                the first one of a batch arrives; 0 commits at once.
+            max_batch: Records that trigger a commit without waiting further.
+            header: Bytes written first when the file is new or empty.
+        """
+        self.path = path
+        self.max_latency = max(max_latency, 0.0)
+        self.max_batch = max(max_batch, 1)
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # Kept open for the writer's lifetime; close() closes it
+        self._file = open(path, 'ab')  # pylint: disable=consider-using-with
+        if header and self._file.tell() == 0:
+            self._file.write(header)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        self._ready = threading.Condition()
+        self._pending: List[Tuple[bytes, Future]] = []
+        self._first_arrival = 0.0
+        self._closed = False
+        self.commits = 0
+        self.records = 0
+        self._thread = threading.Thread(target=self._run, name='history-group-commit', daemon=True)
+        self._thread.start()
+
+    def submit(self, record: bytes) -> Future:
+        """Queue a record; the returned future completes when it is durable.
+
+        The future's result is the number of the commit that wrote it, or it
+        holds the OSError that made the commit fail.
+        """
+        future: Future = Future()
+        with self._ready:
+            if self._closed:
+                raise ValueError(f"Group-commit writer for {self.path} is closed")
+            if not self._pending:
+                self._first_arrival = time.monotonic()
+            self._pending.append((record, future))
+            if len(self._pending) == 1 or len(self._pending) >= self.max_batch:
+                self._ready.notify()
+        return future
+
+    def sync(self) -> None:
+        """Wait until every record submitted so far is durable."""
+        self.submit(b'').result()
+
+    def close(self) -> None:
+        """Commit the records still queued, stop the committer and close the file."""
+        with self._ready:
+            if self._closed:
+                return
+            self._closed = True
+            self._ready.notify()
+        self._thread.join()
+        self._file.close()
+        logger.info(f"Group-commit writer closed after {self.commits} commits of {self.records} records")
+
+    def _next_batch(self) -> Optional[List[Tuple[bytes, Future]]]:
+        """Wait for records and return the next batch, or None once closed and drained."""
+        with self._ready:
+            while not self._pending and not self._closed:
+                self._ready.wait()
+            if not self._pending:
+                return None
+            deadline = self._first_arrival + self.max_latency
+            while not self._closed and len(self._pending) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._ready.wait(remaining)
+            batch, self._pending = self._pending, []
+            return batch
+
+    def _run(self) -> None:
+        """Commit batches until the writer is closed."""
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            self._commit(batch)
+
+    def _commit(self, batch: List[Tuple[bytes, Future]]) -> None:
+        """Append a batch with one write and one fsync, then complete its futures."""
+        try:
+            self._file.write(b''.join(record for record, _ in batch))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        except OSError as e:
+            logger.error(f"Group commit of {len(batch)} records to {self.path} failed: {e}")
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        self.commits += 1
+        self.records += sum(1 for record, _ in batch if record)
+        for _, future in batch:
+            future.set_result(self.commits)
@@ -0,0 +1,206 @@
+"""Module for the indexes HistoryManager keeps over its rows and the queries they answer."""
+
+from typing import Dict, Iterator, Tuple
+import numpy as np
+import pandas as pd
+from calculator.history.buffer import empty_history_frame
+from calculator.history.concurrency import synchronized
+from calculator.history.operation_index import OperationIndex
+from calculator.history.result_index import ResultIndex
+from calculator.history.spill_store import SpillingHistoryStore
+from calculator.history.stats import HistoryStatistics
+from calculator.logging_config import get_logger
+
+# Get module logger
+logger = get_logger(__name__)
+
+
+class IndexMixin:
+    """Running statistics, operation index and result index of ``HistoryManager``."""
+    
+    # Running result statistics and per-operation row positions, updated on every
+    # append and rebuilt when the store changes
+    _stats = HistoryStatistics()
+    _operation_index = OperationIndex()
+    _indexes_stale = True  # The initial store may already hold rows (e.g. a reopened mmap store)
+    # Rows ordered by result; appended rows are queried from a small tail and merged in batches
+    _result_index = ResultIndex()
+    
+    @classmethod
+    def _index_appended(cls, start: int) -> None:
+        """Add the rows appended from position ``start`` on to the statistics and operation index."""
+        if not cls._indexes_stale:
+            codes = cls._history.column('operation', start)
+            cls._stats.add_chunk(codes, cls._history.column('result', start), cls._history.operations.names)
+            cls._operation_index.add_codes(codes, start)
+            cls._trim_indexes()
+    
+    @classmethod
+    def _rebuild_indexes(cls) -> None:
+        """Recompute the running statistics and operation index from the history."""
+        cls._stats.rebuild(cls._history.iter_chunks(), cls._history.operations.names)
+        cls._operation_index.rebuild(cls._history.iter_chunks(), cls._spilled_rows())
+        cls._indexes_stale = False
+    
+    @classmethod
+    def _spilled_rows(cls) -> int:
+        """Return how many of the oldest rows a bounded-memory store keeps only on disk."""
+        return cls._history.spilled_rows if isinstance(cls._history, SpillingHistoryStore) else 0
+    
+    @classmethod
+    def _spilled_chunks(cls) -> Iterator[Tuple[int, Dict[str, np.ndarray]]]:
+        """Yield ``(offset, columns)`` chunks of the spilled rows, which the indexes do not hold."""
+        spilled = cls._spilled_rows()
+        if spilled:
+            for offset, columns in cls._history.iter_chunks():
+                if offset >= spilled:
+                    break
+                yield offset, columns
+    
+    @classmethod
+    def _trim_indexes(cls) -> None:
+        """Drop rows just spilled to disk from the indexes, so they stay proportional to the rows in memory."""
+        spilled = cls._spilled_rows()
+        if spilled > cls._operation_index.start:
+            cls._operation_index.discard_before(spilled)
+            cls._result_index.discard_before(spilled)
+    
+    @classmethod
+    def _operations(cls) -> OperationIndex:
+        """Return the operation index, rebuilding it first if the store changed underneath it."""
+        if cls._indexes_stale:
+            cls._rebuild_indexes()
+        return cls._operation_index
+    
+    @classmethod
+    @synchronized
+    def find_by_operation(cls, operation_name: str) -> pd.DataFrame:
+        """Find calculations by operation name.
+        
+        Rows come from the operation index, so this is O(k) in the number of
+        matching calculations.
+        
+        Args:
+            operation_name: Name of the operation to filter by.
+            
+        Returns:
+            DataFrame with filtered calculations.
+        """
+        code = cls._history.operations.get(operation_name)
+        if code is None:
+            result = empty_history_frame()
+        else:
+            # The posting list holds exactly the matching rows, in history order
+            result = cls._history.take(cls._operations().positions(code, cls._spilled_chunks()))
+        logger.debug(f"Found {len(result)} calculations with operation '{operation_name}'")
+        return result
+    
+    @classmethod
+    @synchronized
+    def get_statistics(cls) -> Dict[str, Dict[str, float]]:
+        """Get statistical information about calculations.
+        
+        The statistics are maintained incrementally as calculations are added
+        and rebuilt when the history is loaded or replaced, so this takes
+        constant time regardless of the history size.
+        
+        Returns:
+            Dictionary with statistics for each operation and overall.
+        """
+        if len(cls._history) == 0:
+            logger.debug("Attempted to get statistics but history is empty")
+            return {}
+        
+        # Running aggregates are kept up to date on every append, so no rows are scanned;
+        # counts are row counts, NaN results included, as len(df) reported them
+        counts = cls._operations().counts()
+        names = cls._history.operations.names
+        stats = {'overall': cls._stats.overall.to_dict(len(cls._history))}
+        # Codes follow first appearance, so operations keep their historical order
+        for code, count in enumerate(counts):
+            if count:
+                stats[names[code]] = cls._stats.by_operation[names[code]].to_dict(count)
+        
+        logger.info("Generated calculation statistics")
+        return stats
+    
+    @classmethod
+    @synchronized
+    def filter_by_result_range(cls, min_result: float, max_result: float) -> pd.DataFrame:
+        """Filter calculations by result range.
+        
+        Served from the result index in O(log n + k) once it is up to date.
+        
+        Args:
+            min_result: Minimum result value (inclusive).
+            max_result: Maximum result value (inclusive).
+            
+        Returns:
+            DataFrame with filtered calculations.
+        """
+        if len(cls._history) == 0:
+            logger.debug("Attempted to filter by result range but history is empty")
+            return empty_history_frame()
+        
+        filtered = cls._history.take(cls._results().range(min_result, max_result, cls._spilled_chunks()))
+        
+        logger.debug(f"Filtered {len(filtered)} calculations with result between {min_result} and {max_result}")
+        return filtered
+    
+    @classmethod
+    def _results(cls) -> ResultIndex:
+        """Return the result index after merging in any rows appended since the last query."""
+        cls._result_index.refresh(len(cls._history), lambda start: cls._history.column('result', start),
+                                  cls._spilled_rows())
+        return cls._result_index
+    
+    @classmethod
+    @synchronized
+    def top_k(cls, n: int) -> pd.DataFrame:
+        """Get the calculations with the largest results.
+        
+        Args:
+            n: Number of calculations to return.
+            
+        Returns:
+            DataFrame with up to ``n`` calculations, largest result first,
+            indexed by their history position.
+        """
+        result = cls._history.take(cls._results().largest(n, cls._spilled_chunks()))
+        logger.debug(f"Retrieved top {len(result)} calculations by result")
+        return result
+    
+    @classmethod
+    @synchronized
+    def bottom_k(cls, n: int) -> pd.DataFrame:
+        """Get the calculations with the smallest results.
+        
+        Args:
+            n: Number of calculations to return.
+            
+        Returns:
+            DataFrame with up to ``n`` calculations, smallest result first,
+            indexed by their history position.
+        """
+        result = cls._history.take(cls._results().smallest(n, cls._spilled_chunks()))
+        logger.debug(f"Retrieved bottom {len(result)} calculations by result")
+        return result
+    
+    @classmethod
+    @synchronized
+    def get_operation_frequency(cls) -> pd.Series:
+        """Get frequency of each operation.
+        
+        Returns:
+            Series with operation counts.
+        """
+        if len(cls._history) == 0:
+            logger.debug("Attempted to get operation frequency but history is empty")
+            return pd.Series(dtype=int)
+        
+        counts = cls._operations().counts()
+        names = cls._history.operations.names[:len(counts)]
+        freq = pd.Series(counts, index=pd.Index(names, name='operation'), name='count')
+        freq = freq[freq > 0].sort_values(ascending=False, kind='stable')
+        logger.debug(f"Retrieved operation frequency: {freq.to_dict()}")
+        return freq
@@ -1,13 +1,22 @@
 """Module for managing calculation history using pandas."""
 
+import atexit
 import os
 import pandas as pd
 import numpy as np
 import pathlib
+from concurrent.futures import Future
 from datetime import datetime
 from decimal import Decimal
-from typing import List, Optional, Dict, Any, Callable, Union, Tuple
+from typing import Iterator, List, Optional, Dict, Any, Callable, Sequence, Union, Tuple
 from calculator.calculation import Calculation
+from calculator.history.buffer import HistoryBuffer, apply_history_schema, empty_history_frame
+from calculator.history.concurrency import ConcurrencyMixin, synchronized
+from calculator.history.indexes import IndexMixin
+from calculator.history.mmap_store import MemmapHistoryStore
+from calculator.history.persistence import PersistenceMixin
+from calculator.history.spill_store import SpillingHistoryStore
+from calculator.history.storage import FORMAT_EXTENSIONS, normalize_format
 from calculator.operations import add, subtract, multiply, divide
 from calculator.logging_config import get_logger
 from dotenv import load_dotenv
@@ -18,19 +27,91 @@ load_dotenv()
 # Get module logger
 logger = get_logger(__name__)
 
-class HistoryManager:
-    """Manages calculation history using pandas DataFrame."""
+
+def _float_to_decimal(value: float) -> Decimal:
+    """Rebuild the Decimal an operand column value was most likely converted from (2.0 -> Decimal('2'))."""
+    text = repr(float(value))
+    return Decimal(text[:-2] if text.endswith('.0') else text)
+
+
+def _rebuilds_exactly(value: Any) -> bool:
+    """Whether a Decimal operand comes back unchanged from its float column value."""
+    return isinstance(value, Decimal) and repr(_float_to_decimal(float(value))) == repr(value)
+
+
+def _create_store(mode: str, data_dir: pathlib.Path,
+                  max_rows: int = 0) -> Union[HistoryBuffer, MemmapHistoryStore, SpillingHistoryStore]:
+    """Create the history store for a storage mode ('memory' or 'mmap').
+    
+    With ``max_rows`` set, the 'memory' store keeps that many recent rows in
+    memory and spills older ones to a ``history_spill-*`` directory of this
+    process in the data directory, removed at exit.
+    """
+    if mode == 'memory':
+        if max_rows > 0:
+            return SpillingHistoryStore.temporary(data_dir, max_rows)
+        return HistoryBuffer()
+    if mode == 'mmap':
+        return MemmapHistoryStore(data_dir.joinpath('history_store'))
+    raise ValueError(f"Unsupported history storage mode: {mode}")
+
+
+class _DefaultStore:
+    """Class attribute creating the configured history store on first access.
+    
+    Importing the module must not open or empty files in the data directory,
+    so the store is built when the history is first used, and it then
+    replaces this descriptor as a plain class attribute.
+    """
+    
+    def __get__(self, instance, owner):
+        """Create the store from ``CALCULATOR_HISTORY_STORAGE`` and install it on the class."""
+        with HistoryManager._lock:
+            store = HistoryManager.__dict__['_history']
+            if store is self:
+                store = _create_store(os.environ.get('CALCULATOR_HISTORY_STORAGE', 'memory').lower(),
+                                      HistoryManager._data_dir, HistoryManager._max_rows)
+                HistoryManager._history = store
+            return store
+
+
+class HistoryManager(PersistenceMixin, IndexMixin, ConcurrencyMixin):
+    """Manages calculation history using pandas DataFrame.
+    
+    The rows live in one history store; saving and loading files, the
+    indexes and the thread-safe mode are added by the mixins in
+    ``persistence``, ``indexes`` and ``concurrency``.
+    """
     
-    _history_df = pd.DataFrame(columns=['timestamp', 'a', 'b', 'operation', 'result'])
     # Set default file path to data directory from environment variable
     _data_dir = pathlib.Path(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))).joinpath(
         os.environ.get('CALCULATOR_DATA_DIR', 'data')
     )
+    # Most history rows kept in memory before older ones spill to disk (0 for no limit)
+    _max_rows = int(os.environ.get('CALCULATOR_HISTORY_MAX_ROWS', 0))
+    # In-memory buffer by default, or memory-mapped column files in the data directory;
+    # built on first use
+    _history = _DefaultStore()
     _default_file_path = str(_data_dir.joinpath(
-        os.environ.get('CALCULATOR_HISTORY_FILE', 'calculation_history.csv')
+        os.environ.get(
+            'CALCULATOR_HISTORY_FILE',
+            'calculation_history' + FORMAT_EXTENSIONS[normalize_format(os.environ.get('CALCULATOR_HISTORY_FORMAT', 'csv'))]
+        )
     ))
     _instance = None  # For singleton pattern
     
+    # Rows are the only record of a calculation; Calculations rebuilds objects from them.
+    # Position -> (a, b, operation) for rows that the float columns cannot rebuild exactly
+    # (e.g. Decimal('1.50') or int operands). Entries for rows spilled to disk by a
+    # bounded-memory store are dropped, so those rows come back from their float columns.
+    _exact_operands: Dict[int, Tuple[Any, Any, Callable]] = {}
+    # First position _exact_operands may hold
+    _exact_start = 0
+    # Name -> function of the operations outside _operation_map seen so far, so their rows can be rebuilt
+    _custom_operations: Dict[str, Callable] = {}
+    # Row and object of the last add_calculation, so the latest calculation keeps its identity
+    _latest_calculation: Optional[Tuple[int, Calculation]] = None
+    
     # Operation name to function mapping
     _operation_map = {
         'add': add,
@@ -49,146 +130,350 @@ class HistoryManager:
         return cls._instance
     
     @classmethod
-    def add_calculation(cls, calculation: Calculation) -> None:
-        """Add a calculation to the history DataFrame."""
-        try:
-            result = calculation.perform()
-            new_row = {
-                'timestamp': datetime.now(),
-                'a': float(calculation.a),  # Convert Decimal to float for pandas
-                'b': float(calculation.b),
-                'operation': calculation.operation.__name__,
-                'result': float(result)
-            }
-            
-            # Create a new DataFrame with the new row
-            new_df = pd.DataFrame([new_row])
+    def add_calculation(cls, calculation: Calculation, timestamp: Optional[datetime] = None,
+                        result: Optional[Decimal] = None) -> Optional[Future]:
+        """Add a calculation to the history buffer.
+        
+        Args:
+            calculation: The calculation to record.
+            timestamp: When the calculation happened. If None, uses the current time.
+            result: The result of the calculation if the caller already has it.
+                If None, the calculation is performed.
             
-            # If the history DataFrame is empty, just use the new DataFrame
-            if cls._history_df.empty:
-                cls._history_df = new_df
-            else:
-                # Otherwise concatenate, ensuring dtypes are preserved
-                cls._history_df = pd.concat([cls._history_df, new_df], ignore_index=True)
+        Returns:
+            With a commit log configured, a future that completes once the
+            calculation is durable in the log; otherwise None.
+        """
+        try:
+            if result is None:
+                result = calculation.perform()
+            timestamp = timestamp or datetime.now()
+            durable = cls._commit(timestamp, calculation, result) if cls._commit_log is not None else None
+            if cls._autosave is not None:
+                cls._autosave.notify()
+            if cls._thread_safe:
+                cls._buffer_calculation(calculation, timestamp, result)
+                return durable
+            # Amortized O(1) append into the columnar history buffer
+            cls._history.append(
+                timestamp,
+                float(calculation.a),  # Convert Decimal to float for pandas
+                float(calculation.b),
+                calculation.operation.__name__,
+                float(result)
+            )
+            position = len(cls._history) - 1
+            operation_name = calculation.operation.__name__
+            if not cls._indexes_stale:
+                cls._stats.add(operation_name, float(result))
+                cls._operation_index.add(cls._history.operations.get(operation_name), position)
+                cls._trim_indexes()
+            cls._remember_calculation(position, calculation)
             
             logger.info(f"Added calculation to history: {calculation.a} {calculation.operation.__name__} {calculation.b} = {result}")
+            return durable
         except Exception as e:
             logger.error(f"Error adding calculation to history: {e}")
             raise
     
     @classmethod
-    def get_history(cls) -> pd.DataFrame:
-        """Get the entire history as a pandas DataFrame."""
-        logger.debug("Retrieved calculation history")
-        return cls._history_df
+    def _remember_calculation(cls, position: int, calculation: Calculation) -> None:
+        """Keep what the row at ``position`` needs to be read back as ``calculation``."""
+        operation_name = calculation.operation.__name__
+        if operation_name not in cls._operation_map:
+            cls._custom_operations.setdefault(operation_name, calculation.operation)
+        if (cls._operation_function(operation_name) is not calculation.operation
+                or not _rebuilds_exactly(calculation.a) or not _rebuilds_exactly(calculation.b)):
+            cls._exact_operands[position] = (calculation.a, calculation.b, calculation.operation)
+        cls._latest_calculation = (position, calculation)
+        cls._evict_spilled_operands()
     
     @classmethod
-    def clear_history(cls) -> None:
-        """Clear the history DataFrame."""
-        cls._history_df = pd.DataFrame(columns=['timestamp', 'a', 'b', 'operation', 'result'])
-        logger.info("Calculation history cleared")
+    def _operation_function(cls, operation_name: str) -> Optional[Callable]:
+        """Return the function rows with ``operation_name`` are rebuilt with, or None if unknown."""
+        return cls._operation_map.get(operation_name) or cls._custom_operations.get(operation_name)
     
     @classmethod
-    def save_history(cls, file_path: Optional[str] = None) -> str:
-        """Save the history to a CSV file.
+    def _evict_spilled_operands(cls) -> None:
+        """Drop the exact operands of rows spilled to disk, keeping the side table O(max_rows)."""
+        spilled = cls._spilled_rows()
+        if spilled > cls._exact_start:
+            cls._exact_operands = {position: exact for position, exact in cls._exact_operands.items()
+                                   if position >= spilled}
+            cls._exact_start = spilled
+    
+    @classmethod
+    @synchronized
+    def add_batch(cls, a: np.ndarray, b: np.ndarray, operation: pd.Categorical, result: np.ndarray,
+                  timestamp: Optional[datetime] = None) -> Optional[Future]:
+        """Add many evaluated calculations to the history with one bulk append.
         
         Args:
-            file_path: Path to save the file. If None, uses default path.
+            a: First operands.
+            b: Second operands.
+            operation: Operation name of every calculation.
+            result: Result of every calculation.
+            timestamp: When the calculations happened. If None, uses the current time.
             
         Returns:
-            The path where the file was saved.
+            With a commit log configured, a future that completes once the
+            whole batch is durable in the log; otherwise None.
         """
-        path = file_path or cls._default_file_path
         try:
-            # Ensure parent directory exists
-            os.makedirs(os.path.dirname(path), exist_ok=True)
-            cls._history_df.to_csv(path, index=False)
-            logger.info(f"Calculation history saved to {path}")
-            return path
+            start = len(cls._history)
+            rows = pd.DataFrame({
+                'timestamp': np.full(len(a), np.datetime64(timestamp or datetime.now(), 'ns')),
+                'a': a,
+                'b': b,
+                'operation': operation,
+                'result': result
+            })
+            cls._history.extend(rows)
+            cls._index_appended(start)
+            if cls._autosave is not None:
+                cls._autosave.notify(len(a))
+            durable = None
+            if cls._commit_log is not None and len(rows):
+                durable = cls._commit_log.submit(rows.to_csv(
+                    header=False, index=False, date_format='%Y-%m-%d %H:%M:%S.%f'
+                ).encode())
+            logger.info(f"Added batch of {len(a)} calculations to history")
+            return durable
         except Exception as e:
-            logger.error(f"Error saving history to {path}: {e}")
+            logger.error(f"Error adding calculation batch to history: {e}")
             raise
     
     @classmethod
-    def load_history(cls, file_path: Optional[str] = None) -> bool:
-        """Load history from a CSV file.
+    @synchronized
+    def configure_storage(cls, mode: str, directory: Optional[str] = None, max_rows: Optional[int] = None) -> None:
+        """Switch the history to a different storage mode.
         
         Args:
-            file_path: Path to load the file from. If None, uses default path.
-            
-        Returns:
-            True if successful, False otherwise.
+            mode: 'memory' for the in-process buffer or 'mmap' for memory-mapped
+                column files.
+            directory: Directory for the 'mmap' column files or the 'memory'
+                spill segment. If None, uses ``history_store`` in the data
+                directory, or spills into a new directory of this process.
+            max_rows: Most rows the 'memory' store keeps in memory before
+                spilling older rows to disk; 0 for no limit. If None, uses
+                ``CALCULATOR_HISTORY_MAX_ROWS``.
         """
-        path = file_path or cls._default_file_path
-        
-        if not os.path.exists(path):
-            logger.warning(f"History file not found: {path}")
-            return False
-            
-        try:
-            cls._history_df = pd.read_csv(path)
-            # Convert timestamp strings back to datetime objects
-            cls._history_df['timestamp'] = pd.to_datetime(cls._history_df['timestamp'])
-            logger.info(f"Calculation history loaded from {path}")
-            return True
-        except Exception as e:
-            logger.error(f"Error loading history from {path}: {e}")
-            return False
+        if max_rows is None:
+            max_rows = cls._max_rows
+        if directory is None:
+            cls._history = _create_store(mode, cls._data_dir, max_rows)
+        elif mode == 'mmap':
+            cls._history = MemmapHistoryStore(directory)
+        elif mode == 'memory' and max_rows > 0:
+            cls._history = SpillingHistoryStore(directory, max_rows)
+        else:
+            cls._history = _create_store(mode, cls._data_dir, max_rows)
+        cls._generation += 1
+        cls._forget_calculations()
+        cls._rebuild_indexes()
+        cls._result_index.reset()
+        logger.info(f"History storage set to {mode}")
     
     @classmethod
-    def delete_history_file(cls, file_path: Optional[str] = None) -> bool:
-        """Delete the history file.
+    @synchronized
+    def get_history(cls) -> pd.DataFrame:
+        """Get the entire history as a pandas DataFrame.
         
-        Args:
-            file_path: Path to the file to delete. If None, uses default path.
-            
-        Returns:
-            True if successful, False otherwise.
+        The DataFrame is built from the history buffer on demand and cached
+        until the next write, so it should be treated as read-only.
         """
-        path = file_path or cls._default_file_path
-        
-        if not os.path.exists(path):
-            logger.warning(f"History file not found for deletion: {path}")
-            return False
-            
-        try:
-            os.remove(path)
-            logger.info(f"History file deleted: {path}")
-            return True
-        except Exception as e:
-            logger.error(f"Error deleting history file {path}: {e}")
-            return False
+        logger.debug("Retrieved calculation history")
+        return cls._history.to_dataframe()
     
     @classmethod
+    @synchronized
+    def clear_history(cls) -> None:
+        """Clear the history buffer."""
+        cls._history.clear()
+        cls._generation += 1
+        cls._forget_calculations()
+        cls._stats.clear()
+        cls._operation_index.reset()
+        cls._indexes_stale = False
+        cls._result_index.reset()
+        logger.info("Calculation history cleared")
+    
+    @classmethod
+    def _forget_calculations(cls) -> None:
+        """Drop the exact operands and latest object kept for rows that were just replaced."""
+        cls._exact_operands = {}
+        cls._exact_start = 0
+        cls._latest_calculation = None
+    
+    @classmethod
+    @synchronized
     def get_latest(cls) -> Optional[Dict[str, Any]]:
         """Get the latest calculation.
         
         Returns:
             Dictionary with calculation details or None if history is empty.
         """
-        if cls._history_df.empty:
+        latest = cls._history.latest()
+        if latest is None:
             logger.debug("Attempted to get latest calculation but history is empty")
             return None
         
-        latest = cls._history_df.iloc[-1].to_dict()
         logger.debug(f"Retrieved latest calculation: {latest}")
         return latest
     
     @classmethod
-    def find_by_operation(cls, operation_name: str) -> pd.DataFrame:
-        """Find calculations by operation name.
+    @synchronized
+    def get_recent(cls, n: int) -> pd.DataFrame:
+        """Get the ``n`` most recent calculations without materializing the whole history.
         
         Args:
-            operation_name: Name of the operation to filter by.
+            n: Number of calculations to return.
             
         Returns:
-            DataFrame with filtered calculations.
+            DataFrame with up to ``n`` rows, oldest first, indexed by position.
+        """
+        if n <= 0:
+            return empty_history_frame()
+        return cls._history.slice(max(len(cls._history) - n, 0))
+    
+    @classmethod
+    def _calculation(cls, position: int, a: float, b: float, operation_name: str) -> Calculation:
+        """Build the Calculation recorded in one row from its column values."""
+        latest_position, latest = cls._latest_calculation or (None, None)
+        if latest_position == position:
+            return latest
+        exact = cls._exact_operands.get(position)
+        if exact is not None:
+            return Calculation(*exact)
+        operation = cls._operation_function(operation_name)
+        if operation is None:
+            raise ValueError(f"Unknown operation in history row {position}: {operation_name}")
+        return Calculation(_float_to_decimal(a), _float_to_decimal(b), operation)
+    
+    @classmethod
+    @synchronized
+    def calculations_at(cls, positions: Sequence[int]) -> List[Calculation]:
+        """Rebuild the calculations recorded at the given row positions.
+        
+        Operands come back as the Decimals that were added; rows added with
+        ``add_batch`` or loaded from a file come back with Decimal operands
+        rebuilt from their float values.
+        
+        Args:
+            positions: Row positions in history order.
+            
+        Returns:
+            List of Calculation objects, one per position.
+        """
+        positions = np.asarray(positions, dtype=np.int64)
+        if len(positions) == 0:
+            return []
+        rows = cls._history.take(positions)
+        return [
+            cls._calculation(position, a, b, name)
+            for position, a, b, name in zip(positions.tolist(), rows['a'].tolist(), rows['b'].tolist(),
+                                            rows['operation'].astype(object).tolist())
+        ]
+    
+    @classmethod
+    @synchronized
+    def calculation_count(cls) -> int:
+        """Return the number of calculations in the history."""
+        return len(cls._history)
+
+    @classmethod
+    @synchronized
+    def splice_calculations(cls, start: int, stop: int, calculations: Sequence[Calculation],
+                            results: Optional[Sequence[Any]] = None) -> None:
+        """Replace the calculations at positions ``start:stop`` with ``calculations``.
+
+        This backs the list edits of ``Calculations.history`` other than
+        appending (deleting, inserting and assigning). The store is
+        append-only, so the rows are rewritten, which is O(n). Rows outside
+        ``start:stop`` keep their timestamps and results.
+
+        Args:
+            start: First position to replace.
+            stop: Position after the last one to replace.
+            calculations: Calculations to put in their place.
+            results: Result of each calculation. If None, they are performed.
+        """
+        size = len(cls._history)
+        stop = min(max(stop, 0), size)
+        start = min(max(start, 0), stop)
+        if results is None:
+            results = [calculation.perform() for calculation in calculations]
+        now = datetime.now()
+        rows = pd.DataFrame({
+            'timestamp': [now] * len(calculations),
+            'a': [float(calculation.a) for calculation in calculations],
+            'b': [float(calculation.b) for calculation in calculations],
+            'operation': [calculation.operation.__name__ for calculation in calculations],
+            'result': [float(result) for result in results]
+        })
+        frames = [frame.assign(operation=frame['operation'].astype(object))
+                  for frame in (cls._history.slice(0, start), rows, cls._history.slice(stop)) if len(frame)]
+        spliced = apply_history_schema(pd.concat(frames, ignore_index=True)) if frames else empty_history_frame()
+
+        shift = len(calculations) - (stop - start)
+        exact = {position if position < start else position + shift: operands
+                 for position, operands in cls._exact_operands.items() if position < start or position >= stop}
+        latest_position, latest = cls._latest_calculation or (None, None)
+        cls._history.clear()
+        cls._history.extend(spliced)
+        cls._generation += 1
+        cls._forget_calculations()
+        cls._exact_operands = exact
+        for offset, calculation in enumerate(calculations):
+            cls._remember_calculation(start + offset, calculation)
+        if stop < size:
+            cls._latest_calculation = (size - 1 + shift, latest) if latest_position == size - 1 else None
+        elif not calculations:
+            cls._latest_calculation = None
+        cls._evict_spilled_operands()
+        cls._rebuild_indexes()
+        cls._result_index.reset()
+        logger.info(f"Replaced {stop - start} calculations at position {start} with {len(calculations)}")
+
+    @classmethod
+    def iter_calculations(cls) -> Iterator[Calculation]:
+        """Yield the calculation recorded in every row, oldest first, reading the store chunk by chunk.
+        
+        In thread-safe mode pending buffers are merged first, but rows merged
+        while the iteration runs may or may not be included.
         """
-        result = cls._history_df[cls._history_df['operation'] == operation_name]
-        logger.debug(f"Found {len(result)} calculations with operation '{operation_name}'")
-        return result
+        if cls._thread_safe:
+            with cls._lock:
+                cls._merge_thread_buffers()
+        for offset, columns in cls._history.iter_chunks():
+            names = cls._history.operations.names
+            rows = zip(columns['a'].tolist(), columns['b'].tolist(), columns['operation'].tolist())
+            for i, (a, b, code) in enumerate(rows):
+                yield cls._calculation(offset + i, a, b, names[code])
+    
+    @classmethod
+    @synchronized
+    def latest_calculation(cls) -> Optional[Calculation]:
+        """Return the most recent calculation as an object, or None if the history is empty."""
+        size = len(cls._history)
+        if size == 0:
+            return None
+        latest_position, latest = cls._latest_calculation or (None, None)
+        if latest_position == size - 1:
+            return latest
+        return cls.calculations_at([size - 1])[0]
+    
+    @classmethod
+    @synchronized
+    def calculations_by_operation(cls, operation_name: str) -> List[Calculation]:
+        """Return the calculations with an operation, as objects, from the operation index."""
+        code = cls._history.operations.get(operation_name)
+        if code is None:
+            return []
+        return cls.calculations_at(cls._operations().positions(code, cls._spilled_chunks()))
     
     @classmethod
+    @synchronized
     def to_calculations(cls) -> List[Calculation]:
         """Convert the history DataFrame to a list of Calculation objects.
         
@@ -197,7 +482,7 @@ class HistoryManager:
         """
         calculations = []
         
-        for _, row in cls._history_df.iterrows():
+        for _, row in cls._history.to_dataframe().iterrows():
             operation_func = cls._operation_map.get(row['operation'])
             if operation_func:
                 calc = Calculation(
@@ -210,48 +495,33 @@ class HistoryManager:
         logger.debug(f"Converted {len(calculations)} history records to Calculation objects")
         return calculations
     
-    # Advanced Pandas data handling methods
-    
     @classmethod
-    def get_statistics(cls) -> Dict[str, Dict[str, float]]:
-        """Get statistical information about calculations.
+    def _select(cls, predicate: Callable[[Dict[str, np.ndarray]], np.ndarray]) -> pd.DataFrame:
+        """Return the rows matching ``predicate``, scanning the history chunk by chunk.
         
+        Args:
+            predicate: Function mapping a chunk of column arrays to a boolean mask.
+            
         Returns:
-            Dictionary with statistics for each operation and overall.
+            DataFrame with the matching rows, indexed by their history position.
         """
-        if cls._history_df.empty:
-            logger.debug("Attempted to get statistics but history is empty")
-            return {}
-        
-        stats = {}
-        
-        # Overall statistics
-        stats['overall'] = {
-            'count': len(cls._history_df),
-            'mean_result': cls._history_df['result'].mean(),
-            'min_result': cls._history_df['result'].min(),
-            'max_result': cls._history_df['result'].max(),
-            'std_result': cls._history_df['result'].std()
-        }
-        
-        # Statistics by operation
-        for operation in cls._history_df['operation'].unique():
-            op_df = cls._history_df[cls._history_df['operation'] == operation]
-            stats[operation] = {
-                'count': len(op_df),
-                'mean_result': op_df['result'].mean(),
-                'min_result': op_df['result'].min(),
-                'max_result': op_df['result'].max(),
-                'std_result': op_df['result'].std()
-            }
-        
-        logger.info("Generated calculation statistics")
-        return stats
+        positions = [
+            np.flatnonzero(predicate(columns)) + offset
+            for offset, columns in cls._history.iter_chunks()
+        ]
+        return cls._history.take(np.concatenate(positions) if positions else np.array([], dtype=np.int64))
+    
+    # Advanced Pandas data handling methods
     
     @classmethod
+    @synchronized
     def filter_by_date_range(cls, start_date: Union[str, datetime], end_date: Union[str, datetime]) -> pd.DataFrame:
         """Filter calculations by date range.
         
+        While the history is in time order (the usual case, since calculations
+        are appended as they happen) this runs in O(log n + k) and returns a
+        contiguous run of rows. Out-of-order histories fall back to a scan.
+        
         Args:
             start_date: Start date (inclusive) as string or datetime.
             end_date: End date (inclusive) as string or datetime.
@@ -259,9 +529,9 @@ class HistoryManager:
         Returns:
             DataFrame with filtered calculations.
         """
-        if cls._history_df.empty:
+        if len(cls._history) == 0:
             logger.debug("Attempted to filter by date range but history is empty")
-            return pd.DataFrame(columns=cls._history_df.columns)
+            return empty_history_frame()
         
         # Convert string dates to datetime if needed
         if isinstance(start_date, str):
@@ -269,96 +539,72 @@ class HistoryManager:
         if isinstance(end_date, str):
             end_date = pd.to_datetime(end_date)
         
-        # Filter by date range
-        filtered = cls._history_df[
-            (cls._history_df['timestamp'] >= start_date) & 
-            (cls._history_df['timestamp'] <= end_date)
-        ]
+        start, end = pd.Timestamp(start_date).to_datetime64(), pd.Timestamp(end_date).to_datetime64()
+        if cls._history.time_sorted:
+            # History appended in time order: binary search the bounds chunk by chunk and
+            # slice the rows between them (rows before a bound add up across sorted chunks)
+            first = last = 0
+            for _, columns in cls._history.iter_chunks():
+                first += int(np.searchsorted(columns['timestamp'], start, side='left'))
+                last += int(np.searchsorted(columns['timestamp'], end, side='right'))
+            filtered = cls._history.slice(first, last)
+        else:
+            filtered = cls._select(lambda columns: (columns['timestamp'] >= start) & (columns['timestamp'] <= end))
         
         logger.debug(f"Filtered {len(filtered)} calculations between {start_date} and {end_date}")
         return filtered
     
     @classmethod
-    def filter_by_result_range(cls, min_result: float, max_result: float) -> pd.DataFrame:
-        """Filter calculations by result range.
+    @synchronized
+    def is_time_sorted(cls) -> bool:
+        """Return whether the history rows are in timestamp order.
         
-        Args:
-            min_result: Minimum result value (inclusive).
-            max_result: Maximum result value (inclusive).
-            
-        Returns:
-            DataFrame with filtered calculations.
+        The store tracks this as rows are appended, so no rows are scanned.
         """
-        if cls._history_df.empty:
-            logger.debug("Attempted to filter by result range but history is empty")
-            return pd.DataFrame(columns=cls._history_df.columns)
-        
-        filtered = cls._history_df[
-            (cls._history_df['result'] >= min_result) & 
-            (cls._history_df['result'] <= max_result)
-        ]
-        
-        logger.debug(f"Filtered {len(filtered)} calculations with result between {min_result} and {max_result}")
-        return filtered
+        return cls._history.time_sorted
     
     @classmethod
-    def export_to_excel(cls, file_path: str) -> str:
-        """Export history to Excel file.
+    @synchronized
+    def get_time_range(cls) -> Optional[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """Get the earliest and latest calculation times.
         
-        Args:
-            file_path: Path to save the Excel file.
-            
         Returns:
-            The path where the file was saved.
+            Tuple of (earliest, latest) timestamps, or None if history is empty.
         """
-        try:
-            # Create a writer object
-            with pd.ExcelWriter(file_path, engine='openpyxl') as writer:
-                # Write the main history sheet
-                cls._history_df.to_excel(writer, sheet_name='History', index=False)
-                
-                # Write statistics sheet if history is not empty
-                if not cls._history_df.empty:
-                    stats = cls.get_statistics()
-                    stats_df = pd.DataFrame()
-                    
-                    for op_name, op_stats in stats.items():
-                        op_df = pd.DataFrame([op_stats], index=[op_name])
-                        stats_df = pd.concat([stats_df, op_df])
-                    
-                    stats_df.to_excel(writer, sheet_name='Statistics')
-                    
-                    # Create a pivot table sheet
-                    pivot = pd.pivot_table(
-                        cls._history_df,
-                        values='result',
-                        index='operation',
-                        aggfunc=['count', 'mean', 'min', 'max', 'std']
-                    )
-                    pivot.to_excel(writer, sheet_name='Pivot')
-            
-            logger.info(f"Calculation history exported to Excel: {file_path}")
-            return file_path
-        except Exception as e:
-            logger.error(f"Error exporting history to Excel {file_path}: {e}")
-            raise
+        if len(cls._history) == 0:
+            return None
+        if cls._history.time_sorted:
+            _, columns = next(cls._history.iter_chunks())
+            return pd.Timestamp(columns['timestamp'][0]), cls._history.latest()['timestamp']
+        chunks = [columns['timestamp'] for _, columns in cls._history.iter_chunks()]
+        return pd.Timestamp(min(chunk.min() for chunk in chunks)), pd.Timestamp(max(chunk.max() for chunk in chunks))
     
     @classmethod
-    def get_operation_frequency(cls) -> pd.Series:
-        """Get frequency of each operation.
+    @synchronized
+    def get_memory_footprint(cls) -> Dict[str, int]:
+        """Report the memory taken by the history with its compact dtypes.
         
         Returns:
-            Series with operation counts.
+            Dictionary with the row count, the bytes reserved by the history
+            store, the deep size of the history DataFrame, the deep size the
+            same DataFrame would have with an object-dtype operation column,
+            and the bytes saved by the categorical column.
         """
-        if cls._history_df.empty:
-            logger.debug("Attempted to get operation frequency but history is empty")
-            return pd.Series(dtype=int)
-        
-        freq = cls._history_df['operation'].value_counts()
-        logger.debug(f"Retrieved operation frequency: {freq.to_dict()}")
-        return freq
+        history_df = cls._history.to_dataframe()
+        compact_bytes = int(history_df.memory_usage(deep=True, index=False).sum())
+        object_bytes = int(history_df.astype({'operation': object}).memory_usage(deep=True, index=False).sum())
+        footprint = {
+            'rows': len(history_df),
+            'store_bytes': int(cls._history.nbytes),
+            'dataframe_bytes': compact_bytes,
+            'object_dataframe_bytes': object_bytes,
+            'saved_bytes': object_bytes - compact_bytes
+        }
+        logger.info(f"History memory footprint: {footprint}")
+        return footprint
     
     @classmethod
+    @synchronized
     def get_result_distribution(cls, bins: int = 10) -> Tuple[np.ndarray, np.ndarray]:
         """Get distribution of calculation results.
         
@@ -368,10 +614,24 @@ class HistoryManager:
         Returns:
             Tuple of (bin_edges, histogram_values).
         """
-        if cls._history_df.empty:
+        if len(cls._history) == 0:
             logger.debug("Attempted to get result distribution but history is empty")
             return np.array([]), np.array([])
         
-        hist, bin_edges = np.histogram(cls._history_df['result'], bins=bins)
+        # Find the overall range first so every chunk shares the same bin edges
+        chunks = list(cls._history.iter_chunks())
+        value_range = (
+            min(columns['result'].min() for _, columns in chunks),
+            max(columns['result'].max() for _, columns in chunks)
+        )
+        hist = 0
+        for _, columns in chunks:
+            chunk_hist, bin_edges = np.histogram(columns['result'], bins=bins, range=value_range)
+            hist = hist + chunk_hist
         logger.debug(f"Generated result distribution with {bins} bins")
         return bin_edges, hist
+
+
+# Save rows the autosave worker has not written yet, and commit queued log rows, before the interpreter exits
+atexit.register(HistoryManager.stop_autosave)
+atexit.register(HistoryManager.close_commit_log)
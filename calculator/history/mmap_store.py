@@ -0,0 +1,262 @@
+"""Module providing a memory-mapped on-disk store for calculation history."""
+
+import os
+import json
+import pathlib
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+import numpy as np
+import pandas as pd
+from calculator.history.buffer import HISTORY_COLUMNS, OperationCodes, is_ascending
+
+
+class MemmapHistoryStore:
+    """Calculation history kept in memory-mapped column files.
+
+    Every column is a flat binary file in ``directory``: ``timestamp`` holds
+    int64 nanoseconds, ``a``, ``b`` and ``result`` hold float64 and
+    ``operation`` holds uint8 codes into ``operations.json``. The row count is
+    kept in a one-element mapped ``rows`` file, so appending a row is a handful
+    of memory writes. Files grow by doubling, like ``HistoryBuffer``.
+
+    Scans go through ``iter_chunks``, which hands out mapped slices, so the
+    operating system pages the history in and out instead of the process
+    holding all of it in memory. A store directory must only be used by one
+    process at a time.
+    """
+
+    _COLUMN_DTYPES = {
+        'timestamp': np.dtype(np.int64),
+        'a': np.dtype(np.float64),
+        'b': np.dtype(np.float64),
+        'operation': np.dtype(np.uint8),
+        'result': np.dtype(np.float64)
+    }
+    _MAX_OPERATIONS = 256
+
+    def __init__(self, directory: Union[str, pathlib.Path], capacity: int = 1024):
+        """Open the store in ``directory``, creating its files if needed."""
+        self._directory = pathlib.Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._initial_capacity = max(int(capacity), 1)
+        self._operations = OperationCodes(self._load_categories(), limit=self._MAX_OPERATIONS,
+                                          on_change=self._save_categories)
+        self._rows = self._open_row_counter()
+        self._columns: Dict[str, np.memmap] = {}
+        self._map_columns(max(self._initial_capacity, len(self)))
+        self._frame: Optional[pd.DataFrame] = None
+        # Whether the timestamps are ascending is not persisted, so check rows left by an earlier run
+        self._time_sorted = True
+        previous = None
+        for _, columns in self.iter_chunks():
+            if not is_ascending(columns['timestamp'], previous):
+                self._time_sorted = False
+                break
+            previous = columns['timestamp'][-1]
+
+    @property
+    def directory(self) -> pathlib.Path:
+        """Directory holding the column files."""
+        return self._directory
+
+    def _column_path(self, name: str) -> pathlib.Path:
+        """Return the path of a column file."""
+        return self._directory.joinpath(f'{name}.bin')
+
+    def _load_categories(self) -> List[str]:
+        """Read the operation names for the stored codes."""
+        path = self._directory.joinpath('operations.json')
+        if not path.exists():
+            return []
+        with open(path) as f:
+            return json.load(f)
+
+    def _save_categories(self, names: List[str]) -> None:
+        """Persist the operation names for the stored codes."""
+        with open(self._directory.joinpath('operations.json'), 'w') as f:
+            json.dump(names, f)
+
+    def _open_row_counter(self) -> np.memmap:
+        """Map the file holding the number of stored rows."""
+        path = self._directory.joinpath('rows.bin')
+        if not path.exists():
+            with open(path, 'wb') as f:
+                f.write(np.zeros(1, dtype=np.int64).tobytes())
+        return np.memmap(path, dtype=np.int64, mode='r+', shape=(1,))
+
+    def _map_columns(self, capacity: int) -> None:
+        """Make every column file hold at least ``capacity`` rows and map it."""
+        for mapped in self._columns.values():
+            mapped.flush()
+        self._columns = {}
+        for name, dtype in self._COLUMN_DTYPES.items():
+            path = self._column_path(name)
+            size = capacity * dtype.itemsize
+            with open(path, 'ab') as f:
+                if f.tell() < size:
+                    f.truncate(size)
+        # Every file may have been grown past ``capacity`` by an earlier run
+        rows = min(os.path.getsize(self._column_path(name)) // dtype.itemsize
+                   for name, dtype in self._COLUMN_DTYPES.items())
+        for name, dtype in self._COLUMN_DTYPES.items():
+            self._columns[name] = np.memmap(self._column_path(name), dtype=dtype, mode='r+', shape=(rows,))
+
+    def _reserve(self, required: int) -> None:
+        """Grow the column files so they can hold at least ``required`` rows."""
+        capacity = self.capacity
+        if required <= capacity:
+            return
+        while capacity < required:
+            capacity *= 2
+        self._map_columns(capacity)
+
+    def __len__(self) -> int:
+        """Return the number of rows stored."""
+        return int(self._rows[0])
+
+    @property
+    def capacity(self) -> int:
+        """Number of rows the files can hold before growing again."""
+        return len(self._columns['a'])
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes reserved by the column files on disk."""
+        return sum(mapped.nbytes for mapped in self._columns.values())
+
+    @property
+    def operations(self) -> OperationCodes:
+        """Registry mapping operation names to the codes in the operation column."""
+        return self._operations
+
+    @property
+    def time_sorted(self) -> bool:
+        """Whether the timestamps are in ascending order."""
+        return self._time_sorted
+
+    def column(self, name: str, start: int = 0) -> np.ndarray:
+        """Return a read-only view of the stored values of one column from row ``start`` on."""
+        view = np.asarray(self._columns[name][start:len(self)])
+        if name == 'timestamp':
+            view = view.view('datetime64[ns]')
+        view = view.view()
+        view.flags.writeable = False
+        return view
+
+    def append(self, timestamp: datetime, a: float, b: float, operation: str, result: float) -> None:
+        """Append a single row to the column files."""
+        index = len(self)
+        self._reserve(index + 1)
+        columns = self._columns
+        nanoseconds = np.datetime64(timestamp, 'ns').astype(np.int64)
+        if index and nanoseconds < columns['timestamp'][index - 1]:
+            self._time_sorted = False
+        columns['timestamp'][index] = nanoseconds
+        columns['a'][index] = a
+        columns['b'][index] = b
+        columns['operation'][index] = self._operations.code(operation)
+        columns['result'][index] = result
+        # Publish the row only after all of its columns are written
+        self._rows[0] = index + 1
+        self._frame = None
+
+    def extend(self, df: pd.DataFrame) -> None:
+        """Append every row of a history DataFrame to the column files."""
+        count = len(df)
+        if count == 0:
+            return
+        start, end = len(self), len(self) + count
+        self._reserve(end)
+        columns = self._columns
+        nanoseconds = pd.to_datetime(df['timestamp']).to_numpy(dtype='datetime64[ns]').astype(np.int64)
+        if self._time_sorted:
+            self._time_sorted = is_ascending(nanoseconds, columns['timestamp'][start - 1] if start else None)
+        columns['timestamp'][start:end] = nanoseconds
+        columns['a'][start:end] = df['a'].to_numpy(dtype=np.float64)
+        columns['b'][start:end] = df['b'].to_numpy(dtype=np.float64)
+        columns['operation'][start:end] = self._operations.encode(df['operation'], np.uint8)
+        columns['result'][start:end] = df['result'].to_numpy(dtype=np.float64)
+        self._rows[0] = end
+        self._frame = None
+
+    def clear(self) -> None:
+        """Remove every row and shrink the column files back to their initial size."""
+        self._rows[0] = 0
+        for mapped in self._columns.values():
+            mapped.flush()
+        self._columns = {}
+        for name, dtype in self._COLUMN_DTYPES.items():
+            with open(self._column_path(name), 'r+b') as f:
+                f.truncate(self._initial_capacity * dtype.itemsize)
+        self._operations.clear()
+        self._map_columns(self._initial_capacity)
+        self._time_sorted = True
+        self._frame = None
+
+    def flush(self) -> None:
+        """Write any modified mapped pages back to disk."""
+        for mapped in self._columns.values():
+            mapped.flush()
+        self._rows.flush()
+
+    def _frame_from(self, selector: Union[slice, np.ndarray], index=None) -> pd.DataFrame:
+        """Copy the selected rows out of the mapped files into a DataFrame."""
+        columns = self._columns
+        return pd.DataFrame({
+            'timestamp': np.array(columns['timestamp'][selector]).view('datetime64[ns]'),
+            'a': np.array(columns['a'][selector]),
+            'b': np.array(columns['b'][selector]),
+            'operation': self._operations.decode(np.array(columns['operation'][selector])),
+            'result': np.array(columns['result'][selector])
+        }, columns=HISTORY_COLUMNS, index=index)
+
+    def latest(self) -> Optional[dict]:
+        """Return the last row as a dictionary, or None if the store is empty."""
+        size = len(self)
+        if size == 0:
+            return None
+        index = size - 1
+        columns = self._columns
+        return {
+            'timestamp': pd.Timestamp(int(columns['timestamp'][index])),
+            'a': float(columns['a'][index]),
+            'b': float(columns['b'][index]),
+            'operation': self._operations.names[columns['operation'][index]],
+            'result': float(columns['result'][index])
+        }
+
+    def slice(self, start: int, stop: Optional[int] = None) -> pd.DataFrame:
+        """Return rows ``start:stop`` as a new DataFrame indexed by position."""
+        size = len(self)
+        stop = size if stop is None else min(stop, size)
+        start = min(max(start, 0), stop)
+        return self._frame_from(slice(start, stop), index=pd.RangeIndex(start, stop))
+
+    def take(self, positions: np.ndarray) -> pd.DataFrame:
+        """Return the rows at the given positions, indexed by position."""
+        positions = np.asarray(positions, dtype=np.int64)
+        return self._frame_from(positions, index=positions)
+
+    def iter_chunks(self, chunk_rows: int = 1 << 20) -> Iterator[Tuple[int, Dict[str, np.ndarray]]]:
+        """Yield ``(offset, columns)`` pairs covering the store in row order.
+
+        Every column is a mapped slice; the operation column holds codes
+        from ``operations``.
+        """
+        size = len(self)
+        columns = self._columns
+        for start in range(0, size, chunk_rows):
+            stop = min(start + chunk_rows, size)
+            yield start, {
+                'timestamp': columns['timestamp'][start:stop].view('datetime64[ns]'),
+                'a': columns['a'][start:stop],
+                'b': columns['b'][start:stop],
+                'operation': columns['operation'][start:stop],
+                'result': columns['result'][start:stop]
+            }
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Materialize the whole store as a DataFrame, cached until the next write."""
+        if self._frame is None:
+            self._frame = self.slice(0)
+        return self._frame
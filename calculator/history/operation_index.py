@@ -0,0 +1,120 @@
+"""Module providing an inverted index from operations to history rows."""
+
+from typing import Dict, Iterable, List, Tuple
+import numpy as np
+
+
+class OperationIndex:
+    """Posting lists of history row positions, one per operation code.
+
+    Each posting list is a growable int64 array kept in row order, so adding a
+    row is amortized O(1) and listing the rows of one operation is O(k).
+
+    The posting lists cover the rows from ``start`` on. Rows before it (e.g.
+    spilled to disk by a bounded-memory store) are only counted, and
+    ``positions`` finds them by scanning the chunks it is given for them, so
+    the index stays proportional to the rows kept in memory.
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._postings: List[np.ndarray] = []
+        self._counts: List[int] = []
+        self._discarded: List[int] = []
+        self._start = 0
+
+    def reset(self) -> None:
+        """Forget every posting list."""
+        self._postings = []
+        self._counts = []
+        self._discarded = []
+        self._start = 0
+
+    @property
+    def start(self) -> int:
+        """Position of the first row covered by the posting lists."""
+        return self._start
+
+    def _reserve(self, code: int, required: int) -> np.ndarray:
+        """Return the posting list for ``code`` with room for ``required`` positions."""
+        while len(self._postings) <= code:
+            self._postings.append(np.empty(16, dtype=np.int64))
+            self._counts.append(0)
+            self._discarded.append(0)
+        postings = self._postings[code]
+        if required > len(postings):
+            capacity = len(postings)
+            while capacity < required:
+                capacity *= 2
+            grown = np.empty(capacity, dtype=np.int64)
+            grown[:self._counts[code]] = postings[:self._counts[code]]
+            postings = self._postings[code] = grown
+        return postings
+
+    def add(self, code: int, position: int) -> None:
+        """Record that the row at ``position`` has operation ``code``."""
+        count = self._counts[code] if code < len(self._counts) else 0
+        self._reserve(code, count + 1)[count] = position
+        self._counts[code] = count + 1
+
+    def add_codes(self, codes: np.ndarray, offset: int) -> None:
+        """Record a run of rows starting at ``offset`` with the given operation codes."""
+        for code in np.unique(codes):
+            code = int(code)
+            positions = np.flatnonzero(codes == code) + offset
+            count = self._counts[code] if code < len(self._counts) else 0
+            self._reserve(code, count + len(positions))[count:count + len(positions)] = positions
+            self._counts[code] = count + len(positions)
+
+    def _count_discarded(self, codes: np.ndarray) -> None:
+        """Count rows that are not kept in the posting lists."""
+        for code, count in enumerate(np.bincount(codes)):
+            if count:
+                self._reserve(code, 0)
+                self._discarded[code] += int(count)
+
+    def discard_before(self, position: int) -> None:
+        """Drop the rows before ``position`` from the posting lists, still counting them."""
+        if position <= self._start:
+            return
+        for code, postings in enumerate(self._postings):
+            count = self._counts[code]
+            dropped = int(np.searchsorted(postings[:count], position))
+            if dropped:
+                postings[:count - dropped] = postings[dropped:count]
+                self._counts[code] = count - dropped
+                self._discarded[code] += dropped
+        self._start = position
+
+    def rebuild(self, chunks: Iterable[Tuple[int, Dict[str, np.ndarray]]], start: int = 0) -> None:
+        """Recompute the posting lists from ``(offset, columns)`` history chunks.
+
+        Rows before ``start`` are counted but not kept in the posting lists.
+        """
+        self.reset()
+        self._start = start
+        for offset, columns in chunks:
+            codes = columns['operation']
+            skipped = min(max(start - offset, 0), len(codes))
+            if skipped:
+                self._count_discarded(codes[:skipped])
+            if skipped < len(codes):
+                self.add_codes(codes[skipped:], offset + skipped)
+
+    def positions(self, code: int,
+                  chunks: Iterable[Tuple[int, Dict[str, np.ndarray]]] = ()) -> np.ndarray:
+        """Return the positions of the rows with operation ``code``, in row order.
+
+        Args:
+            code: Operation code.
+            chunks: ``(offset, columns)`` chunks covering the rows before
+                ``start``, scanned for the rows the posting lists do not hold.
+        """
+        scanned = [np.flatnonzero(columns['operation'] == code) + offset for offset, columns in chunks]
+        indexed = (self._postings[code][:self._counts[code]] if code < len(self._counts)
+                   else np.array([], dtype=np.int64))
+        return np.concatenate(scanned + [indexed]).astype(np.int64, copy=False) if scanned else indexed.copy()
+
+    def counts(self) -> List[int]:
+        """Return the number of rows for each operation code."""
+        return [count + discarded for count, discarded in zip(self._counts, self._discarded)]
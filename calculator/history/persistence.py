@@ -0,0 +1,467 @@
+"""Module for saving, loading, autosaving and commit-logging the HistoryManager history."""
+
+import csv
+import io
+import os
+from concurrent.futures import Future
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Union
+import pandas as pd
+from calculator.calculation import Calculation
+from calculator.history.autosave import AutosaveWorker
+from calculator.history.buffer import HISTORY_COLUMNS, apply_history_schema
+from calculator.history.concurrency import synchronized
+from calculator.history.group_commit import GroupCommitWriter
+from calculator.history.storage import read_history, replace_history, resolve_format, write_history
+from calculator.logging_config import get_logger
+
+# Get module logger
+logger = get_logger(__name__)
+
+
+def _csv_line(fields: Sequence[Any]) -> bytes:
+    """Encode one history CSV line, quoting fields the way the journal's pandas writer does."""
+    line = io.StringIO()
+    csv.writer(line, lineterminator='\n').writerow(fields)
+    return line.getvalue().encode()
+
+
+class PersistenceMixin:
+    """History files, journal appends, autosave and the commit log of ``HistoryManager``."""
+    
+    # Append-only journal settings: save_history appends only unsaved rows
+    _journal_enabled = os.environ.get('CALCULATOR_HISTORY_JOURNAL', 'false').lower() in ('1', 'true', 'yes')
+    _compact_every = int(os.environ.get('CALCULATOR_HISTORY_COMPACT_EVERY', 100))
+    _journal_state: Dict[str, Dict[str, int]] = {}  # Absolute path -> flushed rows, file size, generation
+    _generation = 0  # Bumped whenever history changes other than by appending
+    
+    # Background worker saving new rows (see configure_autosave), or None
+    _autosave: Optional[AutosaveWorker] = None
+    _autosave_interval = float(os.environ.get('CALCULATOR_AUTOSAVE_INTERVAL', 0))
+    _autosave_rows = int(os.environ.get('CALCULATOR_AUTOSAVE_ROWS', 0))
+    
+    # Durable commit log every added calculation is appended to (see configure_commit_log), or None
+    _commit_log: Optional[GroupCommitWriter] = None
+    _commit_log_file = os.environ.get('CALCULATOR_HISTORY_COMMIT_LOG', '')
+    _commit_max_latency = float(os.environ.get('CALCULATOR_COMMIT_MAX_LATENCY_MS', 5)) / 1000
+    
+    @classmethod
+    def save_history(cls, file_path: Optional[str] = None, journal: Optional[bool] = None) -> str:
+        """Save the history to a file.
+        
+        The format follows the file extension or ``CALCULATOR_HISTORY_FORMAT``
+        (see ``calculator.history.storage``). In journal mode only the rows
+        added since the last save to the same CSV file are appended to it. The
+        file is rewritten in full (compacted) when it no longer matches the
+        in-memory history, e.g. after a clear or load, and after every
+        ``CALCULATOR_HISTORY_COMPACT_EVERY`` appends.
+        
+        Args:
+            file_path: Path to save the file. If None, uses default path.
+            journal: Whether to append only new rows. If None, uses
+                ``CALCULATOR_HISTORY_JOURNAL``.
+            
+        Returns:
+            The path where the file was saved.
+        """
+        path = file_path or cls._default_file_path
+        if journal is None:
+            journal = cls._journal_enabled
+        with cls._file_lock:
+            return cls._save_locked(path, journal)
+    
+    @classmethod
+    @synchronized
+    def _save_locked(cls, path: str, journal: bool) -> str:
+        """Save the history to ``path``; the caller holds the file lock."""
+        try:
+            # Ensure parent directory exists
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fmt = resolve_format(path)
+            state = cls._journal_state.get(os.path.abspath(path))
+            if journal and fmt == 'csv' and cls._can_append(path, state):
+                cls._append_rows(path, state)
+            elif journal and fmt == 'csv' and state is not None and 'base_size' in state:
+                # Compacting a file adopted by autosave keeps the rows of earlier sessions
+                cls._write_after_base(path, state['base_size'], cls._history.to_dataframe())
+                cls._record_flush(path, len(cls._history), 0,
+                                  {name: state[name] for name in ('base_rows', 'base_size')})
+            else:
+                cls._write_full(path, fmt)
+            logger.info(f"Calculation history saved to {path}")
+            return path
+        except Exception as e:
+            logger.error(f"Error saving history to {path}: {e}")
+            raise
+    
+    @classmethod
+    def autosave_history(cls, file_path: Optional[str] = None) -> int:
+        """Write the rows added since the last save, holding the history lock only to copy them.
+        
+        New rows are appended to a CSV file that still matches the history,
+        as in journal mode; otherwise the whole history is written to a
+        temporary file that then replaces the history file. The
+        rows are copied under the lock and written after releasing it, so
+        calculations can keep being added while the file is written.
+        
+        A history file that was neither loaded nor saved in this session is
+        never replaced: a CSV file with the history header is adopted and the
+        rows of this session are appended after its rows, which are kept when
+        the file is rewritten later on. Any other existing file is left alone
+        and the save fails.
+        
+        Args:
+            file_path: Path of the history file. If None, uses default path.
+            
+        Returns:
+            The number of rows written.
+        """
+        path = file_path or cls._default_file_path
+        key = os.path.abspath(path)
+        with cls._file_lock:
+            with cls._lock:
+                if cls._thread_safe:
+                    cls._merge_thread_buffers()
+                fmt = resolve_format(path)
+                state = cls._journal_state.get(key)
+                if state is None:
+                    state = cls._adopt_history_file(path, fmt)
+                rows, generation = len(cls._history), cls._generation
+                append = fmt == 'csv' and cls._can_append(path, state)
+                if append and rows == state['rows']:
+                    return 0
+                base = {name: state[name] for name in ('base_rows', 'base_size') if state and name in state}
+                snapshot = cls._history.slice(state['rows'] if append else 0, rows)
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                if append:
+                    snapshot.to_csv(path, mode='a', header=False, index=False, date_format='%Y-%m-%d %H:%M:%S.%f')
+                elif base:
+                    cls._write_after_base(path, base['base_size'], snapshot)
+                else:
+                    # Never truncate the file in place: a crash mid-write would lose the whole history
+                    replace_history(snapshot, path, fmt)
+            except Exception as e:
+                logger.error(f"Error autosaving history to {path}: {e}")
+                raise
+            with cls._lock:
+                # A clear or load during the write makes the file stale; the next save rewrites it
+                cls._journal_state[key] = dict(
+                    base,
+                    rows=rows,
+                    size=os.path.getsize(path),
+                    generation=generation,
+                    appends=state['appends'] + 1 if append else 0
+                )
+        logger.debug(f"Autosaved {len(snapshot)} rows to {path}")
+        return len(snapshot)
+    
+    @classmethod
+    def _adopt_history_file(cls, path: str, fmt: str) -> Optional[Dict[str, int]]:
+        """Start journaling into an existing history file that this session has not written.
+        
+        The file keeps its rows (``base_rows`` rows in the first ``base_size``
+        bytes) and the rows of this session are appended after them.
+        
+        Returns:
+            The journal state for the file, or None if there is no file to keep.
+            
+        Raises:
+            ValueError: If the file is not a complete history CSV file.
+        """
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return None
+        if size == 0:
+            return None
+        if fmt != 'csv':
+            raise ValueError(f"{path} was not loaded in this session; autosave only appends to CSV history files")
+        with open(path, 'rb') as f:
+            header = f.readline()
+            if header.rstrip(b'\r\n').decode('utf-8', 'replace') != ','.join(HISTORY_COLUMNS):
+                raise ValueError(f"{path} is not a history CSV file; refusing to overwrite it")
+            base_rows = sum(1 for _ in f)
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b'\n':
+                raise ValueError(f"{path} ends with an incomplete row; refusing to append to it")
+        state = {'rows': 0, 'size': size, 'generation': cls._generation, 'appends': 0,
+                 'base_rows': base_rows, 'base_size': size}
+        cls._journal_state[os.path.abspath(path)] = state
+        logger.info(f"Autosave keeps the {base_rows} rows already in {path}")
+        return state
+    
+    @staticmethod
+    def _write_after_base(path: str, base_size: int, snapshot: pd.DataFrame) -> None:
+        """Rewrite a history CSV file as its first ``base_size`` bytes followed by ``snapshot``."""
+        temp_path = f"{path}.tmp"
+        with open(path, 'rb') as source, open(temp_path, 'wb') as target:
+            remaining = base_size
+            while remaining > 0:
+                block = source.read(min(remaining, 1 << 20))
+                if not block:
+                    break
+                target.write(block)
+                remaining -= len(block)
+        snapshot.to_csv(temp_path, mode='a', header=False, index=False, date_format='%Y-%m-%d %H:%M:%S.%f')
+        os.replace(temp_path, path)
+    
+    @classmethod
+    def configure_autosave(cls, interval: Optional[float] = None, rows: Optional[int] = None,
+                           file_path: Optional[str] = None) -> bool:
+        """Start or stop saving new rows to the history file in a background thread.
+        
+        Rows are saved every ``interval`` seconds and as soon as ``rows``
+        calculations were added since the last save. Autosave turns on
+        thread-safe mode, so ``add_calculation`` only queues rows and never
+        waits for a save. The worker is stopped, with a final save, at exit.
+        
+        Args:
+            interval: Seconds between saves. If None, uses ``CALCULATOR_AUTOSAVE_INTERVAL``.
+            rows: Calculations that trigger an early save. If None, uses
+                ``CALCULATOR_AUTOSAVE_ROWS``.
+            file_path: Path of the history file. If None, uses default path.
+            
+        Returns:
+            True if autosave is running, False if both settings are 0.
+        """
+        cls.stop_autosave()
+        interval = cls._autosave_interval if interval is None else interval
+        rows = cls._autosave_rows if rows is None else rows
+        if interval <= 0 and rows <= 0:
+            return False
+        cls.configure_concurrency(True)
+        cls._autosave = AutosaveWorker(lambda: cls.autosave_history(file_path), interval, rows)
+        cls._autosave.start()
+        return True
+    
+    @classmethod
+    def stop_autosave(cls) -> None:
+        """Stop the autosave worker, if any, after saving the rows it has not written yet."""
+        worker, cls._autosave = cls._autosave, None
+        if worker is not None:
+            worker.stop()
+    
+    @classmethod
+    def _commit(cls, timestamp: datetime, calculation: Calculation, result: Any) -> Future:
+        """Submit one calculation to the commit log as a history CSV line."""
+        return cls._commit_log.submit(_csv_line([
+            f"{timestamp:%Y-%m-%d %H:%M:%S.%f}", repr(float(calculation.a)), repr(float(calculation.b)),
+            calculation.operation.__name__, repr(float(result))
+        ]))
+    
+    @classmethod
+    def configure_commit_log(cls, file_path: Optional[str] = None, max_latency: Optional[float] = None) -> bool:
+        """Start or stop appending every added calculation to a durable commit log.
+        
+        The log is a history CSV file written by a ``GroupCommitWriter``:
+        calculations added while a commit runs share the next append and
+        fsync, and ``add_calculation`` and ``add_batch`` return futures that
+        complete when their rows are durable. ``load_history`` reads the log
+        back. The log is closed, after committing the queued rows, at exit.
+        
+        Args:
+            file_path: Path of the log. If None, uses ``CALCULATOR_HISTORY_COMMIT_LOG``
+                in the data directory; an empty setting turns the log off.
+            max_latency: Seconds a commit waits for more rows after its first
+                one. If None, uses ``CALCULATOR_COMMIT_MAX_LATENCY_MS``.
+            
+        Returns:
+            True if the commit log is open, False if it is off.
+        """
+        cls.close_commit_log()
+        if file_path is None:
+            if not cls._commit_log_file:
+                return False
+            file_path = str(cls._data_dir.joinpath(cls._commit_log_file))
+        cls._commit_log = GroupCommitWriter(
+            file_path,
+            max_latency=cls._commit_max_latency if max_latency is None else max_latency,
+            header=_csv_line(HISTORY_COLUMNS)
+        )
+        logger.info(f"History commit log opened at {file_path}")
+        return True
+    
+    @classmethod
+    def close_commit_log(cls) -> None:
+        """Commit the rows still queued for the commit log, if any, and close it."""
+        writer, cls._commit_log = cls._commit_log, None
+        if writer is not None:
+            writer.close()
+    
+    @classmethod
+    def compact_history(cls, file_path: Optional[str] = None) -> str:
+        """Rewrite the history file in full from the in-memory history.
+        
+        Args:
+            file_path: Path to save the file. If None, uses default path.
+            
+        Returns:
+            The path where the file was saved.
+        """
+        return cls.save_history(file_path, journal=False)
+    
+    @classmethod
+    def _can_append(cls, path: str, state: Optional[Dict[str, int]]) -> bool:
+        """Check whether the file still holds exactly the rows flushed earlier."""
+        if state is None or state['generation'] != cls._generation:
+            return False
+        if state['rows'] > len(cls._history) or state['appends'] >= cls._compact_every > 0:
+            return False
+        try:
+            return os.path.getsize(path) == state['size']
+        except OSError:
+            return False
+    
+    @classmethod
+    def _append_rows(cls, path: str, state: Dict[str, int]) -> None:
+        """Append the rows added since the last flush to the journal file."""
+        rows = len(cls._history)
+        if rows > state['rows']:
+            new_df = cls._history.slice(state['rows'], rows)
+            new_df.to_csv(path, mode='a', header=False, index=False, date_format='%Y-%m-%d %H:%M:%S.%f')
+            logger.debug(f"Appended {len(new_df)} rows to history journal {path}")
+        cls._record_flush(path, rows, state['appends'] + 1,
+                          {name: state[name] for name in ('base_rows', 'base_size') if name in state})
+    
+    @classmethod
+    def _write_full(cls, path: str, fmt: str = 'csv') -> None:
+        """Write the whole history to the file, compacting any journal appends."""
+        write_history(cls._history.to_dataframe(), path, fmt)
+        cls._record_flush(path, len(cls._history), 0)
+    
+    @classmethod
+    def _record_flush(cls, path: str, rows: int, appends: int, base: Optional[Dict[str, int]] = None) -> None:
+        """Remember how much of the history the file holds after a write.
+        
+        ``base`` describes rows from an earlier session kept at the start of
+        the file (see ``_adopt_history_file``).
+        """
+        cls._journal_state[os.path.abspath(path)] = dict(
+            base or {},
+            rows=rows,
+            size=os.path.getsize(path),
+            generation=cls._generation,
+            appends=appends
+        )
+    
+    @classmethod
+    @synchronized
+    def load_history(cls, file_path: Optional[str] = None,
+                     since: Union[str, datetime, None] = None,
+                     until: Union[str, datetime, None] = None,
+                     operations: Optional[List[str]] = None,
+                     max_rows: Optional[int] = None) -> bool:
+        """Load history from a CSV, Parquet or NumPy .npz file.
+        
+        CSV files are streamed in chunks and filtered while they are read, so
+        loading a narrow selection does not hold the whole file in memory.
+        After a filtered load the in-memory history no longer mirrors the
+        file, so the next save to it rewrites it with the selection.
+        
+        Args:
+            file_path: Path to load the file from. If None, uses default path.
+            since: Only load calculations at or after this time.
+            until: Only load calculations at or before this time.
+            operations: Only load calculations with these operation names.
+            max_rows: Only load the most recent matching calculations, at most this many.
+            
+        Returns:
+            True if successful, False otherwise.
+        """
+        path = file_path or cls._default_file_path
+        
+        if not os.path.exists(path):
+            logger.warning(f"History file not found: {path}")
+            return False
+            
+        try:
+            loaded_df = apply_history_schema(read_history(path, resolve_format(path), since=since, until=until,
+                                                          operations=operations, max_rows=max_rows))
+            cls._history.clear()
+            cls._history.extend(loaded_df)
+            cls._generation += 1
+            cls._forget_calculations()
+            cls._rebuild_indexes()
+            cls._result_index.reset()
+            if since is None and until is None and operations is None and max_rows is None:
+                # The file now mirrors memory, so later journal saves can append to it
+                cls._record_flush(path, len(cls._history), 0)
+            else:
+                cls._journal_state.pop(os.path.abspath(path), None)
+            logger.info(f"Calculation history loaded from {path} ({len(loaded_df)} rows)")
+            return True
+        except Exception as e:
+            logger.error(f"Error loading history from {path}: {e}")
+            return False
+    
+    @classmethod
+    def delete_history_file(cls, file_path: Optional[str] = None) -> bool:
+        """Delete the history file.
+        
+        Args:
+            file_path: Path to the file to delete. If None, uses default path.
+            
+        Returns:
+            True if successful, False otherwise.
+        """
+        path = file_path or cls._default_file_path
+        
+        if not os.path.exists(path):
+            logger.warning(f"History file not found for deletion: {path}")
+            return False
+            
+        try:
+            with cls._file_lock:
+                os.remove(path)
+            cls._journal_state.pop(os.path.abspath(path), None)
+            logger.info(f"History file deleted: {path}")
+            return True
+        except Exception as e:
+            logger.error(f"Error deleting history file {path}: {e}")
+            return False
+    
+    @classmethod
+    @synchronized
+    def export_to_excel(cls, file_path: str) -> str:
+        """Export history to Excel file.
+        
+        Args:
+            file_path: Path to save the Excel file.
+            
+        Returns:
+            The path where the file was saved.
+        """
+        try:
+            history_df = cls._history.to_dataframe()
+            # Create a writer object
+            with pd.ExcelWriter(file_path, engine='openpyxl') as writer:
+                # Write the main history sheet
+                history_df.to_excel(writer, sheet_name='History', index=False)
+                
+                # Write statistics sheet if history is not empty
+                if not history_df.empty:
+                    stats = cls.get_statistics()
+                    stats_df = pd.DataFrame()
+                    
+                    for op_name, op_stats in stats.items():
+                        op_df = pd.DataFrame([op_stats], index=[op_name])
+                        stats_df = pd.concat([stats_df, op_df])
+                    
+                    stats_df.to_excel(writer, sheet_name='Statistics')
+                    
+                    # Create a pivot table sheet
+                    pivot = pd.pivot_table(
+                        history_df,
+                        values='result',
+                        index='operation',
+                        aggfunc=['count', 'mean', 'min', 'max', 'std'],
+                        observed=True
+                    )
+                    pivot.to_excel(writer, sheet_name='Pivot')
+            
+            logger.info(f"Calculation history exported to Excel: {file_path}")
+            return file_path
+        except Exception as e:
+            logger.error(f"Error exporting history to Excel {file_path}: {e}")
+            raise
@@ -0,0 +1,159 @@
+"""Module providing a sorted secondary index over calculation results."""
+
+from typing import Callable, Dict, Iterable, List, Tuple
+import numpy as np
+
+Chunks = Iterable[Tuple[int, Dict[str, np.ndarray]]]
+
+# Pending rows held unsorted before they are merged into the sorted index
+MERGE_ROWS = 4096
+
+
+class ResultIndex:
+    """Positions of history rows ordered by their result.
+
+    The index keeps a sorted permutation of the rows it has merged. Rows
+    appended since then form a small unsorted tail that queries scan next to
+    the sorted part, and the tail is merged in once it holds ``MERGE_ROWS``
+    rows, so appends stay amortized O(1) and queries are O(log n + k) plus
+    the tail. ``reset`` drops everything, and the next query rebuilds the
+    index with a single sort, which suits bulk loads.
+
+    Rows whose result is NaN (calculations that failed) are left out, so they
+    never match a range and never rank among the largest or smallest results.
+
+    The index covers the rows from ``start`` on. The queries take
+    ``(offset, columns)`` chunks of the rows before it (e.g. spilled to disk
+    by a bounded-memory store) and scan those, so the index stays
+    proportional to the rows kept in memory.
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._order = np.array([], dtype=np.int64)
+        self._values = np.array([], dtype=np.float64)
+        self._tail_positions = np.array([], dtype=np.int64)
+        self._tail_values = np.array([], dtype=np.float64)
+        self._start = 0
+        self._end = 0
+
+    def reset(self) -> None:
+        """Forget every indexed row, e.g. after the history was cleared or replaced."""
+        self._order = np.array([], dtype=np.int64)
+        self._values = np.array([], dtype=np.float64)
+        self._tail_positions = np.array([], dtype=np.int64)
+        self._tail_values = np.array([], dtype=np.float64)
+        self._start = 0
+        self._end = 0
+
+    def __len__(self) -> int:
+        """Return the number of rows covered by the index."""
+        return self._end - self._start
+
+    @property
+    def start(self) -> int:
+        """Position of the first row covered by the index."""
+        return self._start
+
+    def discard_before(self, position: int) -> None:
+        """Drop the rows before ``position`` from the index, e.g. once they were spilled to disk."""
+        if position <= self._start:
+            return
+        keep = self._order >= position
+        self._order = self._order[keep]
+        self._values = self._values[keep]
+        keep = self._tail_positions >= position
+        self._tail_positions = self._tail_positions[keep]
+        self._tail_values = self._tail_values[keep]
+        self._start = position
+        self._end = max(self._end, position)
+
+    def refresh(self, size: int, read_results: Callable[[int], np.ndarray], start: int = 0) -> None:
+        """Add the rows appended since the last refresh to the index.
+
+        Args:
+            size: Number of rows in the history.
+            read_results: Function returning the result column from a given row on.
+            start: First row to cover; earlier rows are dropped from the index.
+        """
+        self.discard_before(start)
+        if size < self._end or start < self._start:
+            # The history shrank or was replaced without a reset, so the index cannot be trusted
+            self.reset()
+            self._start = self._end = start
+        if size > self._end:
+            tail = np.asarray(read_results(self._end), dtype=np.float64)
+            valid = np.flatnonzero(~np.isnan(tail))
+            self._tail_positions = np.concatenate([self._tail_positions, valid + self._end])
+            self._tail_values = np.concatenate([self._tail_values, tail[valid]])
+            self._end = size
+        if len(self._tail_positions) > MERGE_ROWS or (len(self._order) == 0 and len(self._tail_positions)):
+            self._merge()
+
+    def _merge(self) -> None:
+        """Sort the pending tail into the index."""
+        tail_order = np.argsort(self._tail_values, kind='stable')
+        tail_values = self._tail_values[tail_order]
+        tail_positions = self._tail_positions[tail_order]
+        if len(self._order) == 0:
+            self._order, self._values = tail_positions, tail_values
+        else:
+            # Later rows go after equal results, so ties stay in history order
+            slots = np.searchsorted(self._values, tail_values, side='right')
+            self._order = np.insert(self._order, slots, tail_positions)
+            self._values = np.insert(self._values, slots, tail_values)
+        self._tail_positions = np.array([], dtype=np.int64)
+        self._tail_values = np.array([], dtype=np.float64)
+
+    def range(self, min_value: float, max_value: float, chunks: Chunks = ()) -> np.ndarray:
+        """Return the positions with ``min_value <= result <= max_value`` in history order.
+
+        ``chunks`` cover the rows before ``start``, which are scanned.
+        """
+        scanned = [np.flatnonzero((columns['result'] >= min_value) & (columns['result'] <= max_value)) + offset
+                   for offset, columns in chunks]
+        start = np.searchsorted(self._values, min_value, side='left')
+        stop = np.searchsorted(self._values, max_value, side='right')
+        indexed = np.sort(self._order[start:stop])
+        # Tail rows come after every merged row, already in history order
+        tail = self._tail_positions[(self._tail_values >= min_value) & (self._tail_values <= max_value)]
+        return np.concatenate(scanned + [indexed, tail]).astype(np.int64, copy=False)
+
+    def _select(self, n: int, largest: bool, chunks: Chunks) -> np.ndarray:
+        """Return the positions of the ``n`` smallest or largest results across ``chunks``, the index and its tail.
+
+        Equal results keep history order, as they do in the index.
+        """
+        candidates: List[Tuple[np.ndarray, np.ndarray]] = []
+        for offset, columns in chunks:
+            valid = np.flatnonzero(~np.isnan(columns['result']))
+            candidates.append((valid + offset, columns['result'][valid]))
+        if len(self._tail_positions):
+            candidates.append((self._tail_positions, self._tail_values))
+        if not candidates:
+            order = self._order[-n:][::-1] if largest else self._order[:n]
+            return order.copy()
+        positions = [self._order[-n:] if largest else self._order[:n]]
+        values = [self._values[-n:] if largest else self._values[:n]]
+        for candidate_positions, candidate_values in candidates:
+            order = np.argsort(candidate_values, kind='stable')
+            order = order[-n:] if largest else order[:n]
+            positions.append(candidate_positions[order].astype(np.int64, copy=False))
+            values.append(candidate_values[order])
+        positions, values = np.concatenate(positions), np.concatenate(values)
+        by_position = np.argsort(positions, kind='stable')
+        positions, values = positions[by_position], values[by_position]
+        order = np.argsort(values, kind='stable')
+        return positions[order[-n:][::-1]] if largest else positions[order[:n]]
+
+    def smallest(self, n: int, chunks: Chunks = ()) -> np.ndarray:
+        """Return the positions of the ``n`` smallest results, smallest first."""
+        if n <= 0:
+            return np.array([], dtype=np.int64)
+        return self._select(n, False, chunks)
+
+    def largest(self, n: int, chunks: Chunks = ()) -> np.ndarray:
+        """Return the positions of the ``n`` largest results, largest first."""
+        if n <= 0:
+            return np.array([], dtype=np.int64)
+        return self._select(n, True, chunks)
@@ -0,0 +1,215 @@
+"""Module providing a bounded in-memory history that spills older rows to disk."""
+
+import pathlib
+import shutil
+import tempfile
+import weakref
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+import numpy as np
+import pandas as pd
+from calculator.history.buffer import HISTORY_COLUMNS, HistoryBuffer, empty_history_frame, is_ascending
+from calculator.history.mmap_store import MemmapHistoryStore
+
+
+class SpillingHistoryStore:
+    """Calculation history keeping at most ``max_rows`` recent rows in memory.
+
+    The newest rows live in a ``HistoryBuffer``. When it holds more than
+    ``max_rows`` rows, the oldest ones are moved into a ``MemmapHistoryStore``
+    spill segment on disk. Rows are spilled in blocks of ``max_rows // 16`` so
+    the buffer is shifted only once per block, which keeps appends amortized
+    O(1). Every query sees one history: spilled rows come first, followed by
+    the rows in memory, and positions run across both.
+
+    The spill segment belongs to the history of this process. It is emptied
+    when the store is created, so its directory must not be shared; use
+    ``temporary`` to spill into a fresh directory of this process.
+    """
+
+    def __init__(self, directory: Union[str, pathlib.Path], max_rows: int, capacity: int = 1024):
+        """Create the store, emptying any spill segment left in ``directory``."""
+        self._max_rows = max(int(max_rows), 1)
+        self._spill_block = self._max_rows // 16
+        self._memory = HistoryBuffer(min(capacity, self._max_rows))
+        self._disk = MemmapHistoryStore(directory)
+        self._disk.clear()
+        self._time_sorted = True
+        self._frame: Optional[pd.DataFrame] = None
+
+    @classmethod
+    def temporary(cls, parent: Union[str, pathlib.Path], max_rows: int,
+                  capacity: int = 1024) -> 'SpillingHistoryStore':
+        """Create a store spilling into a new directory under ``parent``.
+
+        The directory is private to the store, so other processes using the
+        same ``parent`` never see or empty it, and it is removed once the
+        store is garbage collected or the interpreter exits.
+        """
+        pathlib.Path(parent).mkdir(parents=True, exist_ok=True)
+        directory = tempfile.mkdtemp(prefix='history_spill-', dir=parent)
+        store = cls(directory, max_rows, capacity)
+        weakref.finalize(store, shutil.rmtree, directory, True)
+        return store
+
+    @property
+    def max_rows(self) -> int:
+        """Most rows kept in memory."""
+        return self._max_rows
+
+    @property
+    def spilled_rows(self) -> int:
+        """Number of rows moved to the spill segment."""
+        return len(self._disk)
+
+    def __len__(self) -> int:
+        """Return the number of rows in memory and on disk."""
+        return len(self._disk) + len(self._memory)
+
+    @property
+    def capacity(self) -> int:
+        """Number of rows the memory buffer and spill files can hold before growing again."""
+        return self._disk.capacity + self._memory.capacity
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes reserved by the memory buffer and the spill files."""
+        return self._memory.nbytes + self._disk.nbytes
+
+    @property
+    def operations(self):
+        """Registry mapping operation names to the codes in the operation column."""
+        return self._memory.operations
+
+    @property
+    def time_sorted(self) -> bool:
+        """Whether the timestamps are in ascending order."""
+        return self._time_sorted
+
+    def _last_timestamp(self) -> Optional[np.datetime64]:
+        """Return the timestamp of the newest row, or None if the store is empty."""
+        store = self._memory if len(self._memory) else self._disk
+        return store.column('timestamp', len(store) - 1)[0] if len(store) else None
+
+    def _spill(self) -> None:
+        """Move the oldest rows to disk once the memory buffer holds too many."""
+        excess = len(self._memory) - self._max_rows
+        if excess <= 0:
+            return
+        count = min(excess + self._spill_block, len(self._memory))
+        self._disk.extend(self._memory.slice(0, count))
+        self._memory.discard(count)
+
+    def append(self, timestamp: datetime, a: float, b: float, operation: str, result: float) -> None:
+        """Append a single row, spilling older rows if the memory buffer is full."""
+        if self._time_sorted and len(self):
+            self._time_sorted = np.datetime64(timestamp, 'ns') >= self._last_timestamp()
+        self._memory.append(timestamp, a, b, operation, result)
+        self._spill()
+        self._frame = None
+
+    def extend(self, df: pd.DataFrame) -> None:
+        """Append every row of a history DataFrame, spilling older rows as needed."""
+        if len(df) == 0:
+            return
+        if self._time_sorted:
+            timestamps = pd.to_datetime(df['timestamp']).to_numpy(dtype='datetime64[ns]')
+            self._time_sorted = is_ascending(timestamps, self._last_timestamp() if len(self) else None)
+        self._memory.extend(df)
+        self._spill()
+        self._frame = None
+
+    def clear(self) -> None:
+        """Remove every row from memory and disk."""
+        self._memory.clear()
+        self._disk.clear()
+        self._time_sorted = True
+        self._frame = None
+
+    def flush(self) -> None:
+        """Write any modified spill pages back to disk."""
+        self._disk.flush()
+
+    def _disk_codes(self, codes: np.ndarray) -> np.ndarray:
+        """Translate operation codes of the spill segment into the codes of ``operations``."""
+        lookup = np.array([self._memory.operations.code(name) for name in self._disk.operations.names],
+                          dtype=np.int16)
+        return lookup[codes] if len(lookup) else codes.astype(np.int16)
+
+    def _combine(self, frames: List[pd.DataFrame]) -> pd.DataFrame:
+        """Join frames from disk and memory under the operation categories of ``operations``."""
+        frames = [frame for frame in frames if len(frame)]
+        if not frames:
+            return empty_history_frame()
+        df = frames[0] if len(frames) == 1 else pd.concat(frames)
+        names = list(self.operations.names)
+        if len(frames) > 1 or list(df['operation'].cat.categories) != names:
+            df['operation'] = pd.Categorical(df['operation'].astype(object), categories=names)
+        return df[HISTORY_COLUMNS]
+
+    def latest(self) -> Optional[dict]:
+        """Return the last row as a dictionary, or None if the store is empty."""
+        return self._memory.latest() if len(self._memory) else self._disk.latest()
+
+    def slice(self, start: int, stop: Optional[int] = None) -> pd.DataFrame:
+        """Return rows ``start:stop`` as a new DataFrame indexed by position."""
+        spilled = len(self._disk)
+        stop = len(self) if stop is None else min(stop, len(self))
+        start = min(max(start, 0), stop)
+        frames = []
+        if start < spilled:
+            frames.append(self._disk.slice(start, min(stop, spilled)))
+        if stop > spilled:
+            memory = self._memory.slice(max(start - spilled, 0), stop - spilled)
+            memory.index = memory.index + spilled
+            frames.append(memory)
+        return self._combine(frames)
+
+    def take(self, positions: np.ndarray) -> pd.DataFrame:
+        """Return the rows at the given positions, indexed by position."""
+        positions = np.asarray(positions, dtype=np.int64)
+        spilled = len(self._disk)
+        on_disk = positions < spilled
+        if on_disk.all():
+            return self._combine([self._disk.take(positions)])
+        if not on_disk.any():
+            memory = self._memory.take(positions - spilled)
+            memory.index = positions
+            return self._combine([memory])
+        memory = self._memory.take(positions[~on_disk] - spilled)
+        memory.index = positions[~on_disk]
+        df = self._combine([self._disk.take(positions[on_disk]), memory])
+        return df.loc[positions]
+
+    def column(self, name: str, start: int = 0) -> np.ndarray:
+        """Return the values of one column from row ``start`` on.
+
+        Rows in memory only are returned as a view; a range reaching into the
+        spill segment is copied into one array.
+        """
+        spilled = len(self._disk)
+        if start >= spilled:
+            return self._memory.column(name, start - spilled)
+        disk = self._disk.column(name, start)
+        if name == 'operation':
+            disk = self._disk_codes(disk)
+        if len(self._memory) == 0:
+            return disk
+        return np.concatenate([disk, self._memory.column(name)])
+
+    def iter_chunks(self, chunk_rows: int = 1 << 20) -> Iterator[Tuple[int, Dict[str, np.ndarray]]]:
+        """Yield ``(offset, columns)`` pairs covering the spilled rows and then the rows in memory.
+
+        The operation column holds codes from ``operations``.
+        """
+        for offset, columns in self._disk.iter_chunks(chunk_rows):
+            yield offset, dict(columns, operation=self._disk_codes(columns['operation']))
+        spilled = len(self._disk)
+        for offset, columns in self._memory.iter_chunks(chunk_rows):
+            yield offset + spilled, columns
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Materialize the whole history as a DataFrame, cached until the next write."""
+        if self._frame is None:
+            self._frame = self.slice(0)
+        return self._frame
@@ -0,0 +1,145 @@
+"""Module for calculation statistics maintained incrementally as history grows."""
+
+import math
+from typing import Dict, Iterable, Optional, Tuple
+import numpy as np
+
+
+class RunningStats:
+    """Count, mean, variance, minimum and maximum of a stream of results.
+
+    Single values are folded in with Welford's algorithm and whole arrays with
+    Chan's parallel combination, so reading the statistics never rescans the
+    values that produced them. Like the pandas aggregation they replace, the
+    statistics skip missing results (NaN, e.g. masked divisions by zero) but
+    not infinite ones: those are counted apart from the finite values, so an
+    infinite result shows up in the minimum, maximum and mean (and makes the
+    standard deviation NaN) without breaking the running variance.
+    """
+
+    __slots__ = ('count', 'mean', 'm2', 'min', 'max', 'positive_inf', 'negative_inf')
+
+    def __init__(self):
+        """Initialize empty statistics."""
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.positive_inf = 0
+        self.negative_inf = 0
+
+    @property
+    def values(self) -> int:
+        """Number of values folded in, finite or infinite (NaN is skipped)."""
+        return self.count + self.positive_inf + self.negative_inf
+
+    def add(self, value: float) -> None:
+        """Fold a single value into the statistics, skipping NaN."""
+        if math.isnan(value):
+            return
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if math.isinf(value):
+            if value > 0:
+                self.positive_inf += 1
+            else:
+                self.negative_inf += 1
+            return
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def add_array(self, values: np.ndarray) -> None:
+        """Fold an array of values into the statistics, skipping NaN."""
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        finite = np.isfinite(values)
+        if not finite.all():
+            infinite = values[~finite]
+            self.positive_inf += int((infinite > 0).sum())
+            self.negative_inf += int((infinite < 0).sum())
+            values = values[finite]
+        count = len(values)
+        if count == 0:
+            return
+        mean = float(values.mean())
+        m2 = float(((values - mean) ** 2).sum())
+        combined = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / combined
+        self.m2 += m2 + delta * delta * self.count * count / combined
+        self.count = combined
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation, or NaN with fewer than two values or any infinite one."""
+        if self.count < 2 or self.positive_inf or self.negative_inf:
+            return math.nan
+        return math.sqrt(self.m2 / (self.count - 1))
+
+    def to_dict(self, count: Optional[int] = None) -> Dict[str, float]:
+        """Return the statistics in the shape used by ``HistoryManager.get_statistics``.
+
+        Args:
+            count: Number of rows to report, NaN results included as
+                ``len(df)`` counts them; defaults to the values folded in.
+        """
+        if self.positive_inf and self.negative_inf:
+            mean = math.nan
+        elif self.positive_inf or self.negative_inf:
+            mean = math.inf if self.positive_inf else -math.inf
+        else:
+            mean = self.mean if self.count else math.nan
+        empty = self.values == 0
+        return {
+            'count': self.values if count is None else count,
+            'mean_result': mean,
+            'min_result': math.nan if empty else self.min,
+            'max_result': math.nan if empty else self.max,
+            'std_result': self.std
+        }
+
+
+class HistoryStatistics:
+    """Running result statistics overall and for each operation."""
+
+    def __init__(self):
+        """Initialize empty statistics."""
+        self.clear()
+
+    def clear(self) -> None:
+        """Forget every value seen so far."""
+        self.overall = RunningStats()
+        self.by_operation: Dict[str, RunningStats] = {}
+
+    def add(self, operation: str, value: float) -> None:
+        """Fold a single calculation result into the statistics."""
+        self.overall.add(value)
+        stats = self.by_operation.get(operation)
+        if stats is None:
+            stats = self.by_operation[operation] = RunningStats()
+        stats.add(value)
+
+    def add_chunk(self, codes: np.ndarray, values: np.ndarray, names: Iterable[str]) -> None:
+        """Fold a chunk of results whose operations are given as codes into ``names``."""
+        names = list(names)
+        self.overall.add_array(values)
+        # Codes follow first appearance, so operations keep their historical order
+        for code in np.unique(codes):
+            name = names[code]
+            stats = self.by_operation.get(name)
+            if stats is None:
+                stats = self.by_operation[name] = RunningStats()
+            stats.add_array(values[codes == code])
+
+    def rebuild(self, chunks: Iterable[Tuple[int, Dict[str, np.ndarray]]], names: Iterable[str]) -> None:
+        """Recompute the statistics from ``(offset, columns)`` history chunks."""
+        self.clear()
+        names = list(names)
+        for _, columns in chunks:
+            self.add_chunk(columns['operation'], columns['result'], names)
@@ -0,0 +1,192 @@
+"""Module for reading and writing calculation history files in several formats."""
+
+import os
+import importlib.util
+import uuid
+from datetime import datetime
+from typing import Iterable, List, Optional, Union
+import numpy as np
+import pandas as pd
+from calculator.history.buffer import HISTORY_COLUMNS
+from calculator.logging_config import get_logger
+
+# Get module logger
+logger = get_logger(__name__)
+
+# Rows parsed per chunk when streaming a CSV history file
+CHUNK_ROWS = int(os.environ.get('CALCULATOR_HISTORY_CHUNK_ROWS', 100_000))
+
+# File extension for each supported history format
+FORMAT_EXTENSIONS = {
+    'csv': '.csv',
+    'parquet': '.parquet',
+    'npz': '.npz'
+}
+
+
+def has_pyarrow() -> bool:
+    """Check whether pyarrow is installed without importing it."""
+    return importlib.util.find_spec('pyarrow') is not None
+
+
+def normalize_format(fmt: str) -> str:
+    """Map a requested format name to one that can be used here.
+
+    ``binary`` picks Parquet when pyarrow is installed and NumPy ``.npz``
+    otherwise. An explicit ``parquet`` request also falls back to ``.npz``
+    when pyarrow is missing.
+    """
+    fmt = (fmt or 'csv').lower()
+    if fmt == 'binary':
+        fmt = 'parquet'
+    if fmt == 'parquet' and not has_pyarrow():
+        logger.warning("pyarrow is not installed, using NumPy .npz for binary history files")
+        fmt = 'npz'
+    if fmt not in FORMAT_EXTENSIONS:
+        raise ValueError(f"Unsupported history format: {fmt}")
+    return fmt
+
+
+def resolve_format(path: str) -> str:
+    """Choose the history format for a path.
+
+    A known file extension decides the format. Any other path uses
+    ``CALCULATOR_HISTORY_FORMAT`` (csv, parquet, npz or binary), defaulting to CSV.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    for fmt, fmt_extension in FORMAT_EXTENSIONS.items():
+        if extension == fmt_extension:
+            return fmt
+    return normalize_format(os.environ.get('CALCULATOR_HISTORY_FORMAT', 'csv'))
+
+
+def write_history(df: pd.DataFrame, path: str, fmt: str) -> None:
+    """Write a history DataFrame to ``path`` in the given format."""
+    if fmt == 'csv':
+        df.to_csv(path, index=False)
+    elif fmt == 'parquet':
+        typed = df.astype({'operation': 'category'})
+        typed.to_parquet(path, engine='pyarrow', index=False)
+    elif fmt == 'npz':
+        operation = pd.Categorical(df['operation'])
+        # Write through a file object so NumPy does not append its own extension
+        with open(path, 'wb') as f:
+            np.savez(
+                f,
+                timestamp=df['timestamp'].to_numpy(dtype='datetime64[ns]'),
+                a=df['a'].to_numpy(dtype=np.float64),
+                b=df['b'].to_numpy(dtype=np.float64),
+                operation_codes=operation.codes,
+                operation_categories=np.asarray(operation.categories, dtype=str),
+                result=df['result'].to_numpy(dtype=np.float64)
+            )
+    else:
+        raise ValueError(f"Unsupported history format: {fmt}")
+
+
+def replace_history(df: pd.DataFrame, path: str, fmt: str) -> None:
+    """Write a history DataFrame to a temporary file next to ``path``, then move it over ``path``.
+
+    Readers see either the old file or the complete new one, and a crash
+    during the write leaves the old file in place.
+    """
+    # A unique name, so concurrent writers never share a temporary file
+    temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        write_history(df, temp_path, fmt)
+        if os.path.exists(path):
+            os.chmod(temp_path, os.stat(path).st_mode)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def filter_history(df: pd.DataFrame, since: Optional[pd.Timestamp] = None,
+                   until: Optional[pd.Timestamp] = None,
+                   operations: Optional[List[str]] = None) -> pd.DataFrame:
+    """Keep the rows of a history DataFrame inside the time window and operation set."""
+    mask = np.ones(len(df), dtype=bool)
+    if since is not None:
+        mask &= (df['timestamp'] >= since).to_numpy()
+    if until is not None:
+        mask &= (df['timestamp'] <= until).to_numpy()
+    if operations is not None:
+        mask &= df['operation'].isin(operations).to_numpy()
+    return df if mask.all() else df[mask]
+
+
+def _read_full(path: str, fmt: str) -> pd.DataFrame:
+    """Read a whole binary history file."""
+    if fmt == 'parquet':
+        return pd.read_parquet(path, engine='pyarrow', columns=HISTORY_COLUMNS)
+    if fmt == 'npz':
+        with np.load(path, allow_pickle=False) as data:
+            return pd.DataFrame({
+                'timestamp': data['timestamp'],
+                'a': data['a'],
+                'b': data['b'],
+                'operation': pd.Categorical.from_codes(
+                    data['operation_codes'], categories=data['operation_categories']
+                ),
+                'result': data['result']
+            }, columns=HISTORY_COLUMNS)
+    raise ValueError(f"Unsupported history format: {fmt}")
+
+
+def _stream_csv(path: str, since: Optional[pd.Timestamp], until: Optional[pd.Timestamp],
+                operations: Optional[List[str]], max_rows: Optional[int], chunk_rows: int) -> pd.DataFrame:
+    """Read a CSV history file chunk by chunk, filtering each chunk as it is parsed."""
+    selected: List[pd.DataFrame] = []
+    kept = 0
+    with pd.read_csv(path, chunksize=chunk_rows) as reader:
+        for chunk in reader:
+            # Convert timestamp strings back to datetime objects
+            chunk['timestamp'] = pd.to_datetime(chunk['timestamp'], format='ISO8601')
+            chunk = filter_history(chunk, since, until, operations)
+            if chunk.empty:
+                continue
+            selected.append(chunk)
+            kept += len(chunk)
+            # Drop whole chunks that can no longer be among the last max_rows rows
+            while max_rows is not None and selected and kept - len(selected[0]) >= max_rows:
+                kept -= len(selected.pop(0))
+    if not selected:
+        return pd.read_csv(path, nrows=0, parse_dates=['timestamp'])
+    return pd.concat(selected, ignore_index=True)
+
+
+def read_history(path: str, fmt: str,
+                 since: Union[str, datetime, None] = None,
+                 until: Union[str, datetime, None] = None,
+                 operations: Optional[Iterable[str]] = None,
+                 max_rows: Optional[int] = None,
+                 chunk_rows: int = CHUNK_ROWS) -> pd.DataFrame:
+    """Read a history DataFrame from ``path`` in the given format.
+
+    CSV files are streamed ``chunk_rows`` rows at a time and every chunk is
+    filtered as soon as it is parsed, so peak memory follows the selected rows
+    rather than the file size. Binary files are read whole and then filtered.
+
+    Args:
+        path: File to read.
+        fmt: One of the formats in ``FORMAT_EXTENSIONS``.
+        since: Keep rows at or after this time.
+        until: Keep rows at or before this time.
+        operations: Keep only rows with these operation names.
+        max_rows: Keep at most this many of the most recent matching rows.
+        chunk_rows: Rows parsed per CSV chunk.
+    """
+    since = pd.Timestamp(since) if since is not None else None
+    until = pd.Timestamp(until) if until is not None else None
+    operations = list(operations) if operations is not None else None
+    if fmt == 'csv':
+        df = _stream_csv(path, since, until, operations, max_rows, chunk_rows)
+    elif fmt in ('parquet', 'npz'):
+        df = filter_history(_read_full(path, fmt), since, until, operations)
+    else:
+        raise ValueError(f"Unsupported history format: {fmt}")
+    if max_rows is not None and len(df) > max_rows:
+        df = df.iloc[len(df) - max_rows:]
+    return df.reset_index(drop=True)
@@ -10,6 +10,11 @@ def multiply(a: Decimal, b: Decimal) -> Decimal:
     return a * b
 
 def divide(a: Decimal, b: Decimal) -> Decimal:
-    if b == 0:
+    zero = b == 0
+    # NumPy operands compare element-wise, so check whether any divisor is zero
+    if zero if isinstance(zero, bool) else zero.any():
         raise ValueError("Cannot divide by zero")
-    return a / b
\ No newline at end of file
+    return a / b
+
+# Operation codes used by the batch APIs: the code of an operation is its position here
+OPERATIONS = (add, subtract, multiply, divide)
@@ -0,0 +1,66 @@
+"""Module providing a bounded LRU cache for calculation results."""
+
+from collections import OrderedDict
+from decimal import getcontext
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+def context_key() -> Tuple:
+    """Return the settings of the current decimal context that can change a result."""
+    context = getcontext()
+    return context.prec, context.rounding, context.Emin, context.Emax, context.clamp
+
+
+class ResultCache:
+    """Least-recently-used cache of computed results with hit, miss and eviction counters."""
+
+    def __init__(self, maxsize: int):
+        """Initialize an empty cache holding at most ``maxsize`` results."""
+        if maxsize < 1:
+            raise ValueError("Result cache size must be at least 1")
+        self.maxsize = maxsize
+        self._results: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        """Return the number of cached results."""
+        return len(self._results)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the cached result for ``key``, computing and caching it on a miss.
+
+        Exceptions raised by ``compute`` propagate and nothing is cached.
+        """
+        results = self._results
+        try:
+            result = results[key]
+        except KeyError:
+            self.misses += 1
+            result = compute()
+            results[key] = result
+            if len(results) > self.maxsize:
+                results.popitem(last=False)
+                self.evictions += 1
+            return result
+        results.move_to_end(key)
+        self.hits += 1
+        return result
+
+    def clear(self) -> None:
+        """Drop every cached result and reset the counters."""
+        self._results.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, float]:
+        """Return the counters, current size, capacity and hit rate."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._results),
+            'maxsize': self.maxsize,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
@@ -0,0 +1,325 @@
+"""Module providing an asyncio calculation server speaking line-delimited JSON."""
+
+import asyncio
+import json
+import math
+import os
+import signal
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from calculator.batch import OPERATION_NAMES
+from calculator.calculation import Calculation
+from calculator.history import HistoryManager
+from calculator.operations import OPERATIONS
+from calculator.logging_config import get_logger
+
+# Get module logger
+logger = get_logger(__name__)
+
+# Default address for `python main.py serve`
+DEFAULT_HOST = os.environ.get('CALCULATOR_SERVER_HOST', '127.0.0.1')
+DEFAULT_PORT = int(os.environ.get('CALCULATOR_SERVER_PORT', 8765))
+
+# Longest request line accepted, so one large batch fits in a single request
+MAX_REQUEST_BYTES = 1 << 24
+
+# Queued history writes applied before the writer yields to request handlers again
+_WRITES_PER_TURN = 256
+
+_OPERATIONS = {operation.__name__: operation for operation in OPERATIONS}
+
+
+def parse_address(address: Optional[str]) -> Dict[str, Any]:
+    """Turn a ``host:port``, ``host``, ``port`` or Unix socket path argument into server keyword arguments.
+
+    Raises:
+        ValueError: If the port is not a number.
+    """
+    if not address:
+        return {'host': DEFAULT_HOST, 'port': DEFAULT_PORT}
+    if '/' in address:
+        return {'path': address}
+    host, separator, port = address.rpartition(':')
+    if not separator:
+        if address.isdigit():
+            return {'host': DEFAULT_HOST, 'port': int(address)}
+        return {'host': address, 'port': DEFAULT_PORT}
+    if not port.isdigit():
+        raise ValueError(f"invalid server address {address!r}: expected host:port, host, port or a socket path")
+    return {'host': host or DEFAULT_HOST, 'port': int(port)}
+
+
+def _error_message(error: Exception) -> str:
+    """Return the error text sent to clients; decimal signals such as Overflow are named."""
+    if isinstance(error, ArithmeticError) and not isinstance(error, ZeroDivisionError):
+        return f"arithmetic error: {type(error).__name__}"
+    return str(error)
+
+
+def _finite(value: Any) -> Any:
+    """Return ``value``, or None for NaN and infinities, which JSON cannot represent."""
+    return None if isinstance(value, float) and not math.isfinite(value) else value
+
+
+def _calculation(a: Any, b: Any, operation_name: Any) -> Calculation:
+    """Build a calculation from request fields, raising ValueError if they are invalid."""
+    operation = _OPERATIONS.get(operation_name)
+    if operation is None:
+        raise ValueError(f"unknown operation: {operation_name}")
+    try:
+        # str() keeps JSON numbers such as 0.1 exact instead of going through binary floats
+        return Calculation(Decimal(str(a)), Decimal(str(b)), operation)
+    except InvalidOperation as e:
+        raise ValueError(f"invalid number input: {a} or {b}") from e
+
+
+def _records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Convert history rows to JSON-friendly dictionaries."""
+    return [
+        {'timestamp': timestamp.isoformat(), 'a': _finite(a), 'b': _finite(b), 'operation': operation,
+         'result': _finite(result)}
+        for timestamp, a, b, operation, result in zip(
+            df['timestamp'], df['a'].tolist(), df['b'].tolist(), df['operation'].astype(object), df['result'].tolist()
+        )
+    ]
+
+
+class CalculatorServer:
+    """Asyncio server evaluating calculations sent as one JSON object per line.
+
+    Each request line is an object with an ``op`` field and gets exactly one
+    response line; an ``id`` field is echoed back so clients can pipeline
+    requests on a keep-alive connection. Supported requests:
+
+    - ``{"op": "calculate", "a": "1.5", "b": "2", "operation": "add"}``
+      returns ``{"result": "3.5"}``.
+    - ``{"op": "batch", "calculations": [["1", "2", "add"], ...]}`` returns
+      ``{"results": [{"result": "3"}, {"error": "..."}, ...]}``.
+    - ``{"op": "history", "limit": 10}``, ``{"op": "latest"}`` and
+      ``{"op": "statistics"}`` query the calculation history.
+
+    Failed requests get ``{"error": "..."}``. Results are computed with
+    Decimal arithmetic as by ``Calculator``. Recording them in the history is
+    handed to a writer task through an ``asyncio.Queue``, so a response never
+    waits for a history append; history queries wait for queued writes first
+    and therefore see every calculation answered before them.
+    """
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, path: Optional[str] = None,
+                 record: bool = True):
+        """Configure the server to listen on TCP ``host:port`` or on the Unix socket ``path``.
+
+        Args:
+            host: Interface for TCP connections.
+            port: TCP port, or 0 to pick a free one.
+            path: Unix socket path; when given, host and port are ignored.
+            record: Whether to record calculations in the history.
+        """
+        self.host = host
+        self.port = port
+        self.path = path
+        self.record = record
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+
+    @property
+    def address(self) -> Any:
+        """Listening ``(host, port)`` pair or Unix socket path, once started."""
+        if self.path is not None:
+            return self.path
+        return self._server.sockets[0].getsockname()[:2] if self._server else (self.host, self.port)
+
+    async def start(self) -> None:
+        """Start listening and start the history writer."""
+        self._queue = asyncio.Queue()
+        self._writer_task = asyncio.create_task(self._write_history())
+        if self.path is not None:
+            self._server = await asyncio.start_unix_server(self._handle_client, self.path, limit=MAX_REQUEST_BYTES)
+            # Only the owner may send calculations to a Unix socket server
+            os.chmod(self.path, 0o600)
+        else:
+            self._server = await asyncio.start_server(self._handle_client, self.host, self.port,
+                                                      limit=MAX_REQUEST_BYTES)
+        logger.info(f"Calculation server listening on {self.address}")
+
+    async def close(self) -> None:
+        """Stop accepting connections, apply every queued history write and stop the writer."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+            if self.path is not None and os.path.exists(self.path):
+                os.unlink(self.path)
+        if self._writer_task is not None:
+            await self._queue.join()
+            self._writer_task.cancel()
+            try:
+                await self._writer_task
+            except asyncio.CancelledError:
+                pass
+            self._writer_task = None
+        logger.info("Calculation server stopped")
+
+    async def serve_forever(self) -> None:
+        """Start the server and serve until cancelled, then close it cleanly."""
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answer request lines from one connection until the client disconnects."""
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # The line exceeded MAX_REQUEST_BYTES; the stream cannot be resynchronized
+                    writer.write(b'{"error": "request line too long"}\n')
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line)
+                except json.JSONDecodeError as e:
+                    response = {'error': f"invalid JSON: {e}"}
+                else:
+                    response = await self.handle_request(request)
+                writer.write(json.dumps(response).encode() + b'\n')
+                await writer.drain()
+        except ConnectionError as e:
+            logger.warning(f"Calculation server connection lost: {e}")
+        finally:
+            writer.close()
+
+    async def handle_request(self, request: Any) -> Dict[str, Any]:
+        """Answer one decoded request object."""
+        if not isinstance(request, dict):
+            return {'error': "request must be a JSON object"}
+        try:
+            response = await self._dispatch(request.get('op'), request)
+        except (ValueError, TypeError, KeyError, ArithmeticError) as e:
+            response = {'error': _error_message(e)}
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.error(f"Error handling server request {request.get('op')}: {e}", exc_info=True)
+            response = {'error': f"internal error: {e}"}
+        if 'id' in request:
+            response['id'] = request['id']
+        return response
+
+    async def _dispatch(self, op: Any, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the request handler for ``op``."""
+        if op == 'calculate':
+            calculation = _calculation(request['a'], request['b'], request['operation'])
+            result = calculation.perform()
+            self._enqueue(('calculation', calculation, result, datetime.now()))
+            return {'result': str(result)}
+        if op == 'batch':
+            return {'results': self._evaluate_batch(request['calculations'])}
+        if op == 'history':
+            await self._queue.join()
+            return {'history': _records(HistoryManager.get_recent(int(request.get('limit', 10))))}
+        if op == 'latest':
+            await self._queue.join()
+            latest = HistoryManager.get_latest()
+            if latest is None:
+                return {'latest': None}
+            return {'latest': dict({key: _finite(value) for key, value in latest.items()},
+                                   timestamp=pd.Timestamp(latest['timestamp']).isoformat())}
+        if op == 'statistics':
+            await self._queue.join()
+            # Non-finite values (e.g. the standard deviation of one result) become null
+            return {'statistics': {name: {key: _finite(value) for key, value in stats.items()}
+                                   for name, stats in HistoryManager.get_statistics().items()}}
+        raise ValueError(f"unknown op: {op}")
+
+    def _evaluate_batch(self, items: List[Any]) -> List[Dict[str, str]]:
+        """Evaluate batch items, queueing the successful ones as one bulk history write."""
+        results = []
+        evaluated: List[Tuple[Calculation, Decimal]] = []
+        for item in items:
+            try:
+                calculation = _calculation(*item)
+                result = calculation.perform()
+            except (ValueError, TypeError, ArithmeticError) as e:
+                results.append({'error': _error_message(e)})
+                continue
+            evaluated.append((calculation, result))
+            results.append({'result': str(result)})
+        if evaluated:
+            self._enqueue(('batch', evaluated, None, datetime.now()))
+        return results
+
+    def _enqueue(self, write: Tuple[str, Any, Optional[Decimal], datetime]) -> None:
+        """Hand a history write to the writer task."""
+        if self.record:
+            self._queue.put_nowait(write)
+
+    async def _write_history(self) -> None:
+        """Apply queued history writes in order, yielding to request handlers between turns."""
+        while True:
+            write = await self._queue.get()
+            applied = 1
+            try:
+                self._apply(write)
+            finally:
+                self._queue.task_done()
+            while applied < _WRITES_PER_TURN and not self._queue.empty():
+                write = self._queue.get_nowait()
+                applied += 1
+                try:
+                    self._apply(write)
+                finally:
+                    self._queue.task_done()
+            await asyncio.sleep(0)
+
+    @staticmethod
+    def _apply(write: Tuple[str, Any, Optional[Decimal], datetime]) -> None:
+        """Record one queued write in the history, logging rather than raising on failure."""
+        kind, payload, result, timestamp = write
+        try:
+            if kind == 'calculation':
+                HistoryManager.add_calculation(payload, timestamp=timestamp, result=result)
+                return
+            HistoryManager.add_batch(
+                np.array([float(calculation.a) for calculation, _ in payload], dtype=np.float64),
+                np.array([float(calculation.b) for calculation, _ in payload], dtype=np.float64),
+                pd.Categorical([calculation.operation.__name__ for calculation, _ in payload],
+                               categories=OPERATION_NAMES),
+                np.array([float(value) for _, value in payload], dtype=np.float64),
+                timestamp=timestamp
+            )
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.error(f"Error recording server calculations in history: {e}")
+
+
+async def _serve_until_terminated(server: CalculatorServer) -> None:
+    """Serve until cancelled or sent SIGTERM, closing the server either way."""
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    try:
+        await server.serve_forever()
+    except asyncio.CancelledError:
+        logger.info("Calculation server terminated")
+
+
+def run_server(address: Optional[str] = None, path: Optional[str] = None) -> None:
+    """Serve calculations on ``address`` (see ``parse_address``), or on the Unix socket ``path``, until interrupted."""
+    server = CalculatorServer(path=path) if path is not None else CalculatorServer(**parse_address(address))
+    # Save new history rows in the background and keep a commit log if CALCULATOR_AUTOSAVE_* and
+    # CALCULATOR_HISTORY_COMMIT_LOG ask for it
+    HistoryManager.configure_autosave()
+    HistoryManager.configure_commit_log()
+    try:
+        asyncio.run(_serve_until_terminated(server))
+    except KeyboardInterrupt:
+        logger.info("Calculation server interrupted")
+    finally:
+        HistoryManager.stop_autosave()
+        HistoryManager.close_commit_log()
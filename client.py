@@ -0,0 +1,62 @@
+"""Thin client sending one command-line calculation to a running `python main.py daemon`.
+
+Usage: python client.py <number1> <number2> <operation>
+
+Only the standard library is imported, so a calculation costs a bare
+interpreter start and one round trip over the daemon's Unix socket instead
+of importing pandas, NumPy and the rest of the calculator.
+"""
+
+import json
+import os
+import socket
+import sys
+from typing import Any, Dict, List, Optional
+
+
+def default_socket_path() -> str:
+    """Return the daemon socket path: ``CALCULATOR_DAEMON_SOCKET`` or a per-user file in the temp directory."""
+    return os.environ.get('CALCULATOR_DAEMON_SOCKET') or os.path.join(
+        os.environ.get('TMPDIR', '/tmp'), f'calculator-{os.getuid()}.sock'
+    )
+
+
+def request(message: Dict[str, Any], path: Optional[str] = None, timeout: float = 10.0) -> Dict[str, Any]:
+    """Send one request object to the daemon and return its decoded reply."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(path or default_socket_path())
+        sock.sendall(json.dumps(message).encode() + b'\n')
+        with sock.makefile('rb') as replies:
+            line = replies.readline()
+    if not line:
+        raise ConnectionError("the daemon closed the connection without replying")
+    return json.loads(line)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Forward ``<number1> <number2> <operation>`` to the daemon and print the reply.
+
+    Returns:
+        0 on success, 1 if the calculation failed, 2 if the daemon cannot be reached.
+    """
+    args = sys.argv[1:] if argv is None else argv
+    if len(args) != 3:
+        print("Usage: python client.py <number1> <number2> <operation>")
+        return 1
+    a, b, operation = args
+    try:
+        reply = request({'op': 'calculate', 'a': a, 'b': b, 'operation': operation})
+    except OSError as e:
+        print(f"Cannot reach the calculator daemon at {default_socket_path()} ({e}); "
+              f"start it with: python main.py daemon", file=sys.stderr)
+        return 2
+    if 'error' in reply:
+        print(f"Error: {reply['error']}")
+        return 1
+    print(f"The result of {a} {operation} {b} is equal to {reply['result']}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,27 +1,38 @@
+import re
 import sys
-from calculator import Calculator
+from itertools import islice
+from typing import Iterable, Optional, TextIO
 from decimal import Decimal, InvalidOperation
 from calculator.app import App
+from calculator.operations import OPERATIONS
 from calculator.logging_config import get_logger
 
 # Get module logger
 logger = get_logger(__name__)
 
+# Lines evaluated and written out at a time in batch mode
+BATCH_CHUNK_LINES = 10_000
+
+# Batch input fields are separated by commas and/or whitespace
+_FIELD_SEPARATOR = re.compile(r'[,\s]+')
+
+_BATCH_OPERATIONS = {operation.__name__: operation for operation in OPERATIONS}
+
 def calculate_and_print(a, b, operation_name):
-    operation_mappings = {
-        'add': Calculator.add,
-        'subtract': Calculator.subtract,
-        'multiply': Calculator.multiply,
-        'divide': Calculator.divide
-    }
+    """Perform one command-line calculation and print its result.
 
+    The calculation is not recorded in the history: the process exits right
+    after printing, so the history would be discarded unread, and skipping
+    it keeps pandas and NumPy from being imported for a single calculation.
+    """
     # Unified error handling for decimal conversion
     try:
         a_decimal, b_decimal = map(Decimal, [a, b])
-        result = operation_mappings.get(operation_name) # Use get to handle unknown operations
-        if result:
-            print(f"The result of {a} {operation_name} {b} is equal to {result(a_decimal, b_decimal)}")
-            logger.info(f"Command-line calculation: {a} {operation_name} {b} = {result(a_decimal, b_decimal)}")
+        operation = _BATCH_OPERATIONS.get(operation_name) # Use get to handle unknown operations
+        if operation:
+            result = operation(a_decimal, b_decimal)
+            print(f"The result of {a} {operation_name} {b} is equal to {result}")
+            logger.info(f"Command-line calculation: {a} {operation_name} {b} = {result}")
         else:
             print(f"Unknown operation: {operation_name}")
             logger.error(f"Unknown operation in command-line mode: {operation_name}")
@@ -35,12 +46,95 @@ def calculate_and_print(a, b, operation_name):
         print(f"An error occurred: {e}")
         logger.error(f"Unexpected error in command-line mode: {e}", exc_info=True)
 
+def evaluate_line(line: str) -> str:
+    """Evaluate one ``<number1> <number2> <operation>`` batch line and return the output line."""
+    fields = _FIELD_SEPARATOR.split(line.strip())
+    if len(fields) != 3:
+        return f"Error: expected <number1> <number2> <operation>, got {line.strip()!r}"
+    a, b, operation_name = fields
+    operation = _BATCH_OPERATIONS.get(operation_name)
+    if operation is None:
+        return f"Error: unknown operation: {operation_name}"
+    try:
+        return str(operation(Decimal(a), Decimal(b)))
+    except InvalidOperation:
+        return f"Error: invalid number input: {a} or {b}"
+    except ValueError as e:
+        return f"Error: {e}"
+    except ArithmeticError as e:
+        # e.g. decimal.Overflow, whose message is just the signal list
+        return f"Error: arithmetic error: {type(e).__name__}"
+
+def run_batch(lines: Iterable[str], output: TextIO) -> int:
+    """Evaluate a stream of calculation lines, writing one result line for each.
+
+    Lines are read, evaluated and written ``BATCH_CHUNK_LINES`` at a time, so
+    memory stays constant however long the input is. Blank lines and lines
+    starting with ``#`` are skipped. A line that cannot be evaluated produces
+    an ``Error: ...`` line, keeping results aligned with calculation lines.
+    Results are not recorded in the calculation history.
+
+    Args:
+        lines: Input lines, e.g. an open file or ``sys.stdin``.
+        output: Stream the results are written to.
+
+    Returns:
+        The number of lines that could not be evaluated.
+    """
+    lines = iter(lines)
+    evaluated = errors = 0
+    while True:
+        chunk = list(islice(lines, BATCH_CHUNK_LINES))
+        if not chunk:
+            break
+        results = [evaluate_line(line) for line in chunk if line.strip() and not line.lstrip().startswith('#')]
+        if results:
+            output.write('\n'.join(results))
+            output.write('\n')
+        evaluated += len(results)
+        errors += sum(result.startswith('Error:') for result in results)
+    output.flush()
+    logger.info(f"Batch mode evaluated {evaluated} lines with {errors} errors")
+    return errors
+
+def start_batch(source: str):
+    """Run batch mode over a file, or standard input if ``source`` is ``-``, exiting with 1 on errors."""
+    logger.info(f"Starting in batch mode reading from {source}")
+    if source == '-':
+        errors = run_batch(sys.stdin, sys.stdout)
+    else:
+        try:
+            with open(source, buffering=1 << 20) as f:
+                errors = run_batch(f, sys.stdout)
+        except OSError as e:
+            print(f"Cannot read batch input {source}: {e}")
+            logger.error(f"Cannot read batch input {source}: {e}")
+            sys.exit(1)
+    if errors:
+        sys.exit(1)
+
+def start_server(address: Optional[str]):
+    """Run server mode on ``address`` (see ``calculator.server.parse_address``), exiting with 1 if it is invalid."""
+    logger.info("Starting in server mode")
+    # Imported here so the other modes do not pay for asyncio
+    from calculator.server import parse_address, run_server
+    try:
+        parse_address(address)
+    except ValueError as e:
+        print(f"Invalid server address: {e}")
+        logger.error(f"Invalid server address: {e}")
+        sys.exit(1)
+    run_server(address)
+
 def main():
     """Main entry point for the calculator application.
     
-    Supports two modes of operation:
+    Supports five modes of operation:
     1. Command line mode: python main.py <number1> <number2> <operation>
     2. Interactive mode: python main.py interactive
+    3. Batch mode: python main.py --batch [file|-]
+    4. Server mode: python main.py serve [host:port|host|port|socket path]
+    5. Daemon mode: python main.py daemon [socket path], answering client.py
     
     If no arguments are provided, defaults to interactive mode.
     """
@@ -60,6 +154,25 @@ def main():
         app.start()
         return
     
+    # Check if running in batch mode
+    if len(sys.argv) in (2, 3) and sys.argv[1] == '--batch':
+        start_batch(sys.argv[2] if len(sys.argv) == 3 else '-')
+        return
+    
+    # Check if running in server mode
+    if len(sys.argv) in (2, 3) and sys.argv[1] == 'serve':
+        start_server(sys.argv[2] if len(sys.argv) == 3 else None)
+        return
+    
+    # Check if running in daemon mode, serving client.py on a Unix socket
+    if len(sys.argv) in (2, 3) and sys.argv[1] == 'daemon':
+        from calculator.server import run_server
+        from client import default_socket_path
+        path = sys.argv[2] if len(sys.argv) == 3 else default_socket_path()
+        logger.info(f"Starting in daemon mode on {path}")
+        run_server(path=path)
+        return
+    
     # Check if running in command-line mode
     if len(sys.argv) == 4:
         logger.info("Starting in command-line mode")
@@ -71,9 +184,12 @@ def main():
     print("Usage:")
     print("  Interactive mode: python main.py interactive")
     print("  Command line mode: python main.py <number1> <number2> <operation>")
+    print("  Batch mode: python main.py --batch [file|-]")
+    print("  Server mode: python main.py serve [host:port|host|port|socket path]")
+    print("  Daemon mode: python main.py daemon [socket path], then python client.py <number1> <number2> <operation>")
     print("\nAvailable operations: add, subtract, multiply, divide")
     logger.error(f"Invalid command-line arguments: {sys.argv[1:]}")
     sys.exit(1)
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
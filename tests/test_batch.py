@@ -0,0 +1,97 @@
+"""Tests for vectorized and exact batch evaluation."""
+
+from decimal import Context, Decimal, ROUND_DOWN, ROUND_HALF_UP
+import numpy as np
+import pandas as pd
+import pytest
+from calculator import Calculator
+from calculator.batch import evaluate, evaluate_decimal, operation_codes
+from calculator.history import HistoryManager
+from calculator.operations import divide
+
+
+@pytest.fixture
+def clear_history():
+    """Fixture to clear history before and after each test."""
+    HistoryManager.clear_history()
+    yield
+    HistoryManager.clear_history()
+
+
+def test_operation_codes_from_names_functions_and_codes():
+    """Test the accepted ways of naming operations."""
+    assert operation_codes('multiply', 2).tolist() == [2, 2]
+    assert operation_codes(divide, 1).tolist() == [3]
+    assert operation_codes(pd.Series(['add', 'divide', 'add']), 3).tolist() == [0, 3, 0]
+    assert operation_codes(np.array([1, 0]), 2).tolist() == [1, 0]
+    with pytest.raises(ValueError):
+        operation_codes(['add', 'power'], 2)
+    with pytest.raises(ValueError):
+        operation_codes(np.array([4]), 1)
+    with pytest.raises(ValueError):
+        operation_codes(['add'], 2)
+
+
+def test_evaluate_masks_division_by_zero():
+    """Test that mixed operations are computed and zero divisors are masked."""
+    a = np.array([6.0, 6.0, 6.0, 6.0, 6.0])
+    b = np.array([3.0, 3.0, 3.0, 3.0, 0.0])
+    results, valid = evaluate(a, b, np.array([0, 1, 2, 3, 3], dtype=np.int8))
+
+    assert results[:4].tolist() == [9.0, 3.0, 18.0, 2.0]
+    assert np.isnan(results[4])
+    assert valid.tolist() == [True, True, True, True, False]
+
+
+@pytest.mark.usefixtures("clear_history")
+def test_evaluate_batch_records_valid_rows():
+    """Test that a batch is recorded in history with one bulk append."""
+    HistoryManager.get_statistics()  # Make sure the running statistics are live
+    results = Calculator.evaluate_batch(pd.Series([1, 8, 5]), [2, 0, 5], ['add', 'divide', 'multiply'])
+
+    assert results[0] == 3.0 and np.isnan(results[1]) and results[2] == 25.0
+    history = HistoryManager.get_history()
+    assert history['operation'].tolist() == ['add', 'multiply']
+    assert history['result'].tolist() == [3.0, 25.0]
+    assert HistoryManager.get_statistics()['overall']['count'] == 2
+    assert HistoryManager.find_by_operation('multiply').index.tolist() == [1]
+
+
+@pytest.mark.usefixtures("clear_history")
+def test_evaluate_batch_without_recording():
+    """Test evaluating a batch without touching the history."""
+    results = Calculator.evaluate_batch(np.arange(3.0), np.ones(3), 'subtract', record=False)
+
+    assert results.tolist() == [-1.0, 0.0, 1.0]
+    assert HistoryManager.get_history().empty
+    with pytest.raises(ValueError):
+        Calculator.evaluate_batch([1.0, 2.0], [1.0], 'add')
+
+
+def test_evaluate_decimal_is_exact_and_ordered():
+    """Test that chunks evaluated in worker processes come back exact and in order."""
+    a = [Decimal('0.1')] * 5 + ['1', 7]
+    b = [Decimal('0.2')] * 5 + ['3', 0]
+    ops = ['add'] * 5 + ['divide', 'divide']
+    results = evaluate_decimal(a, b, ops, workers=2, chunk_rows=2)
+
+    assert results[:5] == [Decimal('0.3')] * 5
+    assert results[5] == Decimal(1) / Decimal(3)
+    assert results[6].is_nan()
+
+
+def test_evaluate_decimal_uses_given_context():
+    """Test that precision and rounding come from the supplied context."""
+    context = Context(prec=3, rounding=ROUND_DOWN)
+    assert evaluate_decimal(['2'], ['3'], 'divide', context=context) == [Decimal('0.666')]
+    assert evaluate_decimal(['2'], ['3'], 'divide', context=Context(prec=3, rounding=ROUND_HALF_UP)) == [Decimal('0.667')]
+
+
+@pytest.mark.usefixtures("clear_history")
+def test_evaluate_decimal_batch_records_valid_rows():
+    """Test that an exact batch is recorded without its divisions by zero."""
+    results = Calculator.evaluate_decimal_batch(['1.5', '4'], ['2', '0'], divide)
+
+    assert results[0] == Decimal('0.75')
+    assert results[1].is_nan()
+    assert HistoryManager.get_history()['result'].tolist() == [0.75]
@@ -3,9 +3,12 @@
 from decimal import Decimal
 import pytest
 
+from calculator import Calculator
 from calculator.calculations import Calculations
+from calculator.calculation_store import CalculationHistory
 from calculator.calculation import Calculation
-from calculator.operations import add
+from calculator.history import HistoryManager
+from calculator.operations import add, multiply, divide
 
 @pytest.fixture(autouse=True)
 def setup_method():
@@ -56,3 +59,137 @@ def test_add_calculation_with_zero():
     calc = Calculation(Decimal('0'), Decimal('0'), add)
     Calculations.add_calculation(calc)
     assert Calculations.get_latest() == calc, "Latest calculation should be with zero values"
+
+def test_find_by_operation_uses_index():
+    """Test the Calculations posting lists across adds and clears."""
+    first = Calculation(Decimal('1'), Decimal('2'), add)
+    second = Calculation(Decimal('3'), Decimal('4'), multiply)
+    third = Calculation(Decimal('5'), Decimal('6'), add)
+    for calc in (first, second, third):
+        Calculations.add_calculation(calc)
+
+    assert Calculations.find_by_operation('add') == [first, third]
+    Calculations.clear_history()
+    assert Calculations.find_by_operation('add') == []
+
+def test_history_round_trips_exact_operands():
+    """Test that calculations come back from the history rows with exactly the original operands."""
+    custom = lambda a, b: a % b  # pylint: disable=unnecessary-lambda-assignment
+    custom.__name__ = 'modulo'
+    stored = [
+        Calculation(Decimal('1.50'), Decimal('-2'), add),
+        Calculation(Decimal('1e-30'), Decimal('123456789012345678901234567890'), multiply),
+        Calculation(Decimal('-0'), Decimal('4'), add),
+        Calculation(3, 4.5, add),
+        Calculation(Decimal('2.5'), Decimal('0.1'), multiply),
+        Calculation(Decimal('7'), Decimal('3'), custom)
+    ]
+    for calc in stored:
+        Calculations.add_calculation(calc)
+    history = Calculations.get_history()
+
+    assert isinstance(history, CalculationHistory)
+    assert len(history) == 6
+    for view, calc in zip(history, stored):
+        assert repr(view.a) == repr(calc.a) and repr(view.b) == repr(calc.b)
+        assert view.operation is calc.operation
+    assert Calculations.get_latest() is stored[-1]
+    assert str(Calculations.get_latest().perform()) == '1'
+    assert [repr(calc) for calc in Calculations.find_by_operation('add')] == [
+        'Calculation(1.50, -2, add)', 'Calculation(-0, 4, add)', 'Calculation(3, 4.5, add)'
+    ]
+    assert history[0].operation_code == 0  # pylint: disable=no-member
+    assert history[-2] == stored[4]
+    assert history[1:3] == stored[1:3]
+    # Only the operands that float64 cannot rebuild are kept as objects; custom operations are found by name
+    assert sorted(HistoryManager._exact_operands) == [0, 1, 3]
+
+def test_calculations_and_history_manager_share_rows():
+    """Test that each calculation is recorded once and seen through both APIs."""
+    Calculator.add(Decimal('2'), Decimal('3'))
+    Calculator.evaluate_batch([4.0, 6.0], [2.0, 3.0], 'divide')
+
+    assert len(HistoryManager.get_history()) == 3
+    assert [repr(calc) for calc in Calculations.get_history()] == [
+        'Calculation(2, 3, add)', 'Calculation(4, 2, divide)', 'Calculation(6, 3, divide)'
+    ]
+    assert Calculations.get_latest() == Calculation(Decimal('6'), Decimal('3'), divide)
+    HistoryManager.clear_history()
+    assert len(Calculations.get_history()) == 0
+    assert Calculations.get_latest() is None
+
+def test_calculations_over_bounded_history(tmp_path):
+    """Test that calculations spilled to disk by the history store are still readable."""
+    HistoryManager.configure_storage('memory', str(tmp_path), max_rows=2)
+    try:
+        stored = [Calculation(Decimal(i) / 4, Decimal(i), add) for i in range(6)]
+        for calc in stored:
+            Calculations.add_calculation(calc)
+
+        assert HistoryManager._history.spilled_rows > 0
+        assert list(Calculations.get_history()) == stored
+        assert repr(Calculations.get_history()[1]) == 'Calculation(0.25, 1, add)'
+        assert Calculations.get_latest() is stored[-1]
+    finally:
+        HistoryManager.configure_storage('memory', max_rows=0)
+
+def test_calculation_has_no_instance_dict():
+    """Test that Calculation objects are slotted."""
+    calc = Calculation(Decimal('1'), Decimal('2'), add)
+    assert not hasattr(calc, '__dict__')
+    with pytest.raises(AttributeError):
+        calc.extra = 1  # pylint: disable=assigning-non-slot
+
+def test_add_calculation_defers_errors():
+    """Test that a calculation that cannot be performed is still added, as it was to the list."""
+    calc = Calculation(Decimal('1'), Decimal('0'), divide)
+    Calculations.add_calculation(calc)
+
+    assert Calculations.get_history() == [calc]
+    assert Calculations.get_latest() is calc
+    with pytest.raises(ValueError):
+        Calculations.get_latest().perform()
+    assert HistoryManager.get_statistics()['overall']['count'] == 1
+
+def test_history_behaves_like_a_list():
+    """Test equality with lists and the list edits the history supported before it became a view."""
+    first, second, third, fourth = [Calculation(Decimal(i), Decimal('2'), add) for i in range(4)]
+    history = Calculations.get_history()
+    history.append(first)
+    Calculations.add_calculation(second)
+    history.extend([third])
+
+    assert history == [first, second, third]
+    assert [first, second, third] == history
+    assert history != [first, second]
+    assert repr(history) == repr([first, second, third])
+    assert second in history and history.index(third) == 2 and history.count(first) == 1
+
+    assert history.pop() == third
+    history.remove(first)
+    assert history == [second]
+    history.insert(0, fourth)
+    history[1] = third
+    assert history == [fourth, third]
+    history += [first]
+    del history[0]
+    assert history == [third, first]
+    assert Calculations.get_latest() is first
+    assert HistoryManager.get_history()['a'].tolist() == [2.0, 0.0]
+    history[:] = []
+    assert not history and not HistoryManager.get_statistics()
+
+def test_history_edits_keep_other_rows():
+    """Test that deleting or inserting keeps the timestamps, results and exact operands of other rows."""
+    stored = [Calculation(Decimal(f'{i}.50'), Decimal('2'), multiply) for i in range(5)]
+    for calc in stored:
+        Calculations.add_calculation(calc)
+    timestamps = HistoryManager.get_history()['timestamp'].tolist()
+
+    del Calculations.get_history()[1:4:2]
+    assert Calculations.get_history() == [stored[0], stored[2], stored[4]]
+    assert HistoryManager.get_history()['timestamp'].tolist() == [timestamps[0], timestamps[2], timestamps[4]]
+    assert repr(Calculations.get_history()[1].a) == "Decimal('2.50')"  # pylint: disable=no-member
+    assert HistoryManager.find_by_operation('multiply')['result'].tolist() == [1.0, 5.0, 9.0]
+    with pytest.raises(IndexError):
+        Calculations.get_history()[3] = stored[0]
@@ -0,0 +1,76 @@
+"""Tests for the stdlib-only daemon client."""
+
+import asyncio
+import os
+import subprocess
+import sys
+import threading
+from unittest.mock import patch
+import pytest
+import client
+from calculator.server import CalculatorServer
+
+
+@pytest.fixture
+def daemon(tmp_path, monkeypatch):
+    """Fixture running a Unix socket server in a background event loop."""
+    path = str(tmp_path / "daemon.sock")
+    monkeypatch.setenv('CALCULATOR_DAEMON_SOCKET', path)
+    server = CalculatorServer(path=path, record=False)
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+
+    def run():
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(server.start())
+        started.set()
+        loop.run_forever()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    assert started.wait(5)
+    yield path
+    asyncio.run_coroutine_threadsafe(server.close(), loop).result(5)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(5)
+    loop.close()
+    assert not os.path.exists(path)
+
+
+def test_client_prints_result(daemon, capsys):
+    """Test that the client forwards argv and prints the daemon's result."""
+    assert client.main(['10', '4', 'subtract']) == 0
+    assert capsys.readouterr().out == "The result of 10 subtract 4 is equal to 6\n"
+    assert oct(os.stat(daemon).st_mode & 0o777) == oct(0o600)
+
+
+def test_client_reports_errors(daemon, capsys):
+    """Test the exit code and message for a failed calculation and for bad usage."""
+    assert client.main(['1', '0', 'divide']) == 1
+    assert capsys.readouterr().out == "Error: Cannot divide by zero\n"
+    assert client.main(['1', '2']) == 1
+
+
+def test_client_without_daemon(tmp_path, monkeypatch, capsys):
+    """Test that the client exits with 2 when no daemon is listening."""
+    monkeypatch.setenv('CALCULATOR_DAEMON_SOCKET', str(tmp_path / "missing.sock"))
+    assert client.main(['1', '2', 'add']) == 2
+    assert "python main.py daemon" in capsys.readouterr().err
+
+
+def test_client_does_not_import_pandas():
+    """Test that importing and running the client stays within the standard library."""
+    code = "import sys, client; print(sorted({'pandas', 'numpy', 'calculator'} & set(sys.modules)))"
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run([sys.executable, '-c', code], cwd=root, capture_output=True, text=True, check=True)
+    assert output.stdout.strip() == '[]'
+
+
+def test_daemon_mode_runs_server_on_socket(monkeypatch):
+    """Test that `main.py daemon` serves on the default client socket."""
+    import main
+
+    monkeypatch.setenv('CALCULATOR_DAEMON_SOCKET', '/tmp/test-daemon.sock')
+    with patch.object(sys, 'argv', ['main.py', 'daemon']), patch('calculator.server.run_server') as mock_run:
+        main.main()
+    mock_run.assert_called_once_with(path='/tmp/test-daemon.sock')
@@ -78,6 +78,7 @@ Advanced Features:
 statistics - View statistical analysis of calculations
 export_excel - Export calculation history to Excel
 filter_history - Filter calculation history
+evaluate - Evaluate an expression such as (2 + 3) * 4 / x
 
 Application Control:
 menu - Show this menu
@@ -0,0 +1,86 @@
+"""Tests for the compiled expression evaluator."""
+
+from decimal import Decimal
+import numpy as np
+import pandas as pd
+import pytest
+from calculator.app.plugins.evaluate import EvaluateCommand
+from calculator.expression import ExpressionError, compile_expression, evaluate_expression
+from calculator.operations import divide
+
+
+@pytest.mark.parametrize("source, value", [
+    ("(2 + 3) * 4", Decimal('20')),
+    ("2 + 3 * 4", Decimal('14')),
+    ("10 - 4 - 3", Decimal('3')),
+    ("-(2 + 3) * -2", Decimal('10')),
+    ("0.1 + 0.2", Decimal('0.3')),
+    ("1 / 4", Decimal('0.25')),
+    ("1.5e2 / +3", Decimal('50')),
+])
+def test_evaluate_constants_exactly(source, value):
+    """Test operator precedence, signs and exact Decimal arithmetic."""
+    assert evaluate_expression(source) == value
+
+
+def test_compiled_expression_reused_across_bindings():
+    """Test that one compiled expression serves many bindings and is cached."""
+    expression = compile_expression("(2 + 3) * 4 / x")
+
+    assert compile_expression("(2 + 3) * 4 / x") is expression
+    assert expression.variables == frozenset({'x'})
+    assert expression(x=2) == Decimal('10')
+    assert expression({'x': '0.5'}) == Decimal('40')
+    assert compile_expression.cache_info().hits >= 1
+
+
+def test_evaluate_over_arrays():
+    """Test element-wise evaluation over NumPy arrays and pandas Series."""
+    expression = compile_expression("a * b - 1")
+    result = expression(a=np.array([1.0, 2.0, 3.0]), b=pd.Series([2, 2, 2]))
+
+    assert result.tolist() == [1.0, 3.0, 5.0]
+    assert compile_expression("x / 2")(x=[1, 3]).tolist() == [0.5, 1.5]
+
+
+def test_division_by_zero_with_scalars_and_arrays():
+    """Test that scalar zero divisors raise while array ones are masked as NaN, like evaluate_batch."""
+    with pytest.raises(ValueError, match="Cannot divide by zero"):
+        evaluate_expression("1 / (x - 1)", x=1)
+    result = evaluate_expression("(x + 1) / x * 2", x=np.array([1.0, 0.0, 4.0]))
+    assert np.isnan(result[1])
+    assert result[[0, 2]].tolist() == [4.0, 2.5]
+    assert np.isnan(evaluate_expression("x / 0", x=[1, 2])).all()
+    with pytest.raises(ValueError, match="Cannot divide by zero"):
+        divide(np.array([1.0, 0.0]), np.array([0.0, 2.0]))
+
+
+@pytest.mark.parametrize("source", ["", "2 +", "(1 + 2", "2 ^ 3", "1 2", ")"])
+def test_malformed_expressions(source):
+    """Test that malformed expressions raise ExpressionError."""
+    with pytest.raises(ExpressionError):
+        compile_expression(source)
+
+
+def test_missing_and_invalid_bindings():
+    """Test errors for missing or non-numeric variable values."""
+    with pytest.raises(ExpressionError, match="Missing value for y"):
+        evaluate_expression("x + y", x=1)
+    with pytest.raises(ExpressionError):
+        evaluate_expression("x + 1", x="abc")
+
+
+def test_evaluate_command(monkeypatch, capsys):
+    """Test the evaluate plugin command prompts for each variable."""
+    inputs = iter(["(a + b) * 2", "1.5", "2"])
+    monkeypatch.setattr('builtins.input', lambda _: next(inputs))
+    EvaluateCommand().execute()
+    assert "Result: 7.0" in capsys.readouterr().out
+
+    inputs = iter(["1 +"])
+    EvaluateCommand().execute()
+    assert "Invalid expression" in capsys.readouterr().out
+
+    inputs = iter(["x * x", "9e999999"])
+    EvaluateCommand().execute()
+    assert "Error: arithmetic error: Overflow" in capsys.readouterr().out
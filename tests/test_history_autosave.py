@@ -0,0 +1,168 @@
+"""Tests for the background history autosave worker."""
+
+import os
+import threading
+import time
+from decimal import Decimal
+from unittest.mock import patch
+import pandas as pd
+import pytest
+from calculator.calculation import Calculation
+from calculator.operations import add
+from calculator.history import HistoryManager
+from calculator.history.autosave import AutosaveWorker
+
+
+@pytest.fixture(autouse=True)
+def clean_history():
+    """Fixture leaving no worker, thread-safe mode or rows behind."""
+    HistoryManager.clear_history()
+    yield
+    HistoryManager.stop_autosave()
+    HistoryManager.configure_concurrency(False)
+    HistoryManager.clear_history()
+
+
+def _wait_for(condition, timeout=5.0):
+    """Poll ``condition`` until it holds or ``timeout`` seconds pass."""
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_worker_saves_at_row_threshold_and_on_stop():
+    """Test that the worker saves once enough rows are added, and once more when stopped."""
+    saved = threading.Event()
+    calls = []
+
+    def save():
+        calls.append(threading.current_thread().name)
+        saved.set()
+        return 0
+
+    worker = AutosaveWorker(save, rows=3)
+    worker.start()
+    worker.notify()
+    worker.notify()
+    time.sleep(0.05)
+    assert not calls
+    worker.notify()
+    assert saved.wait(5)
+    worker.stop()
+
+    assert calls == ['history-autosave', threading.current_thread().name]
+    assert not worker.running
+
+
+def test_worker_requires_a_trigger():
+    """Test that a worker with neither interval nor row threshold is rejected."""
+    with pytest.raises(ValueError):
+        AutosaveWorker(lambda: 0)
+
+
+def test_autosave_history_appends_only_new_rows(tmp_path):
+    """Test that repeated autosaves append just the rows added in between."""
+    path = str(tmp_path / "history.csv")
+    HistoryManager.add_calculation(Calculation(Decimal('1'), Decimal('2'), add))
+    HistoryManager.add_calculation(Calculation(Decimal('3'), Decimal('4'), add))
+
+    assert HistoryManager.autosave_history(path) == 2
+    assert HistoryManager.autosave_history(path) == 0
+    HistoryManager.add_calculation(Calculation(Decimal('5'), Decimal('6'), add))
+    assert HistoryManager.autosave_history(path) == 1
+
+    saved = pd.read_csv(path)
+    assert saved['result'].tolist() == [3.0, 7.0, 11.0]
+    HistoryManager.clear_history()
+    # After a clear the file no longer matches, so it is rewritten
+    assert HistoryManager.autosave_history(path) == 0
+    assert len(pd.read_csv(path)) == 0
+
+
+def test_autosave_rewrite_never_truncates_the_file(tmp_path):
+    """Test that a full rewrite that fails midway leaves the previous file whole and no temporary file."""
+    path = str(tmp_path / "history.csv")
+    HistoryManager.add_calculation(Calculation(Decimal('1'), Decimal('2'), add))
+    assert HistoryManager.autosave_history(path) == 1
+    HistoryManager.clear_history()
+    HistoryManager.add_calculation(Calculation(Decimal('3'), Decimal('4'), add))
+
+    def crash(df, target, fmt):
+        with open(target, 'w') as f:
+            f.write("timestamp,a")
+        raise OSError("disk full")
+
+    with patch('calculator.history.storage.write_history', crash):
+        with pytest.raises(OSError):
+            HistoryManager.autosave_history(path)
+
+    assert pd.read_csv(path)['result'].tolist() == [3.0]
+    assert os.listdir(tmp_path) == ["history.csv"]
+    assert HistoryManager.autosave_history(path) == 1
+    assert pd.read_csv(path)['result'].tolist() == [7.0]
+
+
+def test_configure_autosave_flushes_on_timer_and_stop(tmp_path):
+    """Test the timer-driven worker and the final save when autosave stops."""
+    path = tmp_path / "history.csv"
+    assert HistoryManager.configure_autosave(interval=0.05, rows=0, file_path=str(path))
+    HistoryManager.add_calculation(Calculation(Decimal('1'), Decimal('1'), add))
+
+    assert _wait_for(lambda: path.exists() and len(pd.read_csv(path)) == 1)
+    for i in range(3):
+        HistoryManager.add_calculation(Calculation(Decimal(i), Decimal('1'), add))
+    HistoryManager.stop_autosave()
+
+    assert pd.read_csv(path)['a'].tolist() == [1.0, 0.0, 1.0, 2.0]
+    assert not HistoryManager.configure_autosave(interval=0, rows=0)
+
+
+def _seed_history_file(path):
+    """Write a two-row history file as an earlier session would have left it."""
+    HistoryManager.add_calculation(Calculation(Decimal('1'), Decimal('1'), add))
+    HistoryManager.add_calculation(Calculation(Decimal('2'), Decimal('2'), add))
+    HistoryManager.save_history(str(path))
+    HistoryManager.clear_history()
+    # A new session knows nothing about the file until it loads it
+    HistoryManager._journal_state.pop(str(path), None)
+
+
+def test_autosave_keeps_rows_of_unloaded_file(tmp_path):
+    """Test that autosave appends to a history file it never loaded instead of replacing it."""
+    path = tmp_path / "history.csv"
+    _seed_history_file(path)
+
+    assert HistoryManager.configure_autosave(interval=0, rows=1, file_path=str(path))
+    HistoryManager.add_calculation(Calculation(Decimal('3'), Decimal('3'), add))
+    HistoryManager.stop_autosave()
+
+    assert pd.read_csv(path)['result'].tolist() == [2.0, 4.0, 6.0]
+
+
+def test_adopted_rows_survive_rewrites(tmp_path):
+    """Test that a clear or a journal compaction rewrites only the rows of this session."""
+    path = tmp_path / "history.csv"
+    _seed_history_file(path)
+    HistoryManager.add_calculation(Calculation(Decimal('3'), Decimal('3'), add))
+    assert HistoryManager.autosave_history(str(path)) == 1
+
+    HistoryManager.clear_history()
+    HistoryManager.add_calculation(Calculation(Decimal('4'), Decimal('4'), add))
+    assert HistoryManager.autosave_history(str(path)) == 1
+    assert pd.read_csv(path)['result'].tolist() == [2.0, 4.0, 8.0]
+
+    HistoryManager.clear_history()
+    HistoryManager.save_history(str(path), journal=True)
+    assert pd.read_csv(path)['result'].tolist() == [2.0, 4.0]
+
+
+def test_autosave_refuses_foreign_files(tmp_path):
+    """Test that autosave leaves an existing file alone unless it is a complete history CSV file."""
+    path = tmp_path / "history.csv"
+    path.write_text("name,value\nx,1\n")
+    HistoryManager.add_calculation(Calculation(Decimal('1'), Decimal('1'), add))
+
+    with pytest.raises(ValueError, match="not a history CSV file"):
+        HistoryManager.autosave_history(str(path))
+    assert path.read_text() == "name,value\nx,1\n"
@@ -0,0 +1,89 @@
+"""Tests for the HistoryBuffer columnar append buffer."""
+
+from datetime import datetime
+import pandas as pd
+from calculator.history.buffer import HistoryBuffer, HISTORY_COLUMNS
+
+
+def test_append_grows_capacity_by_doubling():
+    """Test that appending past capacity doubles the column arrays."""
+    buffer = HistoryBuffer(capacity=2)
+    for i in range(5):
+        buffer.append(datetime.now(), float(i), 1.0, 'add', float(i + 1))
+
+    assert len(buffer) == 5
+    assert buffer.capacity == 8
+    assert buffer.to_dataframe()['a'].tolist() == [0.0, 1.0, 2.0, 3.0, 4.0]
+
+
+def test_to_dataframe_is_cached_until_next_write():
+    """Test that the DataFrame view is reused until the buffer changes."""
+    buffer = HistoryBuffer()
+    buffer.append(datetime.now(), 1.0, 2.0, 'add', 3.0)
+
+    first = buffer.to_dataframe()
+    assert buffer.to_dataframe() is first
+
+    buffer.append(datetime.now(), 2.0, 2.0, 'multiply', 4.0)
+    second = buffer.to_dataframe()
+    assert second is not first
+    assert len(first) == 1
+    assert len(second) == 2
+
+
+def test_empty_buffer_dataframe_has_history_columns():
+    """Test that an empty buffer still produces the history columns."""
+    df = HistoryBuffer().to_dataframe()
+    assert df.empty
+    assert list(df.columns) == HISTORY_COLUMNS
+    assert pd.api.types.is_datetime64_any_dtype(df['timestamp'])
+
+
+def test_extend_and_latest():
+    """Test bulk extending from a DataFrame and reading the latest row."""
+    source = pd.DataFrame({
+        'timestamp': ['2025-01-01 10:00:00', '2025-01-02 11:00:00'],
+        'a': [1, 4],
+        'b': [2, 2],
+        'operation': ['add', 'divide'],
+        'result': [3, 2]
+    })
+    buffer = HistoryBuffer(capacity=1)
+    buffer.extend(source)
+
+    latest = buffer.latest()
+    assert len(buffer) == 2
+    assert latest['operation'] == 'divide'
+    assert latest['result'] == 2.0
+    assert latest['timestamp'] == pd.Timestamp('2025-01-02 11:00:00')
+
+
+def test_clear_resets_buffer():
+    """Test that clearing empties the buffer and drops the cached view."""
+    buffer = HistoryBuffer(capacity=1)
+    buffer.append(datetime.now(), 1.0, 2.0, 'add', 3.0)
+    buffer.append(datetime.now(), 1.0, 2.0, 'add', 3.0)
+    buffer.clear()
+
+    assert len(buffer) == 0
+    assert buffer.latest() is None
+    assert buffer.to_dataframe().empty
+    assert buffer.capacity == 1
+
+
+def test_time_sorted_flag_tracks_append_order():
+    """Test that the buffer notices timestamps arriving out of order."""
+    buffer = HistoryBuffer()
+    buffer.append(datetime(2025, 1, 1), 1.0, 1.0, 'add', 2.0)
+    buffer.append(datetime(2025, 1, 1), 1.0, 1.0, 'add', 2.0)
+    buffer.extend(pd.DataFrame({
+        'timestamp': ['2025-01-02', '2025-01-03'],
+        'a': [1.0, 1.0], 'b': [1.0, 1.0], 'operation': ['add', 'add'], 'result': [2.0, 2.0]
+    }))
+    assert buffer.time_sorted
+    assert buffer.column('timestamp')[-1] == pd.Timestamp('2025-01-03').to_datetime64()
+
+    buffer.append(datetime(2024, 12, 31), 1.0, 1.0, 'add', 2.0)
+    assert not buffer.time_sorted
+    buffer.clear()
+    assert buffer.time_sorted
@@ -0,0 +1,100 @@
+"""Tests for the thread-safe HistoryManager mode with per-thread append buffers."""
+
+import threading
+from decimal import Decimal
+import pytest
+from calculator.calculation import Calculation
+from calculator.calculations import Calculations
+from calculator.operations import add, multiply
+from calculator.history import HistoryManager
+
+
+@pytest.fixture
+def thread_safe_history():
+    """Fixture enabling thread-safe mode with small buffers on an empty history."""
+    HistoryManager.clear_history()
+    HistoryManager.configure_concurrency(True, buffer_rows=16)
+    yield
+    HistoryManager.configure_concurrency(False)
+    HistoryManager.clear_history()
+
+
+@pytest.mark.usefixtures("thread_safe_history")
+def test_concurrent_adds_lose_no_rows():
+    """Test that rows added from many threads all arrive, in per-thread order."""
+    threads, per_thread = 8, 250
+
+    def worker(thread_number):
+        for i in range(per_thread):
+            HistoryManager.add_calculation(Calculation(Decimal(thread_number), Decimal(i), add))
+
+    workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+
+    history = HistoryManager.get_history()
+    assert len(history) == threads * per_thread
+    for n in range(threads):
+        assert history.loc[history['a'] == n, 'b'].tolist() == [float(i) for i in range(per_thread)]
+    assert HistoryManager.get_statistics()['overall']['count'] == threads * per_thread
+    assert HistoryManager.get_operation_frequency()['add'] == threads * per_thread
+
+
+@pytest.mark.usefixtures("thread_safe_history")
+def test_reads_see_pending_rows_of_other_threads():
+    """Test that a read merges rows still buffered by another thread."""
+    calc = Calculation(Decimal('1.50'), Decimal('2'), multiply)
+    thread = threading.Thread(target=HistoryManager.add_calculation, args=(calc,))
+    thread.start()
+    thread.join()
+
+    assert HistoryManager._thread_buffers and not HistoryManager._history
+    assert HistoryManager.get_latest()['result'] == 3.0
+    assert Calculations.get_latest() is calc
+    assert repr(Calculations.get_history()[0]) == 'Calculation(1.50, 2, multiply)'
+    # The finished thread's empty buffer is forgotten on the next merge
+    HistoryManager.get_history()
+    assert thread not in [owner for owner, _ in HistoryManager._thread_buffers]
+
+
+@pytest.mark.usefixtures("thread_safe_history")
+def test_reader_sees_consistent_snapshots():
+    """Test that statistics and row counts agree while writers are running."""
+    stop = threading.Event()
+    mismatches = []
+
+    def writer():
+        while not stop.is_set():
+            HistoryManager.add_calculation(Calculation(Decimal('2'), Decimal('3'), add))
+
+    def reader():
+        for _ in range(50):
+            with HistoryManager._lock:
+                stats = HistoryManager.get_statistics()
+                rows = len(HistoryManager.get_history())
+            if stats and stats['overall']['count'] != rows:
+                mismatches.append((stats['overall']['count'], rows))
+
+    writers = [threading.Thread(target=writer) for _ in range(4)]
+    for thread in writers:
+        thread.start()
+    reader()
+    stop.set()
+    for thread in writers:
+        thread.join()
+
+    assert not mismatches
+    assert HistoryManager.get_statistics()['overall']['count'] == len(HistoryManager.get_history())
+
+
+def test_clear_drops_buffered_rows():
+    """Test that clearing in thread-safe mode also discards rows not merged yet."""
+    HistoryManager.configure_concurrency(True, buffer_rows=100)
+    try:
+        HistoryManager.add_calculation(Calculation(Decimal('1'), Decimal('1'), add))
+        HistoryManager.clear_history()
+        assert len(HistoryManager.get_history()) == 0
+    finally:
+        HistoryManager.configure_concurrency(False)
@@ -0,0 +1,95 @@
+"""Tests for the group-commit writer and the HistoryManager commit log."""
+
+import threading
+from decimal import Decimal
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+import pytest
+from calculator.calculation import Calculation
+from calculator.operations import add, multiply
+from calculator.history import HistoryManager
+from calculator.history.group_commit import GroupCommitWriter
+
+
+def test_concurrent_records_share_commits(tmp_path):
+    """Test that records from many threads are all written with fewer fsyncs than records."""
+    path = tmp_path / "log.txt"
+    writer = GroupCommitWriter(str(path), max_latency=0.01, header=b'header\n')
+    futures = []
+
+    def submit(thread_number):
+        futures.extend(writer.submit(f"{thread_number},{i}\n".encode()) for i in range(100))
+
+    with patch('calculator.history.group_commit.os.fsync', wraps=__import__('os').fsync) as fsync:
+        threads = [threading.Thread(target=submit, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for future in futures:
+            future.result(timeout=5)
+        writer.close()
+
+    lines = path.read_text().splitlines()
+    assert lines[0] == 'header'
+    assert sorted(lines[1:]) == sorted(f"{n},{i}" for n in range(8) for i in range(100))
+    assert writer.records == 800
+    assert fsync.call_count == writer.commits < 800
+
+
+def test_failed_commit_fails_its_futures(tmp_path):
+    """Test that an fsync error is reported through the futures of the batch."""
+    writer = GroupCommitWriter(str(tmp_path / "log.txt"), max_latency=0)
+    with patch('calculator.history.group_commit.os.fsync', side_effect=OSError("disk full")):
+        future = writer.submit(b'row\n')
+        assert isinstance(future.exception(timeout=5), OSError)
+    assert writer.submit(b'row\n').result(timeout=5) == 1
+    writer.close()
+    with pytest.raises(ValueError):
+        writer.submit(b'late\n')
+
+
+def test_history_commit_log_round_trips(tmp_path):
+    """Test that added calculations are durable in the log and load back as history."""
+    path = str(tmp_path / "commit.csv")
+    HistoryManager.clear_history()
+    assert HistoryManager.configure_commit_log(path, max_latency=0)
+    try:
+        futures = [
+            HistoryManager.add_calculation(Calculation(Decimal('1.5'), Decimal('2'), multiply)),
+            HistoryManager.add_batch(np.array([1.0, 2.0]), np.array([3.0, 4.0]),
+                                     pd.Categorical(['add', 'add']), np.array([4.0, 6.0]))
+        ]
+        for future in futures:
+            future.result(timeout=5)
+    finally:
+        HistoryManager.close_commit_log()
+
+    assert HistoryManager.add_calculation(Calculation(Decimal('1'), Decimal('1'), add)) is None
+    assert HistoryManager.load_history(path)
+    history = HistoryManager.get_history()
+    assert history['result'].tolist() == [3.0, 4.0, 6.0]
+    assert history['operation'].tolist() == ['multiply', 'add', 'add']
+    HistoryManager.clear_history()
+
+
+def test_commit_log_quotes_fields(tmp_path):
+    """Test that operation names with commas or quotes keep the log parseable."""
+    path = str(tmp_path / "commit.csv")
+    custom = lambda a, b: a + b  # pylint: disable=unnecessary-lambda-assignment
+    custom.__name__ = 'sum, "quoted"'
+    HistoryManager.clear_history()
+    assert HistoryManager.configure_commit_log(path, max_latency=0)
+    try:
+        HistoryManager.add_calculation(Calculation(Decimal('1'), Decimal('2'), custom)).result(timeout=5)
+        HistoryManager.add_batch(np.array([1.0]), np.array([0.0]), pd.Categorical(['a,b']),
+                                 np.array([np.nan])).result(timeout=5)
+    finally:
+        HistoryManager.close_commit_log()
+
+    assert HistoryManager.load_history(path)
+    history = HistoryManager.get_history()
+    assert history['operation'].tolist() == ['sum, "quoted"', 'a,b']
+    assert history['result'].tolist()[0] == 3.0 and np.isnan(history['result'].tolist()[1])
+    HistoryManager.clear_history()
@@ -284,3 +284,63 @@ def test_to_calculations():
 
     # Verify calculation performs correctly
     assert calculations[0].perform() == Decimal('7')
+
+
+@pytest.mark.usefixtures("clear_history")
+def test_journal_save_appends_only_new_rows(tmp_path):
+    """Test that journal saves append new rows instead of rewriting the file."""
+    test_file = str(tmp_path / "journal.csv")
+    HistoryManager.add_calculation(Calculation(Decimal('5'), Decimal('2'), add))
+    HistoryManager.save_history(test_file, journal=True)
+
+    # Overwrite the saved row in place; an append must leave it untouched
+    with open(test_file) as f:
+        original = f.read()
+    with open(test_file, 'w') as f:
+        f.write(original.replace('add', 'xyz'))
+
+    HistoryManager.add_calculation(Calculation(Decimal('10'), Decimal('4'), subtract))
+    HistoryManager.save_history(test_file, journal=True)
+
+    with open(test_file) as f:
+        lines = f.read().splitlines()
+    assert len(lines) == 3
+    assert 'xyz' in lines[1]
+    assert 'subtract' in lines[2]
+
+    # The appended file still loads as a whole history
+    assert HistoryManager.load_history(test_file)
+    assert HistoryManager.get_history()['operation'].tolist() == ['xyz', 'subtract']
+
+
+@pytest.mark.usefixtures("clear_history")
+def test_journal_save_compacts_after_clear(tmp_path):
+    """Test that the journal file is rewritten once it no longer matches memory."""
+    test_file = str(tmp_path / "journal.csv")
+    HistoryManager.add_calculation(Calculation(Decimal('5'), Decimal('2'), add))
+    HistoryManager.save_history(test_file, journal=True)
+
+    HistoryManager.clear_history()
+    HistoryManager.add_calculation(Calculation(Decimal('4'), Decimal('3'), multiply))
+    HistoryManager.save_history(test_file, journal=True)
+
+    assert HistoryManager.load_history(test_file)
+    assert HistoryManager.get_history()['operation'].tolist() == ['multiply']
+
+
+@pytest.mark.usefixtures("clear_history")
+def test_journal_save_compacts_periodically(tmp_path):
+    """Test that a full rewrite happens after the configured number of appends."""
+    test_file = str(tmp_path / "journal.csv")
+    HistoryManager.add_calculation(Calculation(Decimal('5'), Decimal('2'), add))
+
+    with patch.object(HistoryManager, '_compact_every', 2), \
+         patch.object(HistoryManager, '_write_full', wraps=HistoryManager._write_full) as write_full:
+        for _ in range(4):
+            HistoryManager.add_calculation(Calculation(Decimal('1'), Decimal('1'), add))
+            HistoryManager.save_history(test_file, journal=True)
+
+    # Initial full write, two appends, then a compaction and one more append
+    assert write_full.call_count == 2
+    assert HistoryManager.load_history(test_file)
+    assert len(HistoryManager.get_history()) == 5
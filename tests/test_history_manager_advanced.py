@@ -37,22 +37,9 @@ def populate_history():
         (Calculation(Decimal('50'), Decimal('25'), subtract), now),
     ]
     
-    # Manually add each calculation with its timestamp
+    # Add each calculation with its specific timestamp
     for calc, timestamp in calculations:
-        result = calc.perform()
-        new_row = {
-            'timestamp': timestamp,
-            'a': float(calc.a),
-            'b': float(calc.b),
-            'operation': calc.operation.__name__,
-            'result': float(result)
-        }
-        new_df = pd.DataFrame([new_row])
-        
-        if HistoryManager._history_df.empty:
-            HistoryManager._history_df = new_df
-        else:
-            HistoryManager._history_df = pd.concat([HistoryManager._history_df, new_df], ignore_index=True)
+        HistoryManager.add_calculation(calc, timestamp=timestamp)
     
     yield
     HistoryManager.clear_history()
@@ -218,3 +205,75 @@ def test_data_directory_path():
     # Clean up
     if os.path.exists(path):
         os.remove(path)
+
+
+@pytest.mark.usefixtures("populate_history")
+def test_history_uses_compact_dtypes():
+    """Test that the history DataFrame follows the explicit history schema."""
+    df = HistoryManager.get_history()
+    assert isinstance(df['operation'].dtype, pd.CategoricalDtype)
+    assert df['timestamp'].dtype == 'datetime64[ns]'
+    assert df['a'].dtype == 'float64'
+    assert df['result'].dtype == 'float64'
+
+    HistoryManager.clear_history()
+    empty = HistoryManager.get_history()
+    assert isinstance(empty['operation'].dtype, pd.CategoricalDtype)
+    assert empty['timestamp'].dtype == 'datetime64[ns]'
+
+
+@pytest.mark.usefixtures("clear_history")
+def test_load_history_applies_schema(tmp_path):
+    """Test that loading a CSV restores the compact dtypes."""
+    path = tmp_path / "history.csv"
+    path.write_text("timestamp,a,b,operation,result\n2025-01-01 10:00:00,1,2,add,3\n")
+    assert HistoryManager.load_history(str(path))
+
+    df = HistoryManager.get_history()
+    assert isinstance(df['operation'].dtype, pd.CategoricalDtype)
+    assert df['a'].dtype == 'float64'
+    assert df['timestamp'].dtype == 'datetime64[ns]'
+
+
+@pytest.mark.usefixtures("clear_history")
+def test_get_memory_footprint():
+    """Test that the memory report shows the saving of the categorical operation column."""
+    for i in range(1000):
+        HistoryManager.add_calculation(Calculation(Decimal(i), Decimal('2'), multiply if i % 2 else add))
+
+    footprint = HistoryManager.get_memory_footprint()
+    assert footprint['rows'] == 1000
+    assert footprint['store_bytes'] > 0
+    assert footprint['saved_bytes'] > 0
+    assert footprint['object_dataframe_bytes'] - footprint['dataframe_bytes'] == footprint['saved_bytes']
+
+
+@pytest.mark.usefixtures("populate_history")
+def test_filter_by_date_range_uses_sorted_timestamps(monkeypatch):
+    """Test that date filters on time-ordered history slice without scanning."""
+    df = HistoryManager.get_history()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("history was scanned")
+
+    monkeypatch.setattr(HistoryManager, '_select', fail)
+    filtered = HistoryManager.filter_by_date_range(df.iloc[1]['timestamp'], df.iloc[3]['timestamp'])
+
+    assert filtered.index.tolist() == [1, 2, 3]
+    assert filtered['operation'].tolist() == ['subtract', 'multiply', 'divide']
+    assert HistoryManager.get_time_range() == (df.iloc[0]['timestamp'], df.iloc[-1]['timestamp'])
+    assert HistoryManager.is_time_sorted()
+
+
+@pytest.mark.usefixtures("clear_history")
+def test_filter_by_date_range_out_of_order_history():
+    """Test that date filters still work when calculations are recorded out of time order."""
+    for day in (3, 1, 2):
+        HistoryManager.add_calculation(Calculation(Decimal(day), Decimal('1'), add),
+                                       timestamp=datetime(2025, 1, day))
+
+    filtered = HistoryManager.filter_by_date_range('2025-01-02', '2025-01-03')
+
+    assert filtered.index.tolist() == [0, 2]
+    assert not HistoryManager.is_time_sorted()
+    assert HistoryManager.get_time_range() == (pd.Timestamp('2025-01-01'), pd.Timestamp('2025-01-03'))
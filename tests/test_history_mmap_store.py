@@ -0,0 +1,121 @@
+"""Tests for the memory-mapped history store."""
+
+from datetime import datetime
+from decimal import Decimal
+import numpy as np
+import pandas as pd
+import pytest
+from calculator.calculation import Calculation
+from calculator.operations import add, subtract, multiply
+from calculator.history import HistoryManager
+from calculator.history.mmap_store import MemmapHistoryStore
+
+
+@pytest.fixture
+def mmap_history(tmp_path):
+    """Fixture switching the HistoryManager to a temporary memory-mapped store."""
+    HistoryManager.configure_storage('mmap', str(tmp_path / "store"))
+    yield
+    HistoryManager.configure_storage('memory')
+
+
+def test_append_grows_column_files(tmp_path):
+    """Test that appending past capacity grows every column file."""
+    store = MemmapHistoryStore(tmp_path, capacity=2)
+    for i in range(5):
+        store.append(datetime(2025, 1, 1, 12, 0, i), float(i), 2.0, 'multiply', float(i * 2))
+
+    assert len(store) == 5
+    assert store.capacity == 8
+    assert (tmp_path / "result.bin").stat().st_size == 8 * 8
+    assert (tmp_path / "operation.bin").stat().st_size == 8
+    assert store.to_dataframe()['result'].tolist() == [0.0, 2.0, 4.0, 6.0, 8.0]
+
+
+def test_store_persists_across_reopen(tmp_path):
+    """Test that rows and operation codes survive reopening the directory."""
+    store = MemmapHistoryStore(tmp_path)
+    store.append(datetime(2025, 1, 1, 10, 0), 5.0, 2.0, 'add', 7.0)
+    store.append(datetime(2025, 1, 2, 10, 0), 5.0, 2.0, 'subtract', 3.0)
+    store.flush()
+
+    reopened = MemmapHistoryStore(tmp_path)
+    df = reopened.to_dataframe()
+    assert len(reopened) == 2
+    assert df['operation'].tolist() == ['add', 'subtract']
+    assert df['timestamp'].tolist() == [pd.Timestamp('2025-01-01 10:00'), pd.Timestamp('2025-01-02 10:00')]
+    assert reopened.latest()['operation'] == 'subtract'
+
+
+def test_extend_take_and_clear(tmp_path):
+    """Test bulk extending, positional reads and clearing."""
+    store = MemmapHistoryStore(tmp_path, capacity=1)
+    store.extend(pd.DataFrame({
+        'timestamp': pd.to_datetime(['2025-01-01', '2025-01-02', '2025-01-03']),
+        'a': [1.0, 2.0, 3.0],
+        'b': [1.0, 1.0, 1.0],
+        'operation': ['add', 'divide', 'add'],
+        'result': [2.0, 2.0, 4.0]
+    }))
+
+    taken = store.take(np.array([0, 2]))
+    assert taken.index.tolist() == [0, 2]
+    assert taken['result'].tolist() == [2.0, 4.0]
+
+    chunks = list(store.iter_chunks(chunk_rows=2))
+    assert [offset for offset, _ in chunks] == [0, 2]
+    assert chunks[0][1]['operation'].tolist() == [0, 1]
+    assert store.operations.names == ['add', 'divide']
+
+    store.clear()
+    assert len(store) == 0
+    assert store.latest() is None
+    assert (tmp_path / "a.bin").stat().st_size == 8
+
+
+@pytest.mark.usefixtures("mmap_history")
+def test_history_manager_queries_on_mmap_store():
+    """Test that HistoryManager queries run against the memory-mapped store."""
+    for calc in [
+        Calculation(Decimal('5'), Decimal('2'), add),
+        Calculation(Decimal('10'), Decimal('5'), subtract),
+        Calculation(Decimal('4'), Decimal('3'), multiply),
+        Calculation(Decimal('1'), Decimal('1'), add)
+    ]:
+        HistoryManager.add_calculation(calc)
+
+    assert len(HistoryManager.get_history()) == 4
+    assert HistoryManager.find_by_operation('add')['result'].tolist() == [7.0, 2.0]
+    assert len(HistoryManager.filter_by_result_range(5, 12)) == 3
+
+    stats = HistoryManager.get_statistics()
+    assert stats['overall']['count'] == 4
+    assert stats['add']['count'] == 2
+    assert stats['add']['mean_result'] == pytest.approx(4.5)
+    assert stats['add']['std_result'] == pytest.approx(pd.Series([7.0, 2.0]).std())
+    assert HistoryManager.get_operation_frequency()['add'] == 2
+    assert HistoryManager.get_latest()['operation'] == 'add'
+
+
+@pytest.mark.usefixtures("mmap_history")
+def test_statistics_merge_across_chunks(monkeypatch):
+    """Test that statistics combined chunk by chunk match a single pandas pass."""
+    values = [3.0, 8.0, -2.0, 5.5, 10.0, 1.25, 7.0]
+    for value in values:
+        HistoryManager.add_calculation(Calculation(Decimal(str(value)), Decimal('0'), add))
+
+    store = HistoryManager._history
+    monkeypatch.setattr(store, 'iter_chunks', lambda chunk_rows=2: MemmapHistoryStore.iter_chunks(store, chunk_rows))
+    overall = HistoryManager.get_statistics()['overall']
+    expected = pd.Series(values)
+
+    assert overall['count'] == len(values)
+    assert overall['mean_result'] == pytest.approx(expected.mean())
+    assert overall['std_result'] == pytest.approx(expected.std())
+    assert overall['min_result'] == -2.0
+    assert overall['max_result'] == 10.0
+
+    bin_edges, histogram = HistoryManager.get_result_distribution(bins=3)
+    expected_hist, expected_edges = np.histogram(values, bins=3)
+    assert histogram.tolist() == expected_hist.tolist()
+    assert bin_edges.tolist() == pytest.approx(expected_edges.tolist())
@@ -0,0 +1,77 @@
+"""Tests for the per-operation inverted index."""
+
+from decimal import Decimal
+import numpy as np
+import pytest
+from calculator.calculation import Calculation
+from calculator.operations import add, subtract, multiply
+from calculator.history import HistoryManager
+from calculator.history.operation_index import OperationIndex
+
+
+@pytest.fixture
+def clear_history():
+    """Fixture to clear history before and after each test."""
+    HistoryManager.clear_history()
+    yield
+    HistoryManager.clear_history()
+
+
+def test_posting_lists_grow_and_stay_in_row_order():
+    """Test single and bulk additions to the posting lists."""
+    index = OperationIndex()
+    index.add_codes(np.array([0, 1, 0, 0]), 0)
+    for position in range(4, 40):
+        index.add(position % 2, position)
+
+    assert index.counts() == [21, 19]
+    assert index.positions(0)[:5].tolist() == [0, 2, 3, 4, 6]
+    assert index.positions(1)[-1] == 39
+    assert index.positions(5).tolist() == []
+
+
+def test_discarded_rows_counted_and_scanned():
+    """Test that rows dropped from the posting lists still count and are found in the given chunks."""
+    codes = np.array([0, 1, 0, 0, 1, 1, 0])
+    index = OperationIndex()
+    index.add_codes(codes, 0)
+    index.discard_before(4)
+
+    assert index.start == 4
+    assert index.counts() == [4, 3]
+    assert index.positions(0).tolist() == [6]
+    assert index.positions(0, [(0, {'operation': codes[:4]})]).tolist() == [0, 2, 3, 6]
+
+    index.rebuild([(0, {'operation': codes[:4]}), (4, {'operation': codes[4:]})], start=2)
+    assert index.counts() == [4, 3]
+    assert index.positions(1).tolist() == [4, 5]
+
+
+@pytest.mark.usefixtures("clear_history")
+def test_find_by_operation_reads_posting_list(monkeypatch):
+    """Test that operation lookups and counts do not scan the history."""
+    for a, operation in [('1', add), ('2', multiply), ('3', add), ('4', subtract), ('5', add)]:
+        HistoryManager.add_calculation(Calculation(Decimal(a), Decimal('2'), operation))
+
+    def fail(*args, **kwargs):
+        raise AssertionError("history was scanned")
+
+    monkeypatch.setattr(HistoryManager._history, 'iter_chunks', fail)
+    found = HistoryManager.find_by_operation('add')
+    assert found.index.tolist() == [0, 2, 4]
+    assert found['result'].tolist() == [3.0, 5.0, 7.0]
+    assert HistoryManager.get_operation_frequency().to_dict() == {'add': 3, 'multiply': 1, 'subtract': 1}
+    assert list(HistoryManager.get_statistics()) == ['overall', 'add', 'multiply', 'subtract']
+
+
+@pytest.mark.usefixtures("clear_history")
+def test_operation_index_rebuilt_on_load(tmp_path):
+    """Test that the operation index follows a history replaced by a load."""
+    HistoryManager.add_calculation(Calculation(Decimal('1'), Decimal('1'), subtract))
+    HistoryManager.add_calculation(Calculation(Decimal('1'), Decimal('1'), add))
+    path = HistoryManager.save_history(str(tmp_path / "history.csv"))
+    HistoryManager.add_calculation(Calculation(Decimal('1'), Decimal('1'), add))
+
+    assert HistoryManager.load_history(path, operations=['add'])
+    assert HistoryManager.find_by_operation('add').index.tolist() == [0]
+    assert HistoryManager.find_by_operation('subtract').empty
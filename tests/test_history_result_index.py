@@ -0,0 +1,132 @@
+"""Tests for the sorted result index."""
+
+from decimal import Decimal
+import numpy as np
+import pytest
+from calculator.calculation import Calculation
+from calculator.operations import add, subtract, multiply
+from calculator.history import HistoryManager
+from calculator.history.result_index import MERGE_ROWS, ResultIndex
+
+
+@pytest.fixture
+def clear_history():
+    """Fixture to clear history before and after each test."""
+    HistoryManager.clear_history()
+    yield
+    HistoryManager.clear_history()
+
+
+def _refresh(index, results):
+    """Refresh an index from a whole result column."""
+    index.refresh(len(results), lambda start: results[start:])
+
+
+def test_refresh_merges_pending_rows():
+    """Test that rows appended after a query are merged into the sorted order."""
+    results = np.array([5.0, 1.0, 3.0])
+    index = ResultIndex()
+    _refresh(index, results)
+    assert index.smallest(3).tolist() == [1, 2, 0]
+
+    results = np.append(results, [4.0, 0.5, 3.0])
+    _refresh(index, results)
+    assert len(index) == 6
+    assert index.smallest(6).tolist() == [4, 1, 2, 5, 3, 0]
+    assert index.largest(2).tolist() == [0, 3]
+    assert index.range(3.0, 4.0).tolist() == [2, 3, 5]
+    assert index.largest(0).tolist() == []
+
+
+def test_refresh_rebuilds_after_shrink():
+    """Test that an index that covers more rows than the history starts over."""
+    index = ResultIndex()
+    _refresh(index, np.array([2.0, 1.0, 3.0]))
+    _refresh(index, np.array([9.0]))
+    assert index.smallest(5).tolist() == [0]
+
+
+def test_queries_scan_rows_before_start():
+    """Test that rows dropped from the index are scanned from chunks, keeping ties in history order."""
+    results = np.array([5.0, 1.0, 3.0, 4.0, 1.0, 5.0])
+    index = ResultIndex()
+    _refresh(index, results)
+    index.discard_before(3)
+
+    def chunks():
+        return [(0, {'result': results[:2]}), (2, {'result': results[2:3]})]
+
+    assert len(index) == 3 and index.start == 3
+    assert index.smallest(3, chunks()).tolist() == [1, 4, 2]
+    assert index.largest(3, chunks()).tolist() == [5, 0, 3]
+    assert index.range(3.0, 4.0, chunks()).tolist() == [2, 3]
+
+    index.refresh(len(results), lambda start: results[start:], start=5)
+    assert index.smallest(5).tolist() == [5]
+
+
+def test_nan_results_are_not_ranked():
+    """Test that failed calculations (NaN results) never rank or match a range, like nlargest skipping them."""
+    results = np.array([np.nan, 2.0, np.inf, 5.0, np.nan])
+    index = ResultIndex()
+    _refresh(index, results)
+    results = np.append(results, [np.nan, 7.0])
+    _refresh(index, results)
+
+    def chunks():
+        return [(0, {'result': np.array([np.nan, 9.0])})]
+
+    assert index.largest(10).tolist() == [2, 6, 3, 1]
+    assert index.smallest(10).tolist() == [1, 3, 6, 2]
+    assert index.range(-np.inf, np.inf).tolist() == [1, 2, 3, 6]
+    index.discard_before(2)
+    assert index.largest(3, chunks()).tolist() == [2, 1, 6]
+
+
+def test_pending_rows_merged_in_batches():
+    """Test that appended rows are answered from the unsorted tail until a batch is merged."""
+    results = np.arange(10, dtype=np.float64)
+    index = ResultIndex()
+    _refresh(index, results)
+    merged = index._order
+
+    results = np.append(results, [1e9, -1.0])
+    _refresh(index, results)
+    assert index._order is merged
+    assert index.largest(2).tolist() == [10, 9]
+    assert index.smallest(2).tolist() == [11, 0]
+    assert index.range(8.0, 1e9).tolist() == [8, 9, 10]
+
+    results = np.append(results, np.arange(MERGE_ROWS, dtype=np.float64))
+    _refresh(index, results)
+    assert len(index._order) == len(results) and len(index._tail_positions) == 0
+    assert index.largest(1).tolist() == [10]
+
+
+@pytest.mark.usefixtures("clear_history")
+def test_top_k_and_bottom_k():
+    """Test the largest and smallest result queries on the history."""
+    for a, b, operation in [('5', '2', add), ('10', '5', subtract), ('4', '3', multiply), ('1', '1', add)]:
+        HistoryManager.add_calculation(Calculation(Decimal(a), Decimal(b), operation))
+
+    top = HistoryManager.top_k(2)
+    assert top['result'].tolist() == [12.0, 7.0]
+    assert top.index.tolist() == [2, 0]
+    assert HistoryManager.bottom_k(1)['result'].tolist() == [2.0]
+
+    HistoryManager.add_calculation(Calculation(Decimal('20'), Decimal('1'), add))
+    assert HistoryManager.top_k(1)['result'].tolist() == [21.0]
+    assert len(HistoryManager.top_k(10)) == 5
+    assert HistoryManager.filter_by_result_range(5, 12).index.tolist() == [0, 1, 2]
+
+
+@pytest.mark.usefixtures("clear_history")
+def test_result_index_reset_on_load(tmp_path):
+    """Test that the result index follows a history replaced by a load."""
+    HistoryManager.add_calculation(Calculation(Decimal('3'), Decimal('3'), add))
+    path = HistoryManager.save_history(str(tmp_path / "history.csv"))
+    HistoryManager.add_calculation(Calculation(Decimal('50'), Decimal('50'), add))
+    assert HistoryManager.top_k(1)['result'].tolist() == [100.0]
+
+    assert HistoryManager.load_history(path)
+    assert HistoryManager.top_k(5)['result'].tolist() == [6.0]
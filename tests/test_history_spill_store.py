@@ -0,0 +1,175 @@
+"""Tests for the bounded history store that spills older rows to disk."""
+
+import gc
+import os
+import subprocess
+import sys
+from datetime import datetime
+from decimal import Decimal
+import numpy as np
+import pandas as pd
+import pytest
+from calculator.calculation import Calculation
+from calculator.operations import add, subtract, multiply, divide
+from calculator.history import HistoryManager
+from calculator.history.spill_store import SpillingHistoryStore
+
+
+def _fill(store, count):
+    """Append ``count`` rows cycling through the operations, with result == row number."""
+    names = ['add', 'subtract', 'multiply', 'divide']
+    for i in range(count):
+        store.append(datetime(2025, 1, 1, 0, 0, i), float(i), 1.0, names[i % 4], float(i))
+
+
+def test_temporary_stores_do_not_share_spill_files(tmp_path):
+    """Test that a second store under the same data directory leaves the spilled rows of the first alone."""
+    first = SpillingHistoryStore.temporary(tmp_path, max_rows=8)
+    _fill(first, 50)
+    second = SpillingHistoryStore.temporary(tmp_path, max_rows=8)
+    _fill(second, 3)
+
+    assert len(first) == 50 and first.spilled_rows >= 42
+    assert first.to_dataframe()['result'].tolist() == [float(i) for i in range(50)]
+    assert len(os.listdir(tmp_path)) == 2
+
+    del first, second
+    gc.collect()
+    assert os.listdir(tmp_path) == []
+
+
+def test_spill_directory_created_on_first_use_and_removed_at_exit(tmp_path):
+    """Test that importing the calculator touches no spill files and a process removes its own at exit."""
+    code = ("import os, sys; from calculator.history import HistoryManager; "
+            "print(os.listdir(sys.argv[1])); "
+            "from calculator import Calculator; Calculator.add(1, 2); "
+            "print(len(os.listdir(sys.argv[1])))")
+    env = dict(os.environ, CALCULATOR_DATA_DIR=str(tmp_path), CALCULATOR_HISTORY_MAX_ROWS='4')
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run([sys.executable, '-c', code, str(tmp_path)], cwd=root, env=env,
+                            capture_output=True, text=True, check=True).stdout
+
+    assert output.splitlines() == ['[]', '1']
+    assert not [name for name in os.listdir(tmp_path) if name.startswith('history_spill')]
+
+
+@pytest.fixture
+def bounded_history(tmp_path):
+    """Fixture switching the HistoryManager to a store keeping 4 rows in memory."""
+    HistoryManager.configure_storage('memory', str(tmp_path / "spill"), max_rows=4)
+    yield
+    HistoryManager.configure_storage('memory', max_rows=0)
+
+
+def test_append_spills_oldest_rows(tmp_path):
+    """Test that rows past max_rows move to disk while every row stays readable."""
+    store = SpillingHistoryStore(tmp_path, max_rows=16)
+    _fill(store, 40)
+
+    assert len(store) == 40
+    assert store.spilled_rows >= 24
+    assert len(store) - store.spilled_rows <= 16
+    assert store.to_dataframe()['result'].tolist() == [float(i) for i in range(40)]
+    assert store.latest()['result'] == 39.0
+    assert store.time_sorted
+
+
+def test_queries_span_disk_and_memory(tmp_path):
+    """Test that slices, takes, columns and chunks run across the spill boundary."""
+    store = SpillingHistoryStore(tmp_path, max_rows=4)
+    _fill(store, 10)
+    spilled = store.spilled_rows
+
+    rows = store.slice(spilled - 2, spilled + 2)
+    assert rows.index.tolist() == list(range(spilled - 2, spilled + 2))
+    assert rows['result'].tolist() == [float(i) for i in range(spilled - 2, spilled + 2)]
+
+    taken = store.take(np.array([9, 0, spilled]))
+    assert taken['result'].tolist() == [9.0, 0.0, float(spilled)]
+    assert taken['operation'].tolist() == ['subtract', 'add', ['add', 'subtract', 'multiply', 'divide'][spilled % 4]]
+
+    codes = store.column('operation', 1)
+    assert [store.operations.names[code] for code in codes[:4]] == ['subtract', 'multiply', 'divide', 'add']
+    offsets = [offset for offset, _ in store.iter_chunks(3)]
+    assert offsets[0] == 0 and offsets[-1] < 10
+
+
+def test_clear_empties_spill_segment(tmp_path):
+    """Test that clearing drops rows in memory and on disk."""
+    store = SpillingHistoryStore(tmp_path, max_rows=2)
+    _fill(store, 6)
+    store.clear()
+
+    assert len(store) == 0
+    assert store.spilled_rows == 0
+    assert store.latest() is None
+
+
+def test_manager_queries_with_bounded_memory(bounded_history):
+    """Test statistics, filters and top-k over a history mostly spilled to disk."""
+    operations = [add, subtract, multiply, divide]
+    for i in range(1, 13):
+        HistoryManager.add_calculation(Calculation(Decimal(i), Decimal('1'), operations[i % 4]))
+
+    assert HistoryManager._history.spilled_rows >= 8
+    assert len(HistoryManager.get_history()) == 12
+    assert HistoryManager.get_statistics()['overall']['count'] == 12
+    assert HistoryManager.get_operation_frequency()['add'] == 3
+    assert HistoryManager.find_by_operation('multiply')['a'].tolist() == [2.0, 6.0, 10.0]
+    assert HistoryManager.top_k(1)['result'].tolist() == [13.0]
+    assert HistoryManager.filter_by_result_range(0.0, 1.0)['a'].tolist() == [1.0]
+
+
+@pytest.fixture
+def spilled_history(tmp_path):
+    """Fixture switching the HistoryManager to a store keeping 64 rows in memory."""
+    HistoryManager.configure_storage('memory', str(tmp_path / "spill"), max_rows=64)
+    yield
+    HistoryManager.configure_storage('memory', max_rows=0)
+
+
+def test_indexes_bounded_with_spilled_rows(spilled_history):
+    """Test that the indexes only hold the rows in memory while queries still span the spill segment."""
+    rng = np.random.default_rng(7)
+    operations = [add, subtract, multiply, divide]
+    for i in range(1, 1501):
+        a = Decimal(int(rng.integers(-50, 50)))
+        HistoryManager.add_calculation(Calculation(a, Decimal(i % 7 + 1), operations[i % 4]))
+        if i % 500 == 0:
+            HistoryManager.top_k(3)
+    HistoryManager.add_batch(np.array([1.0, 2.0, 3.0]), np.array([1.0, 1.0, 1.0]),
+                             pd.Categorical(['add', 'multiply', 'add']), np.array([2.0, 2.0, 4.0]))
+
+    df = HistoryManager.get_history()
+    expected = df['result'].sort_values(kind='stable')
+    assert HistoryManager.bottom_k(10).index.tolist() == expected.index[:10].tolist()
+    assert HistoryManager.top_k(10).index.tolist() == expected.index[::-1][:10].tolist()
+    assert (HistoryManager.filter_by_result_range(-3.0, 3.0).index.tolist()
+            == df.index[df['result'].between(-3.0, 3.0)].tolist())
+    assert HistoryManager.find_by_operation('multiply').index.tolist() == df.index[df['operation'] == 'multiply'].tolist()
+    assert len(HistoryManager.calculations_by_operation('divide')) == (df['operation'] == 'divide').sum()
+    assert HistoryManager.get_operation_frequency().to_dict() == df['operation'].value_counts().to_dict()
+
+    in_memory = len(df) - HistoryManager._history.spilled_rows
+    assert in_memory <= 64
+    assert sum(len(HistoryManager._operation_index.positions(code))
+               for code in range(len(HistoryManager._history.operations.names))) == in_memory
+    assert len(HistoryManager._result_index) <= in_memory
+
+
+def test_exact_operands_bounded_with_spilled_rows(spilled_history):
+    """Test that exact operands are only kept for rows in memory, and spilled rows still rebuild."""
+    custom = lambda a, b: a - b  # pylint: disable=unnecessary-lambda-assignment
+    custom.__name__ = 'difference'
+    stored = [Calculation(Decimal(f'{i}.50'), Decimal('2'), custom if i % 3 == 0 else add) for i in range(1000)]
+    for calc in stored:
+        HistoryManager.add_calculation(calc)
+
+    spilled = HistoryManager._history.spilled_rows
+    assert spilled > 900
+    assert len(HistoryManager._exact_operands) <= 1000 - spilled
+    assert min(HistoryManager._exact_operands) >= spilled
+    rebuilt = list(HistoryManager.iter_calculations())
+    assert rebuilt == stored
+    assert rebuilt[3].operation is custom and repr(rebuilt[3].a) == "Decimal('3.5')"
+    assert repr(rebuilt[-1].a) == "Decimal('999.50')"
@@ -0,0 +1,156 @@
+"""Tests for the incrementally maintained history statistics."""
+
+from decimal import Decimal
+import numpy as np
+import pandas as pd
+import pytest
+from calculator.calculation import Calculation
+from calculator.operations import add, subtract
+from calculator.history import HistoryManager
+from calculator.history.stats import HistoryStatistics, RunningStats
+
+
+@pytest.fixture
+def clear_history():
+    """Fixture to clear history before and after each test."""
+    HistoryManager.clear_history()
+    yield
+    HistoryManager.clear_history()
+
+
+def test_running_stats_single_and_array_updates_agree():
+    """Test that Welford updates and chunk merges match a single pandas pass."""
+    values = [3.0, 8.0, -2.0, 5.5, 10.0, 1.25, 7.0]
+    one_by_one = RunningStats()
+    for value in values:
+        one_by_one.add(value)
+    chunked = RunningStats()
+    chunked.add_array(np.array(values[:3]))
+    chunked.add(values[3])
+    chunked.add_array(np.array(values[4:]))
+    expected = pd.Series(values)
+
+    for stats in (one_by_one, chunked):
+        assert stats.count == len(values)
+        assert stats.mean == pytest.approx(expected.mean())
+        assert stats.std == pytest.approx(expected.std())
+        assert stats.min == -2.0
+        assert stats.max == 10.0
+
+
+def test_running_stats_std_needs_two_values():
+    """Test that the sample standard deviation of a single value is NaN."""
+    stats = RunningStats()
+    stats.add(4.0)
+    assert np.isnan(stats.to_dict()['std_result'])
+
+
+def test_running_stats_skip_nan_but_keep_infinite_results():
+    """Test that NaN results are skipped while infinite ones reach the minimum, maximum and mean."""
+    stats = RunningStats()
+    stats.add(2.0)
+    stats.add(float('nan'))
+    stats.add_array(np.array([4.0, np.nan, np.inf]))
+    result = stats.to_dict()
+
+    assert result['count'] == 3
+    assert result['mean_result'] == np.inf
+    assert result['max_result'] == np.inf
+    assert result['min_result'] == 2.0
+    assert np.isnan(result['std_result'])
+    assert stats.mean == pytest.approx(3.0)
+    assert np.isnan(RunningStats().to_dict()['mean_result'])
+
+
+def test_history_statistics_rebuild_from_chunks():
+    """Test that rebuilding from coded chunks groups results by operation name."""
+    chunks = [
+        (0, {'operation': np.array([0, 1, 0]), 'result': np.array([1.0, 5.0, 3.0])}),
+        (3, {'operation': np.array([1]), 'result': np.array([7.0])})
+    ]
+    stats = HistoryStatistics()
+    stats.rebuild(chunks, ['add', 'multiply'])
+
+    assert stats.overall.count == 4
+    assert list(stats.by_operation) == ['add', 'multiply']
+    assert stats.by_operation['multiply'].mean == pytest.approx(6.0)
+
+
+@pytest.mark.usefixtures("clear_history")
+def test_statistics_do_not_scan_history(monkeypatch):
+    """Test that get_statistics answers from the running aggregates."""
+    for a in ('5', '7', '9'):
+        HistoryManager.add_calculation(Calculation(Decimal(a), Decimal('1'), add))
+    HistoryManager.add_calculation(Calculation(Decimal('4'), Decimal('1'), subtract))
+
+    def fail(*args, **kwargs):
+        raise AssertionError("history was scanned")
+
+    monkeypatch.setattr(HistoryManager._history, 'iter_chunks', fail)
+    stats = HistoryManager.get_statistics()
+
+    assert list(stats) == ['overall', 'add', 'subtract']
+    assert stats['overall']['count'] == 4
+    assert stats['add']['mean_result'] == pytest.approx(8.0)
+    assert stats['add']['std_result'] == pytest.approx(2.0)
+    assert stats['subtract']['max_result'] == 3.0
+
+
+@pytest.mark.usefixtures("clear_history")
+def test_statistics_rebuilt_on_load_and_clear(tmp_path):
+    """Test that loading and clearing the history reset the running aggregates."""
+    HistoryManager.add_calculation(Calculation(Decimal('1'), Decimal('1'), add))
+    HistoryManager.add_calculation(Calculation(Decimal('10'), Decimal('4'), subtract))
+    path = HistoryManager.save_history(str(tmp_path / "history.csv"))
+
+    HistoryManager.add_calculation(Calculation(Decimal('100'), Decimal('1'), add))
+    assert HistoryManager.load_history(path)
+    stats = HistoryManager.get_statistics()
+    assert stats['overall']['count'] == 2
+    assert stats['overall']['max_result'] == 6.0
+
+    HistoryManager.clear_history()
+    assert not HistoryManager.get_statistics()
+    HistoryManager.add_calculation(Calculation(Decimal('2'), Decimal('2'), subtract))
+    assert list(HistoryManager.get_statistics()) == ['overall', 'subtract']
+
+
+def test_statistics_rebuilt_for_reopened_mmap_store(tmp_path):
+    """Test that switching to an existing store rebuilds the statistics from its rows."""
+    directory = str(tmp_path / "store")
+    try:
+        HistoryManager.configure_storage('mmap', directory)
+        HistoryManager.add_calculation(Calculation(Decimal('5'), Decimal('2'), add))
+        HistoryManager.add_calculation(Calculation(Decimal('8'), Decimal('2'), add))
+        HistoryManager.configure_storage('memory')
+        assert not HistoryManager.get_statistics()
+
+        HistoryManager.configure_storage('mmap', directory)
+        stats = HistoryManager.get_statistics()
+        assert stats['add']['count'] == 2
+        assert stats['add']['mean_result'] == pytest.approx(8.5)
+    finally:
+        HistoryManager.configure_storage('memory')
+
+
+@pytest.mark.usefixtures("clear_history")
+def test_statistics_match_pandas_with_nan_and_infinite_results():
+    """Test that counts include NaN rows and that infinite results are aggregated, as pandas did."""
+    HistoryManager.add_batch(np.array([1.0, 4.0, 6.0, 2.0, 3.0, 1.0]), np.array([0.0, 2.0, 0.0, 1.0, 0.0, 0.0]),
+                             pd.Categorical(['divide', 'divide', 'divide', 'add', 'multiply', 'power']),
+                             np.array([np.nan, 2.0, np.inf, 3.0, np.nan, -np.inf]))
+    HistoryManager.add_calculation(Calculation(Decimal('5'), Decimal('3'), add))
+
+    df = HistoryManager.get_history()
+    stats = HistoryManager.get_statistics()
+
+    assert stats['overall']['count'] == len(df) == 7
+    assert stats['divide']['count'] == HistoryManager.get_operation_frequency()['divide'] == 3
+    with np.errstate(invalid='ignore'):
+        groups = [('overall', df)] + [(operation, df[df['operation'] == operation])
+                                      for operation in df['operation'].unique()]
+        for name, group in groups:
+            expected = {'count': len(group), 'mean_result': group['result'].mean(),
+                        'min_result': group['result'].min(), 'max_result': group['result'].max(),
+                        'std_result': group['result'].std()}
+            assert stats[name] == pytest.approx(expected, nan_ok=True), name
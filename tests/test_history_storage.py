@@ -0,0 +1,142 @@
+"""Tests for the history file formats in calculator.history.storage."""
+
+from decimal import Decimal
+from unittest.mock import patch
+import pandas as pd
+import pytest
+from calculator.calculation import Calculation
+from calculator.operations import add, divide
+from calculator.history import HistoryManager
+from calculator.history import storage
+from calculator.history.storage import read_history, resolve_format, write_history
+
+
+@pytest.fixture
+def sample_df():
+    """Fixture providing a small history DataFrame."""
+    return pd.DataFrame({
+        'timestamp': pd.to_datetime(['2025-01-01 10:00:00', '2025-01-02 11:30:00.250000'], format='ISO8601'),
+        'a': [1.0, 9.0],
+        'b': [2.0, 3.0],
+        'operation': ['add', 'divide'],
+        'result': [3.0, 3.0]
+    })
+
+
+def test_resolve_format_by_extension(monkeypatch):
+    """Test that a known file extension decides the format."""
+    monkeypatch.setenv('CALCULATOR_HISTORY_FORMAT', 'npz')
+    assert resolve_format('history.csv') == 'csv'
+    assert resolve_format('history.npz') == 'npz'
+    assert resolve_format('history.parquet') == 'parquet'
+
+
+def test_resolve_format_from_environment(monkeypatch):
+    """Test that other paths use CALCULATOR_HISTORY_FORMAT."""
+    monkeypatch.delenv('CALCULATOR_HISTORY_FORMAT', raising=False)
+    assert resolve_format('history.dat') == 'csv'
+
+    monkeypatch.setenv('CALCULATOR_HISTORY_FORMAT', 'binary')
+    with patch.object(storage, 'has_pyarrow', return_value=False):
+        assert resolve_format('history.dat') == 'npz'
+    with patch.object(storage, 'has_pyarrow', return_value=True):
+        assert resolve_format('history.dat') == 'parquet'
+
+    monkeypatch.setenv('CALCULATOR_HISTORY_FORMAT', 'xml')
+    with pytest.raises(ValueError, match="Unsupported history format"):
+        resolve_format('history.dat')
+
+
+def test_npz_round_trip_keeps_types(tmp_path, sample_df):
+    """Test that .npz files keep datetime64 timestamps and a categorical operation."""
+    path = str(tmp_path / "history.dat")
+    write_history(sample_df, path, 'npz')
+    loaded = read_history(path, 'npz')
+
+    assert pd.api.types.is_datetime64_any_dtype(loaded['timestamp'])
+    assert isinstance(loaded['operation'].dtype, pd.CategoricalDtype)
+    assert loaded['timestamp'].tolist() == sample_df['timestamp'].tolist()
+    assert loaded['operation'].tolist() == ['add', 'divide']
+    assert loaded['result'].tolist() == [3.0, 3.0]
+
+
+def test_parquet_round_trip_keeps_types(tmp_path, sample_df):
+    """Test that Parquet files keep datetime64 timestamps and a categorical operation."""
+    pytest.importorskip('pyarrow')
+    path = str(tmp_path / "history.parquet")
+    write_history(sample_df, path, 'parquet')
+    loaded = read_history(path, 'parquet')
+
+    assert pd.api.types.is_datetime64_any_dtype(loaded['timestamp'])
+    assert isinstance(loaded['operation'].dtype, pd.CategoricalDtype)
+    assert loaded['operation'].tolist() == ['add', 'divide']
+
+
+def test_history_manager_binary_save_and_load(tmp_path):
+    """Test saving and loading the manager history through a .npz file."""
+    path = str(tmp_path / "history.npz")
+    HistoryManager.clear_history()
+    try:
+        HistoryManager.add_calculation(Calculation(Decimal('5'), Decimal('2'), add))
+        HistoryManager.add_calculation(Calculation(Decimal('9'), Decimal('3'), divide))
+        assert HistoryManager.save_history(path) == path
+
+        HistoryManager.clear_history()
+        assert HistoryManager.load_history(path)
+
+        history = HistoryManager.get_history()
+        assert history['operation'].tolist() == ['add', 'divide']
+        assert history['result'].tolist() == [7.0, 3.0]
+    finally:
+        HistoryManager.clear_history()
+
+
+@pytest.fixture
+def history_csv(tmp_path):
+    """Fixture writing a ten-row CSV history spread over ten days."""
+    path = str(tmp_path / "history.csv")
+    pd.DataFrame({
+        'timestamp': pd.date_range('2025-01-01', periods=10, freq='D'),
+        'a': [float(i) for i in range(10)],
+        'b': [1.0] * 10,
+        'operation': ['add', 'multiply'] * 5,
+        'result': [float(i + 1) for i in range(10)]
+    }).to_csv(path, index=False)
+    return path
+
+
+def test_read_csv_in_chunks_with_filters(history_csv):
+    """Test that chunked CSV reads apply the time window and operation filters."""
+    df = read_history(history_csv, 'csv', since='2025-01-03', until='2025-01-08',
+                      operations=['add'], chunk_rows=3)
+    assert df['a'].tolist() == [2.0, 4.0, 6.0]
+    assert df.index.tolist() == [0, 1, 2]
+
+
+def test_read_csv_keeps_most_recent_rows(history_csv):
+    """Test that max_rows keeps only the latest matching rows while streaming."""
+    df = read_history(history_csv, 'csv', max_rows=4, chunk_rows=3)
+    assert df['a'].tolist() == [6.0, 7.0, 8.0, 9.0]
+
+    df = read_history(history_csv, 'csv', operations=['multiply'], max_rows=2, chunk_rows=2)
+    assert df['a'].tolist() == [7.0, 9.0]
+
+
+def test_read_csv_with_no_matching_rows(history_csv):
+    """Test that a filter matching nothing returns an empty history."""
+    df = read_history(history_csv, 'csv', since='2030-01-01', chunk_rows=3)
+    assert df.empty
+    assert list(df.columns) == ['timestamp', 'a', 'b', 'operation', 'result']
+
+
+def test_history_manager_filtered_load(history_csv):
+    """Test loading only part of a history file into the HistoryManager."""
+    HistoryManager.clear_history()
+    try:
+        assert HistoryManager.load_history(history_csv, since='2025-01-06', operations=['add'])
+        assert HistoryManager.get_history()['a'].tolist() == [6.0, 8.0]
+
+        assert HistoryManager.load_history(history_csv, max_rows=3)
+        assert HistoryManager.get_history()['a'].tolist() == [7.0, 8.0, 9.0]
+    finally:
+        HistoryManager.clear_history()
@@ -176,3 +176,76 @@ def test_calculate_and_print_unknown_operation():
             
             # Verify print was called with error message
             mock_print.assert_called_once_with("Unknown operation: unknown")
+
+
+def test_run_batch_streams_results():
+    """Test that batch mode writes one result or error per calculation line."""
+    import io
+    from main import run_batch
+
+    lines = io.StringIO("5 3 add\n10,4,divide\n\n# comment\n1 0 divide\nx 1 add\n2 2 power\n3 3\n"
+                        "9e999999 9e999999 multiply\n4 4 add\n")
+    output = io.StringIO()
+    with patch('main.BATCH_CHUNK_LINES', 2):
+        errors = run_batch(lines, output)
+
+    assert output.getvalue().splitlines() == [
+        "8",
+        "2.5",
+        "Error: Cannot divide by zero",
+        "Error: invalid number input: x or 1",
+        "Error: unknown operation: power",
+        "Error: expected <number1> <number2> <operation>, got '3 3'",
+        "Error: arithmetic error: Overflow",
+        "8"
+    ]
+    assert errors == 5
+
+
+def test_batch_mode_reads_file(tmp_path, capsys):
+    """Test the --batch command-line mode with an input file."""
+    import main
+
+    source = tmp_path / "calculations.txt"
+    source.write_text("2 3 multiply\n9 3 subtract\n")
+    with patch.object(sys, 'argv', ['main.py', '--batch', str(source)]):
+        with patch('sys.exit') as mock_exit:
+            main.main()
+
+    assert capsys.readouterr().out.splitlines() == ["6", "6"]
+    mock_exit.assert_not_called()
+
+
+def test_batch_mode_missing_file(tmp_path):
+    """Test that batch mode exits with an error when the input file is missing."""
+    import main
+
+    with patch.object(sys, 'argv', ['main.py', '--batch', str(tmp_path / "missing.txt")]):
+        with pytest.raises(SystemExit) as excinfo, patch('builtins.print'):
+            main.main()
+
+    assert excinfo.value.code == 1
+
+
+def test_serve_mode_runs_server():
+    """Test that the serve mode starts the server on the given address."""
+    import main
+
+    with patch.object(sys, 'argv', ['main.py', 'serve', '127.0.0.1:9000']):
+        with patch('calculator.server.run_server') as mock_run:
+            main.main()
+
+    mock_run.assert_called_once_with('127.0.0.1:9000')
+
+
+def test_serve_mode_rejects_invalid_address(capsys):
+    """Test that an address with a non-numeric port is a usage error, not a traceback."""
+    import main
+
+    with patch.object(sys, 'argv', ['main.py', 'serve', 'localhost:http']):
+        with patch('calculator.server.run_server') as mock_run, pytest.raises(SystemExit) as excinfo:
+            main.main()
+
+    assert excinfo.value.code == 1
+    assert capsys.readouterr().out.startswith("Invalid server address:")
+    mock_run.assert_not_called()
@@ -120,6 +120,19 @@ def test_filter_by_date_range(sample_dataframe):
     assert len(filtered) == 3
 
 
+def test_filter_by_date_range_time_sorted(sample_dataframe, monkeypatch):
+    """Test that rows known to be in date order are sliced by binary search without checking the order."""
+    dates = sample_dataframe.sort_values('timestamp').reset_index(drop=True)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("rows were compared one by one")
+
+    monkeypatch.setattr(pd.Series, '__ge__', fail)
+    filtered = PandasFacade.filter_by_date_range(dates, 'timestamp', '2025-01-02', '2025-01-04', time_sorted=True)
+
+    assert filtered['timestamp'].tolist() == dates['timestamp'].iloc[1:4].tolist()
+
+
 def test_get_statistics(sample_dataframe):
     """Test getting statistics from a DataFrame."""
     # Get statistics for the 'result' column
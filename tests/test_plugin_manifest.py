@@ -0,0 +1,151 @@
+"""Tests for the cached plugin manifest and lazy command loading."""
+
+import json
+import os
+import pkgutil
+import sys
+from unittest.mock import patch
+import pytest
+from calculator.app import App
+from calculator.app import plugin_manifest
+from calculator.app.commands import CommandHandler
+from calculator.app.plugin_manifest import PLUGINS_DIR, load_manifest
+
+PLUGIN_SOURCE = """from calculator.app.commands import Command
+
+class {name}(Command):
+    def execute(self):
+        print("{name} executed")
+"""
+
+
+def _write_plugin(plugins_dir, command_name, class_name):
+    """Create a plugin package defining one command class."""
+    package = plugins_dir.joinpath(command_name)
+    package.mkdir(exist_ok=True)
+    package.joinpath('__init__.py').write_text(PLUGIN_SOURCE.format(name=class_name))
+    return package.joinpath('__init__.py')
+
+
+@pytest.fixture
+def plugins_dir(tmp_path):
+    """A plugins directory with two plugins and a directory that is not a package name."""
+    directory = tmp_path.joinpath('plugins')
+    directory.mkdir()
+    _write_plugin(directory, 'hello', 'HelloCommand')
+    _write_plugin(directory, 'bye', 'ByeCommand')
+    directory.joinpath('not_a_plugin.py').mkdir()
+    return directory
+
+
+def test_manifest_lists_repository_plugins(tmp_path):
+    """Test that the manifest finds every plugin shipped with the application without importing it."""
+    manifest = load_manifest(cache_path=tmp_path.joinpath('manifest.json'))
+
+    assert manifest['add'] == 'calculator.app.plugins.add:AddCommand'
+    assert manifest['menu'] == 'calculator.app.plugins.menu:MenuCommand'
+    assert 'delete_history_file.py' not in manifest
+    # Every plugin package the eager loader used to import is listed
+    assert sorted(manifest) == sorted(name for _, name, is_pkg in pkgutil.iter_modules([str(PLUGINS_DIR)]) if is_pkg)
+
+
+def test_manifest_is_cached(plugins_dir, tmp_path):
+    """Test that the manifest is written once and reused while no plugin changes."""
+    cache_path = tmp_path.joinpath('manifest.json')
+    manifest = load_manifest(plugins_dir, cache_path, 'plugins')
+
+    assert manifest == {'bye': 'plugins.bye:ByeCommand', 'hello': 'plugins.hello:HelloCommand'}
+    assert set(json.loads(cache_path.read_text())['plugins']) == {'bye', 'hello'}
+    with patch.object(plugin_manifest, 'scan_plugin') as scan:
+        assert load_manifest(plugins_dir, cache_path, 'plugins') == manifest
+    scan.assert_not_called()
+
+
+def test_manifest_rescans_changed_plugins(plugins_dir, tmp_path):
+    """Test that only plugins whose mtime changed, or that were added, are parsed again."""
+    cache_path = tmp_path.joinpath('manifest.json')
+    load_manifest(plugins_dir, cache_path, 'plugins')
+    source = _write_plugin(plugins_dir, 'hello', 'GreetingCommand')
+    mtime = source.stat().st_mtime_ns + 1_000_000_000
+    os.utime(source, ns=(mtime, mtime))
+    _write_plugin(plugins_dir, 'extra', 'ExtraCommand')
+
+    with patch.object(plugin_manifest, 'scan_plugin', wraps=plugin_manifest.scan_plugin) as scan:
+        manifest = load_manifest(plugins_dir, cache_path, 'plugins')
+
+    assert sorted(call.args[0] for call in scan.call_args_list) == ['extra', 'hello']
+    assert manifest['hello'] == 'plugins.hello:GreetingCommand'
+    assert manifest['extra'] == 'plugins.extra:ExtraCommand'
+
+
+def test_manifest_drops_removed_plugins(plugins_dir, tmp_path):
+    """Test that a deleted plugin disappears from the manifest and its cache."""
+    cache_path = tmp_path.joinpath('manifest.json')
+    load_manifest(plugins_dir, cache_path, 'plugins')
+    plugins_dir.joinpath('bye', '__init__.py').unlink()
+
+    assert load_manifest(plugins_dir, cache_path, 'plugins') == {'hello': 'plugins.hello:HelloCommand'}
+    assert set(json.loads(cache_path.read_text())['plugins']) == {'hello'}
+
+
+def test_manifest_ignores_unreadable_cache(plugins_dir, tmp_path):
+    """Test that a corrupt cache is rebuilt instead of failing startup."""
+    cache_path = tmp_path.joinpath('manifest.json')
+    cache_path.write_text('{not json')
+
+    assert load_manifest(plugins_dir, cache_path, 'plugins')['hello'] == 'plugins.hello:HelloCommand'
+    assert 'hello' in json.loads(cache_path.read_text())['plugins']
+
+
+def test_manifest_imports_plugins_it_cannot_parse(plugins_dir, tmp_path, monkeypatch):
+    """Test that a plugin re-exporting its command class from a submodule is imported to find it."""
+    package = plugins_dir.joinpath('nested')
+    package.mkdir()
+    package.joinpath('command.py').write_text(PLUGIN_SOURCE.format(name='NestedCommand'))
+    package.joinpath('__init__.py').write_text("from plugins.nested.command import NestedCommand\n")
+    monkeypatch.syspath_prepend(str(plugins_dir.parent))
+
+    try:
+        manifest = load_manifest(plugins_dir, tmp_path.joinpath('manifest.json'), 'plugins')
+    finally:
+        for name in [name for name in sys.modules if name == 'plugins' or name.startswith('plugins.')]:
+            del sys.modules[name]
+
+    assert manifest['nested'] == 'plugins.nested:NestedCommand'
+
+
+def test_lazy_command_imported_on_first_execution(plugins_dir, capsys, monkeypatch):
+    """Test that CommandHandler imports a lazily registered command only when it is executed."""
+    monkeypatch.syspath_prepend(str(plugins_dir.parent))
+    handler = CommandHandler()
+    handler.register_lazy_command('hello', 'plugins.hello:HelloCommand')
+
+    try:
+        assert 'plugins.hello' not in sys.modules
+        handler.execute_command('hello')
+        assert 'plugins.hello' in sys.modules
+        handler.execute_command('hello')
+    finally:
+        for name in [name for name in sys.modules if name == 'plugins' or name.startswith('plugins.')]:
+            del sys.modules[name]
+
+    assert capsys.readouterr().out == "HelloCommand executed\nHelloCommand executed\n"
+    assert list(handler.commands) == ['hello'] and not handler.lazy_commands
+
+
+def test_unknown_command_still_reported(capsys):
+    """Test that an unregistered command prints the usual message."""
+    handler = CommandHandler()
+    handler.execute_command('missing')
+    assert capsys.readouterr().out == "No such command: missing\n"
+
+
+def test_load_plugins_registers_commands_lazily(tmp_path, monkeypatch):
+    """Test that App.load_plugins registers every plugin from the manifest without loading any."""
+    monkeypatch.setattr(plugin_manifest, 'default_manifest_path', lambda: tmp_path.joinpath('manifest.json'))
+    app = App()
+    app.load_plugins()
+
+    assert not app.command_handler.commands
+    assert app.command_handler.lazy_commands['history'] == 'calculator.app.plugins.history:HistoryCommand'
+    assert tmp_path.joinpath('manifest.json').exists()
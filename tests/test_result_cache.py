@@ -0,0 +1,77 @@
+"""Tests for the calculation result cache."""
+
+from decimal import Decimal, localcontext
+import pytest
+from calculator import Calculator
+from calculator.calculation import Calculation
+from calculator.history import HistoryManager
+from calculator.operations import add, divide
+from calculator.result_cache import ResultCache
+
+
+@pytest.fixture
+def result_cache():
+    """Fixture enabling a small result cache for one test."""
+    Calculation.configure_cache(2)
+    yield
+    Calculation.configure_cache(0)
+
+
+def test_lru_eviction_and_counters():
+    """Test that the least recently used result is evicted first."""
+    cache = ResultCache(2)
+    assert cache.get_or_compute('a', lambda: 1) == 1
+    assert cache.get_or_compute('b', lambda: 2) == 2
+    assert cache.get_or_compute('a', lambda: 0) == 1
+    assert cache.get_or_compute('c', lambda: 3) == 3
+    assert cache.get_or_compute('b', lambda: 4) == 4
+
+    assert cache.stats() == {'hits': 1, 'misses': 4, 'evictions': 2, 'size': 2, 'maxsize': 2, 'hit_rate': 0.2}
+    cache.clear()
+    assert cache.stats()['misses'] == 0
+    with pytest.raises(ValueError):
+        ResultCache(0)
+
+
+@pytest.mark.usefixtures("result_cache")
+def test_perform_uses_cache_per_representation_and_context():
+    """Test cache keys separate equal Decimals with different exponents and decimal contexts."""
+    assert Calculation(Decimal('1'), Decimal('2'), add).perform() == Decimal('3')
+    assert Calculation(Decimal('1'), Decimal('2'), add).perform() == Decimal('3')
+    assert str(Calculation(Decimal('1.0'), Decimal('2'), add).perform()) == '3.0'
+    assert Calculation.cache_stats()['hits'] == 1
+
+    with localcontext() as context:
+        context.prec = 3
+        assert str(Calculation(Decimal('1'), Decimal('3'), divide).perform()) == '0.333'
+    assert str(Calculation(Decimal('1'), Decimal('3'), divide).perform()).startswith('0.33333')
+
+
+@pytest.mark.usefixtures("result_cache")
+def test_errors_are_not_cached():
+    """Test that a failing calculation raises every time and is never cached."""
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            Calculation(Decimal('1'), Decimal('0'), divide).perform()
+    assert Calculation.cache_stats()['size'] == 0
+
+
+def test_cache_disabled_by_default():
+    """Test that perform bypasses the cache unless it is configured."""
+    assert Calculation.cache_stats() is None
+
+
+def test_perform_operation_computes_once():
+    """Test that a Calculator call performs its operation exactly once."""
+    calls = []
+
+    def counting_add(a, b):
+        calls.append((a, b))
+        return a + b
+    counting_add.__name__ = 'add'
+
+    HistoryManager.clear_history()
+    assert Calculator._perform_operation(Decimal('2'), Decimal('3'), counting_add) == Decimal('5')
+    assert len(calls) == 1
+    assert HistoryManager.get_latest()['result'] == 5.0
+    HistoryManager.clear_history()
@@ -0,0 +1,158 @@
+"""Tests for the asyncio calculation server, driven by local clients."""
+
+import asyncio
+import json
+from decimal import Decimal
+import numpy as np
+import pandas as pd
+import pytest
+from calculator.history import HistoryManager
+from calculator.server import CalculatorServer, parse_address
+
+
+@pytest.fixture(autouse=True)
+def clear_history():
+    """Fixture to start and end every test with an empty history."""
+    HistoryManager.clear_history()
+    yield
+    HistoryManager.clear_history()
+
+
+def _reject_constant(name):
+    """Fail on NaN and Infinity, which strict JSON parsers reject."""
+    raise AssertionError(f"response is not valid JSON: {name}")
+
+
+async def _exchange(reader, writer, *requests):
+    """Send request objects on one connection and return the decoded responses."""
+    for request in requests:
+        writer.write(json.dumps(request).encode() + b'\n')
+    await writer.drain()
+    return [json.loads(await reader.readline(), parse_constant=_reject_constant) for _ in requests]
+
+
+def _run_tcp(*requests, record=True):
+    """Start a server on a free port, send the requests on one connection and stop it."""
+    async def scenario():
+        server = CalculatorServer(port=0, record=record)
+        await server.start()
+        try:
+            reader, writer = await asyncio.open_connection(*server.address)
+            responses = await _exchange(reader, writer, *requests)
+            writer.close()
+            await writer.wait_closed()
+            return responses
+        finally:
+            await server.close()
+    return asyncio.run(scenario())
+
+
+def test_calculate_and_batch_requests():
+    """Test single and batch calculations with exact Decimal results and echoed ids."""
+    single, batch = _run_tcp(
+        {'op': 'calculate', 'a': '0.1', 'b': 0.2, 'operation': 'add', 'id': 7},
+        {'op': 'batch', 'calculations': [['6', '3', 'divide'], ['1', '0', 'divide'], ['x', '1', 'add']]}
+    )
+
+    assert single == {'result': '0.3', 'id': 7}
+    assert batch['results'] == [
+        {'result': '2'}, {'error': 'Cannot divide by zero'}, {'error': 'invalid number input: x or 1'}
+    ]
+    # Writes queued before close are applied, the batch as one bulk append
+    assert HistoryManager.get_history()['result'].tolist() == [0.3, 2.0]
+    assert HistoryManager.calculations_at([0])[0].a == Decimal('0.1')
+
+
+def test_history_queries_see_queued_writes():
+    """Test that history requests wait for the calculations answered before them."""
+    responses = _run_tcp(
+        {'op': 'calculate', 'a': '2', 'b': '3', 'operation': 'multiply'},
+        {'op': 'calculate', 'a': '9', 'b': '4', 'operation': 'subtract'},
+        {'op': 'history', 'limit': 1},
+        {'op': 'latest'},
+        {'op': 'statistics'}
+    )
+
+    history, latest, statistics = responses[2:]
+    assert [(row['operation'], row['result']) for row in history['history']] == [('subtract', 5.0)]
+    assert latest['latest']['result'] == 5.0
+    assert statistics['statistics']['overall']['count'] == 2
+
+
+def test_invalid_requests_get_errors():
+    """Test that malformed requests get an error response and the connection stays usable."""
+    async def scenario():
+        server = CalculatorServer(port=0)
+        await server.start()
+        try:
+            reader, writer = await asyncio.open_connection(*server.address)
+            writer.write(b'not json\n[1, 2]\n')
+            responses = [json.loads(await reader.readline()) for _ in range(2)]
+            responses += await _exchange(reader, writer, {'op': 'power'}, {'op': 'calculate', 'a': '1'},
+                                         {'op': 'calculate', 'a': '1', 'b': '1', 'operation': 'add'})
+            writer.close()
+            return responses
+        finally:
+            await server.close()
+
+    responses = asyncio.run(scenario())
+    assert responses[0]['error'].startswith('invalid JSON')
+    assert responses[1] == {'error': 'request must be a JSON object'}
+    assert responses[2] == {'error': 'unknown op: power'}
+    assert 'error' in responses[3]
+    assert responses[4] == {'result': '2'}
+
+
+def test_unix_socket_without_recording(tmp_path):
+    """Test serving on a Unix socket with history recording turned off."""
+    async def scenario():
+        server = CalculatorServer(path=str(tmp_path / "calculator.sock"), record=False)
+        await server.start()
+        try:
+            reader, writer = await asyncio.open_unix_connection(server.address)
+            responses = await _exchange(reader, writer, {'op': 'calculate', 'a': '8', 'b': '2', 'operation': 'divide'})
+            writer.close()
+            return responses
+        finally:
+            await server.close()
+
+    assert asyncio.run(scenario()) == [{'result': '4'}]
+    assert len(HistoryManager.get_history()) == 0
+
+
+def test_parse_address():
+    """Test the serve address forms."""
+    assert parse_address('0.0.0.0:9000') == {'host': '0.0.0.0', 'port': 9000}
+    assert parse_address('9000')['port'] == 9000
+    assert parse_address('/tmp/calculator.sock') == {'path': '/tmp/calculator.sock'}
+    assert set(parse_address(None)) == {'host', 'port'}
+    assert parse_address('localhost') == {'host': 'localhost', 'port': parse_address(None)['port']}
+    with pytest.raises(ValueError, match="expected host:port"):
+        parse_address('localhost:http')
+
+
+def test_arithmetic_errors_reported_per_item():
+    """Test that an overflowing calculation gets its own error instead of failing the request or batch."""
+    single, batch = _run_tcp(
+        {'op': 'calculate', 'a': '9e999999', 'b': '9e999999', 'operation': 'multiply'},
+        {'op': 'batch', 'calculations': [['9e999999', '9e999999', 'multiply'], ['2', '2', 'add']]}
+    )
+
+    assert single == {'error': 'arithmetic error: Overflow'}
+    assert batch['results'] == [{'error': 'arithmetic error: Overflow'}, {'result': '4'}]
+    assert HistoryManager.get_history()['result'].tolist() == [4.0]
+
+
+def test_non_finite_values_sent_as_null():
+    """Test that NaN statistics and results are sent as null, keeping responses valid JSON."""
+    HistoryManager.add_batch(np.array([1.0]), np.array([0.0]), pd.Categorical(['divide']), np.array([np.nan]))
+    responses = _run_tcp(
+        {'op': 'calculate', 'a': '2', 'b': '3', 'operation': 'add'},
+        {'op': 'statistics'},
+        {'op': 'history', 'limit': 2}
+    )
+
+    statistics = responses[1]['statistics']
+    assert statistics['overall']['count'] == 2 and statistics['overall']['std_result'] is None
+    assert statistics['divide']['mean_result'] is None
+    assert [row['result'] for row in responses[2]['history']] == [None, 5.0]
@@ -0,0 +1,68 @@
+"""Startup checks for the command-line path, using ``python -X importtime``."""
+
+import os
+import pkgutil
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cumulative import time allowed for main.py, in milliseconds. It is measured at about
+# 70 ms, against about 380 ms when the calculator imported pandas eagerly, so the default
+# leaves room for slow shared machines while still catching that regression.
+STARTUP_BUDGET_MS = float(os.environ.get('CALCULATOR_STARTUP_BUDGET_MS', 200))
+
+# Packages a single command-line calculation must not load
+HEAVY_PACKAGES = {'pandas', 'numpy', 'matplotlib', 'openpyxl'}
+
+
+def _plugin_count():
+    """Return the number of plugin packages shipped under calculator/app/plugins."""
+    plugins_dir = os.path.join(ROOT, 'calculator', 'app', 'plugins')
+    return sum(is_pkg for _, _, is_pkg in pkgutil.iter_modules([plugins_dir]))
+
+
+def _import_times(*args):
+    """Run Python with ``-X importtime`` and return the cumulative microseconds per module and the output."""
+    process = subprocess.run([sys.executable, '-X', 'importtime', *args], cwd=ROOT,
+                             capture_output=True, text=True, check=True)
+    times = {}
+    for line in process.stderr.splitlines():
+        if line.startswith('import time:') and not line.rstrip().endswith('imported package'):
+            _, cumulative, name = line[len('import time:'):].split('|')
+            times[name.strip()] = int(cumulative)
+    return times, process.stdout
+
+
+def test_command_line_path_skips_heavy_packages():
+    """Test that `main.py <a> <b> <operation>` never imports pandas, NumPy or the plotting stack."""
+    times, output = _import_times('main.py', '2', '3', 'add')
+
+    assert output == "The result of 2 add 3 is equal to 5\n"
+    assert sorted({name.split('.')[0] for name in times} & HEAVY_PACKAGES) == []
+
+
+def test_main_import_within_budget():
+    """Test that importing main stays within the startup budget."""
+    times, _ = _import_times('-c', 'import main')
+    assert times['main'] / 1000 < STARTUP_BUDGET_MS
+
+
+def test_calculator_package_imports_lazily():
+    """Test that heavy packages load only when the history is first used."""
+    code = ("import sys; from calculator import Calculator; from calculator.calculations import Calculations; "
+            "print(sorted({'pandas', 'numpy'} & set(sys.modules))); "
+            "Calculator.add(1, 2); print(sorted({'pandas', 'numpy'} & set(sys.modules)))")
+    _, output = _import_times('-c', code)
+    assert output.splitlines() == ['[]', "['numpy', 'pandas']"]
+
+
+def test_plugin_loading_imports_no_plugin(tmp_path):
+    """Test that App.load_plugins registers commands from the manifest without importing any plugin."""
+    code = ("import os, sys; os.environ['CALCULATOR_DATA_DIR'] = sys.argv[1]; from calculator.app import App; "
+            "app = App(); app.load_plugins(); print(len(app.command_handler.lazy_commands)); "
+            "print(sorted(name for name in sys.modules if name.startswith('calculator.app.plugins.') "
+            "or name.split('.')[0] in ('pandas', 'numpy', 'matplotlib')))")
+    for _ in range(2):  # once building the manifest, once reading it from the cache
+        _, output = _import_times('-c', code, str(tmp_path))
+        assert output.splitlines() == [str(_plugin_count()), '[]']